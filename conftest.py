@@ -13,4 +13,22 @@ def init_pygame():
     """
     pygame.init()
     yield
-    pygame.quit()
\ No newline at end of file
+    pygame.quit()
+
+@pytest.fixture(scope="session", autouse=True)
+def sound_cache(tmp_path_factory):
+    """
+    Redirige le cache PCM de la banque de sons partagée vers un dossier temporaire,
+    pour que les tests n'écrivent jamais dans le dossier personnel de l'utilisateur.
+    """
+    import game.assets
+    import src.game.assets
+
+    cache_dir = str(tmp_path_factory.mktemp("sounds"))
+    banks = (game.assets.assets, src.game.assets.assets)
+    previous = [bank.cache_dir for bank in banks]
+    for bank in banks:
+        bank.cache_dir = cache_dir
+    yield cache_dir
+    for bank, directory in zip(banks, previous):
+        bank.cache_dir = directory
@@ -1,3 +1,7 @@
+from game.log import INFO, WARNING, log_event, logger
+from game.ships import HIT, MISSED, SUNK, Fleet, ShotResult, ship_name
+
+
 class Action:
     """
     A class containing static methods for performing game actions in the Battleship game.
@@ -10,35 +14,79 @@ class Action:
         Args:
             player (Player): The player performing the shooting action.
             enemy (Player): The enemy player being targeted.
-            X (int): The X-coordinate of the shot (1-based index, must be between 1 and 10).
-            Y (int): The Y-coordinate of the shot (1-based index, must be between 1 and 10).
+            X (int): The row of the shot (0-based index, must be lower than the enemy's `rows`).
+            Y (int): The column of the shot (0-based index, must be lower than the enemy's `cols`).
         Returns:
-            bool: True if the shot hits an enemy's ship, False otherwise.
-        Raises:
-            ValueError: If the coordinates (X, Y) are out of the valid range (1 to 10).
+            bool: True if the shot hits an enemy's ship, False otherwise (including out-of-bounds shots).
         Notes:
+            - The bounds come from the enemy's grid size and default to 10x10.
             - If the shot hits an enemy's ship, the corresponding position is removed from the ship's positions.
             - The result of the shot (hit or miss) is recorded using the player's `record_move` method.
+            - See `fire` for the detailed result (miss, hit or sunk, and the ship hit).
         """
     @staticmethod
     def shoot(player, enemy, X, Y):
-        if not (1 <= X <= 10 and 1 <= Y <= 10):
-            print(f"Error: ({X}, {Y}) must be between 1 and 10.")
-            return False
+        return bool(Action.fire(player, enemy, X, Y))
+
+    @staticmethod
+    def fire(player, enemy, X, Y, ships=None):
+        """
+        Performs a shooting action like `shoot`, and returns the detailed result.
+
+        With the enemy's `ShipIndex`, the ship hit is found with a single lookup and the sunk
+        detection is a counter update; without it, the ship hit is looked up in the enemy's
+        `Fleet` (see `game.ships.Fleet`), or found by scanning the boats of a plain dictionary.
+
+        Args:
+            player (Player): The player performing the shooting action.
+            enemy (Player): The enemy player being targeted.
+            X (int): The row of the shot.
+            Y (int): The column of the shot.
+            ships (ShipIndex, optional): Index of the enemy's ships. Defaults to None.
+
+        Returns:
+            ShotResult: Miss, hit or sunk, with the key of the ship hit. Without index, the cells
+                of a sunk ship are not known and `cells` is empty.
+        """
+        rows = getattr(enemy, "rows", 10)
+        cols = getattr(enemy, "cols", 10)
+        if not (0 <= X < rows and 0 <= Y < cols):
+            log_event(WARNING, "invalid_shot", f"Error: ({X}, {Y}) must be within the {rows}x{cols} grid.", row=X, col=Y)
+            return MISSED
 
-        hit = False
         # Check if the shot hits an enemy's ship
-        for boat_positions in enemy.boats.values():
-            if (X, Y) in boat_positions:
-                hit = True
-                boat_positions.remove((X, Y))  # Remove the hit position from the ship
-                print(f"Hit! The shot at ({X}, {Y}) hit a boat from {enemy.name}.")
-                break
+        boats = enemy.boats
+        if ships is not None:
+            result = ships.resolve(X, Y)
+            if isinstance(boats, Fleet):
+                boats.hit((X, Y))  # Remove the hit position from the ship
+            else:
+                boat_positions = boats.get(result.ship, ())
+                if (X, Y) in boat_positions:
+                    boat_positions.remove((X, Y))
+        elif isinstance(boats, Fleet):
+            boat = boats.hit((X, Y))
+            result = ShotResult(HIT if boats[boat] else SUNK, boat, ()) if boat is not None else MISSED
+        else:
+            result = MISSED
+            for boat, boat_positions in boats.items():
+                if (X, Y) in boat_positions:
+                    boat_positions.remove((X, Y))  # Remove the hit position from the ship
+                    result = ShotResult(HIT if boat_positions else SUNK, boat, ())
+                    break
 
-        if not hit:
-            print(f"Miss! The shot at ({X}, {Y}) missed.")
+        if logger.isEnabledFor(INFO):
+            if result:
+                log_event(INFO, "shot", f"Hit! The shot at ({X}, {Y}) hit a boat from {enemy.name}.",
+                          shooter=player.name, row=X, col=Y, outcome=result.outcome, ship=ship_name(result.ship))
+                if result.sunk:
+                    log_event(INFO, "sunk", f"Sunk! The {ship_name(result.ship)} of {enemy.name} is sunk.",
+                              shooter=player.name, ship=ship_name(result.ship))
+            else:
+                log_event(INFO, "shot", f"Miss! The shot at ({X}, {Y}) missed.",
+                          shooter=player.name, row=X, col=Y, outcome=result.outcome)
 
         # Pass `hit` directly to `record_move()`
-        player.record_move(X, Y, hit)
+        player.record_move(X, Y, result.hit)
 
-        return hit
+        return result
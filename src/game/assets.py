@@ -0,0 +1,201 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import pygame
+from game.log import WARNING, log_event
+
+SOUNDS_DIR = "src/assets/sounds"
+CACHE_DIR_ENV = "BATTLESHIP_CACHE_DIR"  # Overrides the PCM cache directory; empty to disable the cache
+
+
+def default_cache_dir():
+    """
+    Returns the directory of the decoded PCM cache.
+
+    The directory is read from the `BATTLESHIP_CACHE_DIR` environment variable (an empty value
+    disables the cache), then falls back to `battleship/sounds` in `XDG_CACHE_HOME`, or in
+    `~/.cache` when it is not set.
+
+    Returns:
+        str: The cache directory, or None if the cache is disabled.
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return os.environ[CACHE_DIR_ENV] or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "battleship", "sounds")
+
+
+DEFAULT_CACHE_DIR = default_cache_dir()
+
+
+class AssetManager:
+    """
+    Shared bank of sounds, loaded once per file and on demand.
+
+    Each file is decoded at most once per process, whoever asks for it first: `sound` loads
+    it in the calling thread, `preload` in a background thread so that decoding does not
+    delay the first frame. The decoded PCM samples are also written to `cache_dir`, from which
+    later runs reload them without decoding the MP3 again.
+
+    Attributes:
+        cache_dir (str): Directory of the decoded PCM cache, or None to disable it.
+        load_times (dict): Time spent loading each file, in seconds.
+        load_sources (dict): How each file was loaded: "cache" (PCM cache) or "decode" (source file).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Initializes an empty sound bank.
+
+        Args:
+            cache_dir (str, optional): Directory of the decoded PCM cache, None to disable it.
+                Defaults to `DEFAULT_CACHE_DIR`.
+        """
+        self.cache_dir = cache_dir
+        self.load_times = {}
+        self.load_sources = {}
+        self._futures = {}  # Path -> Future of its pygame.mixer.Sound
+        self._lock = threading.Lock()
+
+    def _claim(self, path):
+        """Returns the future of `path`, and True if the caller is the one who must load it."""
+        with self._lock:
+            future = self._futures.get(path)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._futures[path] = future
+            return future, True
+
+    def sound(self, path, volume=None):
+        """
+        Returns the sound of `path`, loading it if no one did yet.
+
+        If the sound is being loaded in the background, waits for it.
+
+        Args:
+            path (str): Path of the sound file.
+            volume (float, optional): Volume to set on the sound (0.0 to 1.0). Defaults to None (unchanged).
+
+        Returns:
+            pygame.mixer.Sound: The shared sound.
+
+        Raises:
+            pygame.error: If the file cannot be decoded.
+            OSError: If the file cannot be read.
+        """
+        future, owner = self._claim(path)
+        if owner:
+            self._load(path, future)
+        sound = future.result()
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def preload(self, paths):
+        """
+        Loads the sounds that are not loaded yet in a background thread.
+
+        Args:
+            paths (iterable): Paths of the sound files.
+
+        Returns:
+            threading.Thread: The loading thread, or None if every sound was already claimed.
+        """
+        claimed = []
+        for path in paths:
+            future, owner = self._claim(path)
+            if owner:
+                claimed.append((path, future))
+        if not claimed:
+            return None
+
+        def load_all():
+            for path, future in claimed:
+                self._load(path, future)
+
+        thread = threading.Thread(target=load_all, name="asset-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _load(self, path, future):
+        """Loads `path` from the PCM cache or from the file, and resolves its future."""
+        start = time.perf_counter()
+        try:
+            cache_file = self._cache_file(path)
+            sound = self._read_cache(cache_file)
+            if sound is not None:
+                self.load_sources[path] = "cache"
+            else:
+                sound = pygame.mixer.Sound(path)
+                self.load_sources[path] = "decode"
+                self._write_cache(cache_file, sound)
+        except (pygame.error, OSError) as e:
+            future.set_exception(e)
+        else:
+            future.set_result(sound)
+        finally:
+            self.load_times[path] = time.perf_counter() - start
+
+    def _cache_file(self, path):
+        """
+        Returns the PCM cache file of `path`, or None without cache.
+
+        The key covers the file (path, size, modification time) and the mixer format, since
+        the raw samples are only valid for the format they were decoded to.
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, pygame.mixer.get_init()))
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pcm")
+
+    def _read_cache(self, cache_file):
+        """Returns the sound stored in `cache_file`, or None if there is none."""
+        if cache_file is None or not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, "rb") as f:
+                return pygame.mixer.Sound(buffer=f.read())
+        except (OSError, pygame.error):
+            return None
+
+    def _write_cache(self, cache_file, sound):
+        """Stores the decoded samples of `sound` in `cache_file`. A failure only disables the cache for this file."""
+        if cache_file is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_file, "wb") as f:
+                f.write(sound.get_raw())
+            os.replace(temp_file, cache_file)  # Atomic: readers never see a partial file
+        except OSError as e:
+            log_event(WARNING, "asset_error", f"Could not cache {cache_file}: {e}", path=cache_file)
+
+    def report(self):
+        """
+        Returns the load time of every sound, slowest first.
+
+        Returns:
+            list: (path, seconds, source) tuples.
+        """
+        return sorted(
+            ((path, seconds, self.load_sources.get(path)) for path, seconds in self.load_times.items()),
+            key=lambda entry: entry[1],
+            reverse=True,
+        )
+
+
+assets = AssetManager()  # Sound bank shared by every screen of the game
+
+
+def sound_path(name):
+    """Returns the path of the sound file `name` in the game's sound directory."""
+    return os.path.join(SOUNDS_DIR, name)
@@ -0,0 +1,390 @@
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from game.engine import HeadlessGame
+from game.ia import STRATEGIES
+
+DEFAULT_HISTORY = "benchmark_history.jsonl"
+DEFAULT_THRESHOLD = 0.25  # Slowdown tolerated before a benchmark counts as a regression (25 %)
+PHASES = {"early": 0.0, "mid": 0.5, "late": 0.9}  # Fraction of a full game already played
+
+BENCHMARKS = {}  # Name -> setup function returning `run(number)`, see `benchmark`
+
+
+def benchmark(name, max_number=1 << 20):
+    """
+    Registers a benchmark.
+
+    The decorated function prepares the benchmark (untimed) and returns a function
+    `run(number)` that performs `number` operations and returns the time they took, in
+    seconds. Operations that change the state they work on (an AI choosing a move, a shot)
+    restore it outside of the timed section.
+
+    Args:
+        name (str): Name of the benchmark, e.g. "choose_move.smart.mid".
+        max_number (int, optional): Maximum number of operations per run, for benchmarks
+            whose preparation is expensive. Defaults to 2**20.
+    """
+    def register(setup):
+        setup.max_number = max_number
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(setup, min_time=0.1, repeat=5):
+    """
+    Times a benchmark.
+
+    The number of operations per run is doubled until a run takes `min_time`, then the
+    run is repeated `repeat` times. The best time is the least disturbed by the rest of
+    the machine; the median shows the noise.
+
+    Args:
+        setup (callable): A benchmark registered with `benchmark`.
+        min_time (float, optional): Minimum duration of a run, in seconds. Defaults to 0.1.
+        repeat (int, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        dict: The number of operations per run ("number"), and the best and median time
+            per operation ("best", "median"), in seconds.
+    """
+    run = setup()
+    number = 1
+    while True:
+        elapsed = run(number)
+        if elapsed >= min_time or number >= setup.max_number:
+            break
+        number = min(number * 2, setup.max_number)
+    times = [run(number) / number for _ in range(repeat)]
+    return {"number": number, "best": min(times), "median": statistics.median(times)}
+
+
+def game_state(strategy, phase, seed=0):
+    """
+    Returns an AI in the middle of a seeded game, with the grid and the boats it fires at.
+
+    Only side 0 fires. The game is played once to count its shots, then replayed from the
+    same seed up to the fraction `PHASES[phase]` of them, so that "late" is close to the end
+    whatever the strength of the strategy.
+
+    Args:
+        strategy (str): AI strategy.
+        phase (str): "early", "mid" or "late".
+        seed (int, optional): Seed of the game. Defaults to 0.
+
+    Returns:
+        tuple: The `AI`, the opponent's `Grid` and the opponent's boats.
+    """
+    game = HeadlessGame(strategies=(strategy, strategy))
+    total = _fire(game, seed, None)
+    _fire(game, seed, int(total * PHASES[phase]))
+    return game.ais[0], game.grids[1], game.boats[1]
+
+
+def _fire(game, seed, shots):
+    """Replays side 0 of a seeded game for `shots` shots (until the win if None), and returns the number of shots fired."""
+    game.rng.seed(seed)
+    game.reset()
+    game.place_fleet(1)
+    ai = game.ais[0]
+    while game.winner is None and (shots is None or game.shots[0] < shots):
+        row, col = ai.choose_move(game.grids[1], game.boats[1])
+        result = game.fire(0, row, col)
+        ai.update_last_hit(row, col, result.hit, result.cells)
+    return game.shots[0]
+
+
+def _timed(function):
+    """Returns a `run(number)` calling `function` `number` times."""
+    def run(number):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        return time.perf_counter() - start
+    return run
+
+
+def _register_choose_move(strategy, phase):
+    @benchmark(f"choose_move.{strategy}.{phase}", max_number=512 if strategy == "montecarlo" else 4096)
+    def setup():
+        ai, grid, boats = game_state(strategy, phase)
+        saved = ai.snapshot()
+
+        def run(number):
+            elapsed = 0.0
+            for _ in range(number):
+                ai.restore(saved)  # Each move changes the AI: start again from the same state
+                start = time.perf_counter()
+                ai.choose_move(grid, boats)
+                elapsed += time.perf_counter() - start
+            return elapsed
+        return run
+
+
+def _register_probability(phase):
+    # The AI keeps its density up to date between moves: drop it so that each call rebuilds
+    # it from the board, as a full recount of the density
+    @benchmark(f"calculate_probability.{phase}")
+    def setup():
+        ai, grid, _ = game_state("smart", phase)
+
+        def rebuild():
+            ai.state.density = None
+            ai.calculate_probability(grid)
+        return _timed(rebuild)
+
+    # One step of the incremental density: the next shot of the game, then the updated grid
+    @benchmark(f"density.update.{phase}")
+    def setup_update():
+        ai, grid, boats = game_state("smart", phase)
+        ai.calculate_probability(grid)  # Build the density if the game did not need it yet
+        row, col = ai.fork().choose_move(grid, boats)
+        hit = grid.has_ship(row, col)
+        saved = ai.snapshot()
+
+        def run(number):
+            elapsed = 0.0
+            for _ in range(number):
+                ai.restore(saved)  # Each shot changes the density: start again from the same state
+                start = time.perf_counter()
+                ai.update_last_hit(row, col, hit)
+                ai.calculate_probability(grid)
+                elapsed += time.perf_counter() - start
+            return elapsed
+        return run
+
+
+for _strategy in STRATEGIES:
+    for _phase in PHASES:
+        _register_choose_move(_strategy, _phase)
+for _phase in PHASES:
+    _register_probability(_phase)
+
+
+@benchmark("action.shoot")
+def _action_shoot():
+    from game.action import Action
+    from game.player import Player
+    from game.placement import mask_to_positions, random_fleet
+    import random
+
+    player, enemy = Player("Player"), Player("IA")
+    rng = random.Random(0)
+    fleet = [mask_to_positions(mask, 10) for mask in random_fleet(10, 10, [5, 4, 3, 3, 2], rng)]
+    cells = [(row, col) for row in range(10) for col in range(10)]
+
+    def run(number):
+        elapsed = 0.0
+        done = 0
+        while done < number:
+            batch = cells[:number - done]
+            enemy.boats = {f"Boat {i}": list(positions) for i, positions in enumerate(fleet)}
+            player.move_historic.clear()
+            start = time.perf_counter()
+            for row, col in batch:
+                Action.shoot(player, enemy, row, col)
+            elapsed += time.perf_counter() - start
+            done += len(batch)
+        return elapsed
+    return run
+
+
+def _board():
+    """Creates a `Board` for the benchmarks, with pygame initialized without a display."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from game.board import Board
+    from game.player import Player
+
+    pygame.init()
+    return Board(player=Player("Player"), enemy=Player("IA"), seed=0)
+
+
+@benchmark("board.place_enemy_boats")
+def _place_enemy_boats():
+    board = _board()
+
+    def place():
+        board.enemy_grid.clear()
+        board.enemy_ships.clear()
+        board.enemy.boats.clear()
+        board.place_enemy_boats()
+    return _timed(place)
+
+
+@benchmark("board.reset_grid")
+def _reset_grid():
+    board = _board()
+    return _timed(board.reset_grid)
+
+
+def _register_headless_game(strategy):
+    @benchmark(f"headless_game.{strategy}", max_number=1024)
+    def setup():
+        game = HeadlessGame(strategies=(strategy, strategy))
+        seeds = iter(range(1 << 30))
+        return _timed(lambda: game.play(next(seeds)))
+
+
+for _strategy in ("random", "targeted", "smart"):
+    _register_headless_game(_strategy)
+
+
+def select(patterns=None):
+    """
+    Returns the names of the registered benchmarks matching any of the shell-style `patterns`.
+
+    Args:
+        patterns (list, optional): Patterns such as "choose_move.smart.*". Defaults to every benchmark.
+
+    Returns:
+        list: The matching names, in registration order.
+    """
+    if not patterns:
+        return list(BENCHMARKS)
+    return [name for name in BENCHMARKS if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+
+def run_benchmarks(names, min_time=0.1, repeat=5, report=None):
+    """
+    Measures the benchmarks `names`.
+
+    Args:
+        names (list): Names of registered benchmarks.
+        min_time (float, optional): Minimum duration of a run, in seconds. Defaults to 0.1.
+        repeat (int, optional): Number of timed runs per benchmark. Defaults to 5.
+        report (callable, optional): Called with each name and its result as soon as it is measured.
+
+    Returns:
+        dict: The result of `measure` for each benchmark.
+    """
+    results = {}
+    for name in names:
+        results[name] = measure(BENCHMARKS[name], min_time, repeat)
+        if report is not None:
+            report(name, results[name])
+    return results
+
+
+def _commit():
+    """Returns the current git commit, or None outside a git checkout."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def load_history(path):
+    """
+    Reads a benchmark history.
+
+    Args:
+        path (str): JSON-lines file written by `append_history`.
+
+    Returns:
+        list: The recorded runs, oldest first. Empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, results):
+    """
+    Appends a run to a benchmark history, one JSON object per line.
+
+    Args:
+        path (str): History file.
+        results (dict): Results of `run_benchmarks`.
+
+    Returns:
+        dict: The recorded run: date, commit, Python version, machine and results.
+    """
+    entry = {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def compare(results, history, threshold=DEFAULT_THRESHOLD, window=5):
+    """
+    Compares results with the previous runs.
+
+    Each benchmark is compared with the median of its best times over the last `window`
+    runs that measured it, so a single noisy run in the history does not hide or fake a
+    regression.
+
+    Args:
+        results (dict): Results of `run_benchmarks`.
+        history (list): Previous runs, as returned by `load_history`.
+        threshold (float, optional): Relative slowdown tolerated. Defaults to `DEFAULT_THRESHOLD`.
+        window (int, optional): Number of previous runs considered. Defaults to 5.
+
+    Returns:
+        list: (name, baseline, best, ratio) for every benchmark slower than the baseline by more
+            than `threshold`, worst first.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = [run["results"][name]["best"] for run in history if name in run["results"]][-window:]
+        if not previous:
+            continue
+        baseline = statistics.median(previous)
+        ratio = result["best"] / baseline
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline, result["best"], ratio))
+    return sorted(regressions, key=lambda regression: regression[3], reverse=True)
+
+
+def _format_time(seconds):
+    """Formats a duration with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times the AI strategies and the engine hot paths, and detects regressions.")
+    parser.add_argument("patterns", nargs="*", help="Benchmarks to run, as shell-style patterns (default: all)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON-lines history file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown counted as a regression")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum duration of a run, in seconds")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per benchmark")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the results to the history")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    names = select(args.patterns)
+    if args.list:
+        print("\n".join(names))
+        sys.exit(0)
+
+    history = load_history(args.history)
+    results = run_benchmarks(names, args.min_time, args.repeat, report=lambda name, result: print(
+        f"{name:32} {_format_time(result['best']):>10}  (median {_format_time(result['median'])}, {result['number']} ops)"))
+    regressions = compare(results, history, args.threshold)
+    if not args.no_save:
+        append_history(args.history, results)
+
+    for name, baseline, best, ratio in regressions:
+        print(f"REGRESSION {name}: {_format_time(best)} vs {_format_time(baseline)} ({ratio:.2f}x)")
+    sys.exit(1 if regressions else 0)
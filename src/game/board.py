@@ -1,14 +1,30 @@
+import random
+
 import pygame
-import string
 from game.button import draw_back_button  # Import directly from button.py
 from game.button import reinit_button
-from utils.boat_type import BoatType 
-import random
+from utils.boat_type import DEFAULT_FLEET
 from game.ia import AI
+from game.grid import make_grid
+from game.placement import mask_to_positions, random_fleet, random_fleet_positions
+from game.renderer import GridRenderer, column_label
+from game.text_cache import render_text
+from game.assets import assets, sound_path
+from game.ships import ShipIndex, ship_name
+from game.replay import Replay, encode_ship
+from game.log import INFO, log_event, logger
+
+HIT_SOUND = sound_path("hit.mp3")
+MISS_SOUND = sound_path("miss1.mp3")
+LOOSE_SOUND = sound_path("loose.mp3")
+WIN_SOUND = sound_path("win.mp3")
+SONAR_PING_SOUND = sound_path("sonar_ping.mp3")
+BOARD_SOUNDS = (HIT_SOUND, MISS_SOUND, LOOSE_SOUND, WIN_SOUND, SONAR_PING_SOUND)
+
 
 class Board:
     
-    def __init__(self, rows=10, cols=10, cell_size=40, player=None, enemy=None):
+    def __init__(self, rows=10, cols=10, cell_size=40, player=None, enemy=None, fleet=None, sparse=False, seed=None):
         """
         Initializes the game board with specified dimensions, fonts, sounds, and player/enemy configurations.
         Args:
@@ -17,12 +33,23 @@ class Board:
             cell_size (int, optional): Size of each cell in the grid (in pixels). Defaults to 40.
             player (Player, optional): The player object representing the user. Defaults to None.
             enemy (Player, optional): The enemy object representing the AI opponent. Defaults to None.
+            fleet (list, optional): List of (name, size) tuples describing each side's ships. Defaults to the `BoatType` fleet.
+            sparse (bool, optional): If True, the grids only store ships and shots (`SparseGrid`),
+                for very large boards. Defaults to False.
+            seed (int, optional): Seed from which the seed of each game is drawn. Defaults to None (unpredictable).
         Attributes:
             rows (int): Number of rows in the game grid.
             cols (int): Number of columns in the game grid.
             cell_size (int): Size of each cell in the grid (in pixels).
-            player_grid (list): 2D list representing the player's grid with cell states.
-            enemy_grid (list): 2D list representing the enemy's grid with cell states.
+            fleet (list): List of (name, size) tuples describing each side's ships.
+            fleet_total (int): Number of ship cells to hit to win the game.
+            sparse (bool): Whether the grids use sparse storage.
+            player_grid (Grid): Bitboard grid holding the player's ships and the AI's shots.
+            enemy_grid (Grid): Bitboard grid holding the enemy's ships and the player's shots.
+            player_ships (ShipIndex): Cell-to-ship index of the player's ships, counting the cells still afloat.
+            enemy_ships (ShipIndex): Cell-to-ship index of the enemy's ships.
+            player_renderer (GridRenderer): Cached rendering of the player's grid.
+            enemy_renderer (GridRenderer): Cached rendering of the enemy's grid.
             font (pygame.font.Font): Font used for numbers and letters on the grid.
             order_font (pygame.font.Font): Font used for additional text elements.
             title_font (pygame.font.Font): Font used for the game title.
@@ -38,19 +65,27 @@ class Board:
             loose_sound (pygame.mixer.Sound): Sound effect for losing the game.
             win_sound (pygame.mixer.Sound): Sound effect for winning the game.
             sonar_ping_sound (pygame.mixer.Sound): Sound effect for sonar ping.
-            player (Player): The player object representing the user.
-            enemy (Player): The enemy object representing the AI opponent.
+            player (Player): The player object representing the user, its `rows` and `cols` set to the board's.
+            enemy (Player): The enemy object representing the AI opponent, its `rows` and `cols` set to the board's.
             ai (AI): AI object with a specified strategy for gameplay.
+            rng (random.Random): Random stream of the current game, used by the enemy placement and the AI.
+            replay (Replay): Recording of the current game: its seed, both fleets and every shot.
             placement_complete (bool): Indicates whether all boats have been placed. Defaults to False.
         Notes:
             - The enemy's boats are automatically placed if they do not already exist.
-            - Sound effects are loaded from the specified file paths and their volume is adjusted.
+            - Sound effects are loaded from the shared `game.assets.assets` bank, in a background
+              thread started here; each property waits for its sound only if it is not loaded yet.
         """
         self.rows = rows
         self.cols = cols
         self.cell_size = cell_size
-        self.player_grid = [[{"ai_hit": False, "ship": False} for _ in range(cols)] for _ in range(rows)]
-        self.enemy_grid = [[{"player_hit": False, "ship": False} for _ in range(cols)] for _ in range(rows)]
+        self.fleet = list(fleet if fleet is not None else DEFAULT_FLEET)
+        self.fleet_total = sum(size for _, size in self.fleet)
+        self.sparse = sparse
+        self.player_grid = make_grid(rows, cols, hit_key="ai_hit", sparse=sparse)
+        self.enemy_grid = make_grid(rows, cols, hit_key="player_hit", sparse=sparse)
+        self.player_ships = ShipIndex()
+        self.enemy_ships = ShipIndex()
         self.font = pygame.font.SysFont(None, 24)  # Font for numbers and letters
         self.order_font = pygame.font.SysFont(None, 20)
         self.title_font = pygame.font.SysFont(None, 48)  # Font for the title
@@ -61,17 +96,22 @@ class Board:
         self.winner = None
         self.player_hits = 0
         self.ai_hits = 0
-        self.hit_sound = pygame.mixer.Sound("src/assets/sounds/hit.mp3")
-        self.hit_sound.set_volume(0.25)  # Set volume for hit sound
-        self.miss_sound = pygame.mixer.Sound("src/assets/sounds/miss1.mp3")
-        self.loose_sound = pygame.mixer.Sound("src/assets/sounds/loose.mp3")
-        self.win_sound = pygame.mixer.Sound("src/assets/sounds/win.mp3")
-        self.sonar_ping_sound = pygame.mixer.Sound("src/assets/sounds/sonar_ping.mp3")
-
-        # Assign player and enemy
+        assets.preload(BOARD_SOUNDS)  # Decode the sounds in the background, see the *_sound properties
+
+        # Pre-rendered grids, redrawn cell by cell as shots and placements change them
+        self.player_renderer = GridRenderer(self.player_grid, cell_size, self.font, show_ships=True, show_hits=True, title="Votre plateau")
+        self.enemy_renderer = GridRenderer(self.enemy_grid, cell_size, self.font, show_ships=False, show_hits=True, title="Plateau ennemi")
+        self._layout = None  # (screen size, winner) of the last full redraw
+
+        # Assign player and enemy, on a grid of the board's size
         self.player = player
         self.enemy = enemy
-        self.ai = AI(strategy="smart")  # Choosing the strategy
+        self._size_players()
+        self.seed_source = random.Random(seed)  # Draws the seed of each game
+        self.rng = random.Random()
+        self.replay = Replay(rows, cols)
+        self._new_game_seed()
+        self.ai = AI(strategy="smart", ship_sizes=[size for _, size in self.fleet], rng=self.rng)  # Choosing the strategy
 
         # Initialize the placement_complete attribute
         self.placement_complete = False  # Indicates whether all boats have been placed
@@ -80,75 +120,88 @@ class Board:
         if self.enemy and not self.enemy.boats:
             self.place_enemy_boats()
 
+    def _size_players(self):
+        """Gives the player and the enemy the board's bounds, used to validate their placements and shots."""
+        for side in (self.player, self.enemy):
+            if side is not None:
+                side.rows = self.rows
+                side.cols = self.cols
+
+    def _new_game_seed(self):
+        """Draws the seed of a new game, reseeds `rng` with it and starts a new recording."""
+        self.replay.seed = self.seed_source.getrandbits(64)
+        self.replay.fleets = [[], []]
+        del self.replay.shots[:]
+        self.rng.seed(self.replay.seed)
+
+    @property
+    def hit_sound(self):
+        """Sound effect for a successful hit."""
+        return assets.sound(HIT_SOUND, volume=0.25)  # Set volume for hit sound
+
+    @property
+    def miss_sound(self):
+        """Sound effect for a missed shot."""
+        return assets.sound(MISS_SOUND)
+
+    @property
+    def loose_sound(self):
+        """Sound effect for losing the game."""
+        return assets.sound(LOOSE_SOUND)
+
+    @property
+    def win_sound(self):
+        """Sound effect for winning the game."""
+        return assets.sound(WIN_SOUND)
+
+    @property
+    def sonar_ping_sound(self):
+        """Sound effect for sonar ping."""
+        return assets.sound(SONAR_PING_SOUND)
+
     def place_enemy_boats(self):
         """
         Randomly places enemy boats on the game board while ensuring that they do not overlap 
         and remain within the grid boundaries.
-        The method attempts to place the following boats:
+        The method places the boats of `self.fleet`, by default:
         - Aircraft Carrier (size 5)
         - Cruiser (size 4)
         - Destroyer (size 3)
         - Submarine (size 3)
         - Torpedo (size 2)
-        Each boat is placed by randomly selecting a starting position and direction 
-        (horizontal or vertical). The method ensures that the boat's positions are valid 
-        (i.e., within the grid and not overlapping with other boats). If a boat cannot be 
-        placed after 100 attempts, a ValueError is raised.
+        Each boat is drawn directly among its precomputed placements (horizontal or vertical)
+        that do not overlap the boats already placed, so no attempt is wasted
+        (see `game.placement.random_fleet`). Sparse boards, too large to index every placement,
+        draw the boats with `game.placement.random_fleet_positions` instead.
         Raises:
-            ValueError: If a boat cannot be placed after 100 attempts.
+            ValueError: If the fleet cannot fit on the grid.
         """
-        boats = [
-            {"type": BoatType.AIRCRAFT_CARRIER, "size": 5},
-            {"type": BoatType.CRUISER, "size": 4},
-            {"type": BoatType.DESTROYER, "size": 3},
-            {"type": BoatType.SUBMARINE, "size": 3},
-            {"type": BoatType.TORPEDO, "size": 2},
-        ]
-
-        for boat in boats:
-            placed = False
-            attempts = 0  # To avoid infinite loops
-            while not placed and attempts < 100:  # Limit the number of attempts
-                attempts += 1
-
-                # Generate a random starting position
-                start_row = random.randint(0, self.rows - 1)
-                start_col = random.randint(0, self.cols - 1)
-
-                # Choose a random direction (0 = horizontal, 1 = vertical)
-                direction = random.choice([0, 1])
-
-                # Calculate the boat's positions
-                positions = []
-                for i in range(boat["size"]):
-                    if direction == 0:  # Horizontal
-                        row, col = start_row, start_col + i
-                    else:  # Vertical
-                        row, col = start_row + i, start_col
-
-                    # Check if the position is valid
-                    if row >= self.rows or col >= self.cols or self.enemy_grid[row][col]["ship"]:
-                        break
-                    positions.append((row, col))
-
-                # If all positions are valid, place the boat
-                if len(positions) == boat["size"]:
-                    for row, col in positions:
-                        self.enemy_grid[row][col]["ship"] = True  # Mark the grid
-                    self.enemy.boats[boat["type"].value] = positions  # Register the boat
-                    placed = True
-
-            if not placed:
-                raise ValueError(f"Failed to place the boat: {boat['type'].value}")
+        sizes = [size for _, size in self.fleet]
+        if self.sparse:
+            fleet_positions = random_fleet_positions(self.rows, self.cols, sizes, self.rng)
+        else:
+            fleet_positions = [mask_to_positions(mask, self.cols) for mask in random_fleet(self.rows, self.cols, sizes, self.rng)]
+        self.replay.set_fleet(1, fleet_positions)
+
+        for boat, positions in zip(self.fleet, fleet_positions):
+            self.enemy_grid.place_ship(positions)  # Mark the grid
+            self.enemy_ships.add(boat, positions)  # Index its cells
+            self.enemy.boats[boat] = positions  # Register the boat
 
     def draw(self, screen):
         """
-        Draws the game board and UI elements on the screen.
+        Draws the game board and UI elements on the screen, redrawing only what changed.
         This method is responsible for rendering the game interface, including the title, player names, 
         grids, victory/defeat messages, and interactive buttons. It dynamically adjusts the layout 
         based on the screen dimensions and the game state.
+        The grids are kept pre-rendered by a `GridRenderer` each: once the screen has been drawn,
+        a frame only copies the cells changed by a shot or a placement since the previous frame.
         Args:
             screen (pygame.Surface): The surface on which the game elements are drawn.
+        Returns:
+            list: The rectangles of the screen that were redrawn, for `pygame.display.update`.
+                The whole screen after a resize, a change of winner or a call to `invalidate`,
+                an empty list if nothing changed.
         Behavior:
             - Fills the screen with a dark gray background.
             - Displays the game title at the top center of the screen.
@@ -167,31 +220,66 @@ class Board:
                 - "player" indicates the player has won.
                 - "ia" indicates the AI has won.
                 - None indicates the game is ongoing.
-            - The `self._draw_grid` method is used to render the grids.
             - The `reinit_button` and `draw_back_button` functions are used to create interactive buttons.
         """
+        layout = (screen.get_size(), self.winner)
+        if layout != self._layout:
+            self._layout = layout
+            self._draw_screen(screen)
+            return [screen.get_rect()]
+
+        if self.winner is not None:
+            return []
+        dirty = []
+        for renderer, origin in zip((self.player_renderer, self.enemy_renderer), self._grid_origins(screen)):
+            for rect in renderer.render():
+                screen.blit(renderer.surface, (origin[0] + rect.x, origin[1] + rect.y), rect)
+                dirty.append(rect.move(origin))
+        return dirty
+
+    def invalidate(self):
+        """Forces the next call to `draw` to redraw the whole screen (e.g. after another screen was shown)."""
+        self._layout = None
+        self.player_renderer.invalidate()
+        self.enemy_renderer.invalidate()
+
+    def _grid_origins(self, screen):
+        """
+        Returns the screen positions of the top-left corner of each grid surface (labels and title included).
+        Args:
+            screen (pygame.Surface): The surface on which the game elements are drawn.
+        Returns:
+            tuple: The (x, y) positions of the player's grid and of the enemy's grid.
+        """
+        grid_width = self.cols * self.cell_size
+        grid_height = self.rows * self.cell_size
+        margin_x_left = (screen.get_width() // 4) - (grid_width // 2)
+        margin_x_right = (3 * screen.get_width() // 4) - (grid_width // 2)
+        margin_y = (screen.get_height() - grid_height) // 2 + 50  # Offset to leave space for the title
+        left, top = self.player_renderer.offset
+        return (margin_x_left - left, margin_y - top), (margin_x_right - left, margin_y - top)
+
+    def _draw_screen(self, screen):
+        """
+        Redraws the whole screen: background, title, names, grids or end message, and buttons.
+        Args:
+            screen (pygame.Surface): The surface on which the game elements are drawn.
+        """
         screen.fill((30, 30, 30))  # Dark gray background
 
         # Draw the title
-        title = self.title_font.render("Battle Ship - Mode Solo", True, (255, 255, 255))
+        title = render_text(self.title_font, "Battle Ship - Mode Solo", True, (255, 255, 255))
         screen.blit(title, (screen.get_width() // 2 - title.get_width() // 2, 10))
 
         # Draw player names
-        player_text = self.font.render(f"Player: {self.player.name}", True, (255, 255, 255))
-        enemy_text = self.font.render(f"Enemy: {self.enemy.name}", True, (255, 255, 255))
+        player_text = render_text(self.font, f"Player: {self.player.name}", True, (255, 255, 255))
+        enemy_text = render_text(self.font, f"Enemy: {self.enemy.name}", True, (255, 255, 255))
         screen.blit(player_text, (10, 60))
         screen.blit(enemy_text, (screen.get_width() - enemy_text.get_width() - 10, 60))
 
-        # Calculate margins for the two grids
-        grid_width = self.cols * self.cell_size
-        grid_height = self.rows * self.cell_size
-        margin_x_left = (screen.get_width() // 4) - (grid_width // 2)
-        margin_x_right = (3 * screen.get_width() // 4) - (grid_width // 2)
-        margin_y = (screen.get_height() - grid_height) // 2 + 50  # Offset to leave space for the title
-
         if self.winner == "player":
             # Print a victory message
-            victory_text = self.title_font.render("Victoire ! Vous avez gagné !", True, (255, 255, 255))
+            victory_text = render_text(self.title_font, "Victoire ! Vous avez gagné !", True, (255, 255, 255))
             screen.blit(victory_text, (screen.get_width() // 2 - victory_text.get_width() // 2, screen.get_height() // 2 - victory_text.get_height() // 2))
             
             # Play the victory sound (only once)
@@ -201,7 +289,7 @@ class Board:
 
         elif self.winner == "ia":
             # Print a defeat message
-            defeat_text = self.title_font.render("Défaite ! L'IA a gagné !", True, (255, 255, 255))
+            defeat_text = render_text(self.title_font, "Défaite ! L'IA a gagné !", True, (255, 255, 255))
             screen.blit(defeat_text, (screen.get_width() // 2 - defeat_text.get_width() // 2, screen.get_height() // 2 - defeat_text.get_height() // 2))
             
             # Play the defeat sound (only once)
@@ -210,11 +298,10 @@ class Board:
                 self.loose_sound_played = True
 
         else:
-            # Draw the left grid (Player's ships and AI's hits)
-            self._draw_grid(screen, margin_x_left, margin_y, self.player_grid, show_ships=True, show_hits=True, title="Votre plateau")
-
-            # Draw the right grid (Player's hits on the enemy's ships)
-            self._draw_grid(screen, margin_x_right, margin_y, self.enemy_grid, show_ships=False, show_hits=True, title="Plateau ennemi")
+            # Draw the left grid (Player's ships and AI's hits) and the right grid (Player's hits on the enemy's ships)
+            for renderer, origin in zip((self.player_renderer, self.enemy_renderer), self._grid_origins(screen)):
+                renderer.render()
+                screen.blit(renderer.surface, origin)
 
             # Draw the reinitialization button only if the game is not over
             self.reinit_button = reinit_button(screen, self.order_font, screen.get_width(), screen.get_height() - 50, text="Réinitialiser")
@@ -222,82 +309,6 @@ class Board:
         # Draw the back button
         self.back_button = draw_back_button(screen, self.button_font, screen.get_width(), screen.get_height(), text="Retour")
 
-    def _draw_grid(self, screen, margin_x, margin_y, grid, show_ships, show_hits, title):
-        """
-        Draws a grid on the given screen with optional visual indicators for ships, hits, and titles.
-        Args:
-            screen (pygame.Surface): The surface on which the grid will be drawn.
-            margin_x (int): The x-coordinate margin for the grid's top-left corner.
-            margin_y (int): The y-coordinate margin for the grid's top-left corner.
-            grid (list of list of dict): The grid data structure containing cell information.
-                Each cell is a dictionary with keys such as "ship", "player_hit", and "ai_hit".
-            show_ships (bool): If True, displays ships on the grid.
-            show_hits (bool): If True, displays hit markers (crosses or circles) on the grid.
-            title (str): The title to display above the grid.
-        Grid Cell Dictionary Keys:
-            - "ship" (bool): Indicates whether a ship occupies the cell.
-            - "player_hit" (bool): Indicates whether the player has hit this cell.
-            - "ai_hit" (bool): Indicates whether the AI has hit this cell.
-        Visual Elements:
-            - Ships are displayed as blue cells if `show_ships` is True.
-            - Player hits are displayed as red crosses for hits and white crosses for misses if `show_hits` is True.
-            - AI hits are displayed as red circles for hits and white circles for misses.
-            - Row numbers are displayed on the left of the grid.
-            - Column letters are displayed above the grid.
-        Note:
-            This method uses the `pygame` library for rendering graphical elements.
-        """
-        # Draw the grid title
-        grid_title = self.font.render(title, True, (255, 255, 255))
-        screen.blit(grid_title, (margin_x + (self.cols * self.cell_size) // 2 - grid_title.get_width() // 2, margin_y - 40))
-
-        # Draw the grid
-        for row in range(self.rows):
-            for col in range(self.cols):
-                x = margin_x + col * self.cell_size
-                y = margin_y + row * self.cell_size
-                rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
-
-                # Draw the background color
-                if show_ships and grid[row][col]["ship"]:
-                    pygame.draw.rect(screen, (0, 128, 255), rect)  # Blue for ship
-                else:
-                    pygame.draw.rect(screen, (173, 216, 230), rect)  # Light blue for empty
-
-                # Draw a smaller cross if the cell was hit by the player
-                if show_hits and grid[row][col].get("player_hit", False):
-                    if grid[row][col]["ship"]:
-                        line_color = (255, 0, 0)  # Red for a hit
-                    else:
-                        line_color = (255, 255, 255)  # White for a miss
-                    offset = self.cell_size // 6  # Smaller cross offset
-                    pygame.draw.line(screen, line_color, (x + offset, y + offset), (x + self.cell_size - offset, y + self.cell_size - offset), 2)  # Diagonal \
-                    pygame.draw.line(screen, line_color, (x + offset, y + self.cell_size - offset), (x + self.cell_size - offset, y + offset), 2)  # Diagonal /
-
-                # Draw a larger circle if the AI hit this cell
-                if grid[row][col].get("ai_hit", False):
-                    if grid[row][col]["ship"]:
-                        circle_color = (255, 0, 0)  # Red for a hit
-                    else:
-                        circle_color = (255, 255, 255)  # White for a miss
-                    center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                    radius = self.cell_size // 3  # Larger circle radius
-                    pygame.draw.circle(screen, circle_color, center, radius, 2)
-
-                # Draw the cell border
-                pygame.draw.rect(screen, (0, 0, 0), rect, 1)  # Black border
-
-        # Draw row numbers (on the left)
-        for row in range(self.rows):
-            text = self.font.render(str(row), True, (255, 255, 255))  # White
-            screen.blit(text, (margin_x - 20, margin_y + row * self.cell_size + self.cell_size // 4))
-
-        # Draw column letters (on top)
-        for col in range(self.cols):
-            letter = string.ascii_uppercase[col]  # Convert index to letter (A, B, C, ...)
-            text = self.font.render(letter, True, (255, 255, 255))  # White
-            screen.blit(text, (margin_x + col * self.cell_size + self.cell_size // 4, margin_y - 20))
-        
     def handle_event(self, event):
         """
         Handles events triggered by the user, such as mouse clicks.
@@ -368,36 +379,38 @@ class Board:
                     if not hasattr(self, "current_boat_index"):
                         self.current_boat_index = 0
                         self.current_boat = {
-                            "name": list(BoatType)[self.current_boat_index].name,
+                            "name": self.fleet[self.current_boat_index][0],
                             "positions": [],
-                            "size": list(BoatType)[self.current_boat_index].size
+                            "size": self.fleet[self.current_boat_index][1]
                         }
 
                     if len(self.current_boat["positions"]) == 0:
                         self.current_boat["positions"].append((row, col))
-                        self.player_grid[row][col]["ship"] = True
+                        self.player_grid.set_ship(row, col)
                         self.sonar_ping_sound.play()  # Jouer le son lors du placement initial
                     else:
                         first_row, first_col = self.current_boat["positions"][0]
                         if (row == first_row or col == first_col) and (row, col) not in self.current_boat["positions"]:
-                            if self.player_grid[row][col]["ship"]:
+                            if self.player_grid.has_ship(row, col):
                                 return
                             if not self.is_continuous(self.current_boat["positions"], (row, col)):
                                 return
                             self.current_boat["positions"].append((row, col))
-                            self.player_grid[row][col]["ship"] = True
+                            self.player_grid.set_ship(row, col)
                             self.sonar_ping_sound.play()  # Jouer le son pour chaque position ajoutée
 
                     if len(self.current_boat["positions"]) == self.current_boat["size"]:
                         for position in self.current_boat["positions"]:
                             player.set_boat_emplacement(self.current_boat["name"], position[0], position[1])
+                        self.player_ships.add(self.current_boat["name"], self.current_boat["positions"])
+                        self.replay.fleets[0].append(encode_ship(self.current_boat["positions"], self.cols))
 
                         self.current_boat_index += 1
-                        if self.current_boat_index < len(BoatType):
+                        if self.current_boat_index < len(self.fleet):
                             self.current_boat = {
-                                "name": list(BoatType)[self.current_boat_index].name,
+                                "name": self.fleet[self.current_boat_index][0],
                                 "positions": [],
-                                "size": list(BoatType)[self.current_boat_index].size
+                                "size": self.fleet[self.current_boat_index][1]
                             }
                         else:
                             del self.current_boat
@@ -438,24 +451,27 @@ class Board:
             - If it's the player's turn:
                 - Detects the cell clicked by the player on the enemy grid.
                 - Checks if the cell has already been targeted. If so, notifies the player and exits.
-                - If the cell contains a ship, marks it as a hit, increments the player's successful hits,
-                  and plays the hit sound. Otherwise, marks it as a miss and plays the miss sound.
+                - Resolves the shot with the enemy's `ShipIndex`: if the cell contains a ship, marks it as a hit,
+                  increments the player's successful hits, reports a sunk ship ("touché-coulé") and plays the
+                  hit sound. Otherwise, marks it as a miss and plays the miss sound.
                 - Checks if the player has won by hitting all enemy ships. If so, sets the winner to "player"
                   and ends the game.
                 - Switches the turn to the AI if the game is not over.
             - If it's the AI's turn:
                 - The AI selects a cell to target on the player's grid.
                 - If the cell contains a ship, marks it as a hit, increments the AI's successful hits,
-                  and updates the AI's strategy. Otherwise, marks it as a miss and updates the AI's strategy.
+                  and updates the AI's strategy, passing the cells of a sunk ship so that the AI stops
+                  targeting it. Otherwise, marks it as a miss and updates the AI's strategy.
                 - Checks if the AI has won by hitting all player ships. If so, sets the winner to "ia"
                   and ends the game.
                 - Switches the turn back to the player if the game is not over.
         Notes:
             - The game alternates turns between the player and the AI.
-            - The game ends when either the player or the AI hits all 17 ship cells.
+            - The game ends when either the player or the AI hits all `fleet_total` ship cells (17 by default).
         """
         if not hasattr(self, "player_turn"):
             self.player_turn = True 
+        verbose = logger.isEnabledFor(INFO)  # Messages are only built when someone reads them
 
         if self.player_turn:
             if event and event.type == pygame.MOUSEBUTTONDOWN:
@@ -469,51 +485,65 @@ class Board:
                 row = (y - margin_y) // self.cell_size
 
                 if 0 <= col < self.cols and 0 <= row < self.rows:
-                    cell = self.enemy_grid[row][col]
-
-                    if cell["player_hit"]:
-                        print("You have already targeted this cell.")
+                    if self.enemy_grid.is_shot(row, col):
+                        if verbose:
+                            log_event(INFO, "repeated_shot", "You have already targeted this cell.", row=row, col=col)
                         return
 
-                    if cell["ship"]:
-                        print(f"Player hit an enemy ship at ({row}, {col})!")
-                        cell["player_hit"] = True
-                        self.player_hits += 1  # Increment player's successful hits
+                    self.replay.shots.append(row * self.cols + col)
+                    if self.enemy_grid.shoot(row, col):
+                        result = self.enemy_ships.resolve(row, col)
+                        if verbose:
+                            log_event(INFO, "shot", f"Player hit an enemy ship at ({row}, {col})!",
+                                      shooter="player", row=row, col=col, outcome=result.outcome)
+                            if result.sunk:
+                                log_event(INFO, "sunk", f"Touché-coulé! Player sank the enemy's {ship_name(result.ship)}!",
+                                          shooter="player", ship=ship_name(result.ship))
+                        self.player_hits += 1
 
                         # Play the hit sound
                         self.hit_sound.play()
                     else:
-                        print(f"Player missed at ({row}, {col}).")
-                        cell["player_hit"] = True
+                        if verbose:
+                            log_event(INFO, "shot", f"Player missed at ({row}, {col}).",
+                                      shooter="player", row=row, col=col, outcome="miss")
 
                         # Play the miss sound
                         self.miss_sound.play()
 
                     # Check if the player has won
-                    if self.player_hits == 17:
+                    if self.player_hits == self.fleet_total:
                         self.winner = "player"
                         return  # End the game if the player has won
 
                     self.player_turn = False  # Switch to AI's turn
 
         if not self.player_turn:
-            print("AI's turn...")
+            if verbose:
+                log_event(INFO, "turn", "AI's turn...", side="ia")
             row, col = self.ai.choose_move(self.player_grid, self.player.boats)
-            cell = self.player_grid[row][col]
-
-            if cell["ship"]:
-                print(f"The AI hit your ship at ({row}, {col})!")
-                cell["ai_hit"] = True
-                self.ai_hits += 1  # Increment AI's successful hits
-                self.ai.update_last_hit(row, col, hit=True)
+            self.replay.shots.append(row * self.cols + col)
+
+            if self.player_grid.shoot(row, col):
+                result = self.player_ships.resolve(row, col)
+                if verbose:
+                    log_event(INFO, "shot", f"The AI hit your ship at ({row}, {col})!",
+                              shooter="ia", row=row, col=col, outcome=result.outcome)
+                    if result.sunk:
+                        log_event(INFO, "sunk", f"Touché-coulé! The AI sank your {ship_name(result.ship)}!",
+                                  shooter="ia", ship=ship_name(result.ship))
+                self.ai_hits += 1
+                self.ai.update_last_hit(row, col, hit=True, sunk=result.cells)
             else:
-                print(f"The AI missed at ({row}, {col}).")
-                cell["ai_hit"] = True
+                if verbose:
+                    log_event(INFO, "shot", f"The AI missed at ({row}, {col}).",
+                              shooter="ia", row=row, col=col, outcome="miss")
                 self.ai.update_last_hit(row, col, hit=False)
 
             # Check if the AI has won
-            if self.ai_hits == 17:
-                print("AI has won the game!")
+            if self.ai_hits == self.fleet_total:
+                if verbose:
+                    log_event(INFO, "victory", "AI has won the game!", winner="ia")
                 self.winner = "ia"
                 return  # End the game if the AI has won
 
@@ -540,30 +570,39 @@ class Board:
         """
         Resets the game board grid to its initial state.
 
-        This method clears the grid by reinitializing it with default values for each cell.
-        It also resets the player's and enemy's boats, marks the placement process as incomplete,
-        and removes any attributes related to the current boat if they exist.
+        This method clears both grids in place by zeroing their bitboards.
+        It also empties the player's and enemy's boats in place, resets the AI, marks the placement
+        process as incomplete, and removes any attributes related to the current boat if they exist.
+        Nothing is reallocated, so a `Board` can be reused for any number of games (see `game.pool`).
 
         Attributes Reset:
-        - `self.grid`: A 2D list where each cell is a dictionary with keys:
-            - "player_hit": Indicates if the player has hit this cell (default: False).
-            - "ai_hit": Indicates if the AI has hit this cell (default: False).
-            - "ship": Indicates if a ship occupies this cell (default: False).
-        - `self.player.boats`: Cleared dictionary of the player's boats.
-        - `self.enemy.boats`: Cleared dictionary of the enemy's boats.
+        - `self.player_grid` and `self.enemy_grid`: Ship and shot bitboards set to 0.
+        - `self.player.boats`: Cleared dictionary of the player's boats (same object).
+        - `self.enemy.boats`: Cleared dictionary of the enemy's boats (same object).
+        - `self.player.rows/cols` and `self.enemy.rows/cols`: Set to the board's size.
+        - `self.ai`: Shots, hits and targets forgotten (see `AI.reset`).
         - `self.placement_complete`: Set to False, indicating that ship placement is not complete.
         - `self.current_boat` and `self.current_boat_index`: Deleted if they exist.
 
         Prints:
         - A message "Grille réinitialisée !" to indicate the grid has been reset.
         """
-        # Reset the grids
-        self.player_grid = [[{"ai_hit": False, "ship": False} for _ in range(self.cols)] for _ in range(self.rows)]
-        self.enemy_grid = [[{"player_hit": False, "ship": False} for _ in range(self.cols)] for _ in range(self.rows)]
+        # Reset the grids and the ship indexes
+        self.player_grid.clear()
+        self.enemy_grid.clear()
+        self.player_ships.clear()
+        self.enemy_ships.clear()
+
+        # Reset the boats, in place: whoever holds the dictionaries keeps seeing the current game
+        self.player.boats.clear()
+        self.enemy.boats.clear()
+        self._size_players()  # The players may have been replaced since the last game
+
+        # Reset the AI, so that it does not remember the previous game's shots
+        self.ai.reset()
 
-        # Reset the boats
-        self.player.boats = {}
-        self.enemy.boats = {}
+        # Draw the seed of the new game
+        self._new_game_seed()
 
         # Reset the placement state
         self.placement_complete = False
@@ -578,6 +617,9 @@ class Board:
 
         # Reset the winner state
         self.winner = None
+        for attribute in ("victory_sound_played", "loose_sound_played"):
+            if hasattr(self, attribute):
+                delattr(self, attribute)
 
         # Place enemy boats again
         self.place_enemy_boats()
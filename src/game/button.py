@@ -1,4 +1,5 @@
 import pygame
+from game.text_cache import render_text
 
 def draw_back_button(screen, font, screen_width, screen_height, text="Retour"):
     """
@@ -25,7 +26,7 @@ def draw_back_button(screen, font, screen_width, screen_height, text="Retour"):
     pygame.draw.rect(screen, (255, 255, 255), button_rect, 2)  # White border
 
     # Draw the text at the center of the button
-    text_surface = font.render(text, True, (255, 255, 255))
+    text_surface = render_text(font, text, True, (255, 255, 255))
     screen.blit(text_surface, (button_rect.x + (button_width - text_surface.get_width()) // 2,
                                button_rect.y + (button_height - text_surface.get_height()) // 2))
 
@@ -56,7 +57,7 @@ def reinit_button(screen, font, screen_width, screen_height, text="Réinitialise
     pygame.draw.rect(screen, (255, 255, 255), button_rect, 2)  # White border
 
     # Draw the text at the center of the button
-    text_surface = font.render(text, True, (255, 255, 255))
+    text_surface = render_text(font, text, True, (255, 255, 255))
     screen.blit(text_surface, (button_rect.x + (button_width - text_surface.get_width()) // 2,
                                button_rect.y + (button_height - text_surface.get_height()) // 2))
 
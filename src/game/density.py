@@ -0,0 +1,188 @@
+from functools import lru_cache
+
+
+HIT_WEIGHT = 20  # Weight multiplier of a placement for each unsunk hit it covers
+BYTE_BITS = tuple(tuple(i for i in range(8) if byte >> i & 1) for byte in range(256))  # Set bits of each byte
+
+
+@lru_cache(maxsize=None)
+def board_mask(rows, cols):
+    """Returns the bitboard with every cell of a rows x cols grid set."""
+    return (1 << (rows * cols)) - 1
+
+
+@lru_cache(maxsize=None)
+def start_mask(rows, cols, length, horizontal):
+    """
+    Returns the bitboard of the cells where a ship of `length` can start without leaving the grid.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        length (int): Length of the ship.
+        horizontal (bool): True for a horizontal ship, False for a vertical one.
+
+    Returns:
+        int: Bitboard of the valid starting cells.
+    """
+    if horizontal:
+        if length > cols:
+            return 0
+        row_starts = (1 << (cols - length + 1)) - 1
+        return sum(row_starts << (row * cols) for row in range(rows))
+    if length > rows:
+        return 0
+    return (1 << ((rows - length + 1) * cols)) - 1
+
+
+def counter_add(planes, board):
+    """
+    Adds a 0/1 bitboard to a bit-sliced counter, in place.
+
+    `planes[i]` holds bit i of the per-cell counter, so one call increments every cell set
+    in `board` at once.
+    """
+    carry = board
+    for i in range(len(planes)):
+        if not carry:
+            return
+        planes[i], carry = planes[i] ^ carry, planes[i] & carry
+    if carry:
+        planes.append(carry)
+
+
+def counter_equals(planes, value, mask):
+    """Returns the cells of `mask` whose bit-sliced counter equals `value`."""
+    if value >> len(planes):
+        return 0
+    result = mask
+    for i, plane in enumerate(planes):
+        result &= plane if (value >> i) & 1 else ~plane
+    return result
+
+
+def counter_unpack(planes, mask, weight, out):
+    """
+    Adds `weight` times the bit-sliced counter of every cell of `mask` to a flat list, in place.
+
+    Each plane is scanned byte by byte, so the cost is linear in the number of cells instead
+    of clearing one bit at a time from an integer of the size of the board.
+
+    Args:
+        planes (list): The bit-sliced counter.
+        mask (int): Bitboard of the cells to unpack.
+        weight (int): Multiplier applied to the counter values.
+        out (list): Flat list of per-cell values, indexed by bit.
+    """
+    for bit, plane in enumerate(planes):
+        value = weight << bit
+        plane &= mask
+        data = plane.to_bytes((plane.bit_length() + 7) // 8, "little")
+        for i, byte in enumerate(data):
+            if byte:
+                base = i * 8
+                for offset in BYTE_BITS[byte]:
+                    out[base + offset] += value
+
+
+def placement_starts(free, rows, cols, length, horizontal):
+    """
+    Returns the starting cells of every placement of a ship that lies entirely on free cells.
+
+    This is a sliding-window AND over the `free` bitboard: a window of `length` cells is
+    legal if all of its cells are free.
+
+    Args:
+        free (int): Bitboard of the cells a ship may occupy.
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        length (int): Length of the ship.
+        horizontal (bool): True for horizontal placements, False for vertical ones.
+
+    Returns:
+        int: Bitboard of the starting cells of the legal placements.
+    """
+    step = 1 if horizontal else cols
+    starts = free & start_mask(rows, cols, length, horizontal)
+    for k in range(1, length):
+        if not starts:
+            break
+        starts &= free >> (k * step)
+    return starts
+
+
+def probability_density(rows, cols, misses, hits, sunk=0, ship_sizes=(5, 4, 3, 3, 2)):
+    """
+    Counts, for every cell, the weighted number of legal placements of the remaining ships covering it.
+
+    A placement is legal if it avoids misses and sunk ships. Placements covering unsunk hits
+    are weighted by `HIT_WEIGHT` per covered hit, so the cells next to a hit dominate while a
+    ship is being targeted. All placements of a given length and orientation are processed
+    together with bitboard operations: the counts are kept as bit-sliced counters and only
+    unpacked into integers at the end.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        misses (int): Bitboard of the missed shots.
+        hits (int): Bitboard of the hits on ships that are not sunk yet.
+        sunk (int, optional): Bitboard of the cells of sunk ships. Defaults to 0.
+        ship_sizes (iterable, optional): Sizes of the ships still afloat. Defaults to the full fleet.
+
+    Returns:
+        list: Flat list of `rows * cols` densities (cell (row, col) is at index row * cols + col).
+            Cells already shot have a density of 0.
+    """
+    full = board_mask(rows, cols)
+    free = full & ~(misses | sunk)
+    multiplicity = {}
+    for size in ship_sizes:
+        multiplicity[size] = multiplicity.get(size, 0) + 1
+
+    weighted = {}  # weight -> bit-sliced coverage counter
+    for length, count in multiplicity.items():
+        for horizontal in (True, False):
+            step = 1 if horizontal else cols
+            starts = placement_starts(free, rows, cols, length, horizontal)
+            if not starts:
+                continue
+
+            # Number of hits covered by each placement, as a bit-sliced counter on its start
+            hit_planes = []
+            if hits:
+                for k in range(length):
+                    counter_add(hit_planes, starts & (hits >> (k * step)))
+
+            if hit_planes:
+                groups = [(covered, counter_equals(hit_planes, covered, starts)) for covered in range(length + 1)]
+            else:
+                groups = [(0, starts)]
+
+            for covered, group in groups:
+                if not group:
+                    continue
+                planes = weighted.setdefault(count * HIT_WEIGHT ** covered, [])
+                for k in range(length):
+                    counter_add(planes, group << (k * step))
+
+    density = [0] * (rows * cols)
+    for weight, planes in weighted.items():
+        counter_unpack(planes, full & ~hits, weight, density)
+    return density
+
+
+def to_bitboard(cells, cols):
+    """
+    Converts an iterable of (row, col) cells to a bitboard.
+
+    Args:
+        cells (iterable): The cells to set.
+        cols (int): Number of columns in the grid.
+
+    Returns:
+        int: The bitboard with every given cell set.
+    """
+    board = 0
+    for row, col in cells:
+        board |= 1 << (row * cols + col)
+    return board
@@ -0,0 +1,228 @@
+from functools import lru_cache
+
+from game.placement import iter_bits, placement_index
+
+DEFAULT_LIMIT = 1000  # Number of consistent layouts above which the exact search gives up
+DEFAULT_BUDGET = 3000  # Maximum number of placements examined per move
+
+
+class _TooLarge(Exception):
+    """Raised internally when the search exceeds its limit or its budget."""
+
+
+def count_layouts(rows, cols, sizes, blocked, hits, limit=DEFAULT_LIMIT, budget=DEFAULT_BUDGET):
+    """
+    Counts every layout of the remaining ships consistent with the observations, and how many occupy each cell.
+
+    The search is exact but bounded:
+    - while a hit is uncovered, the lowest one must belong to one of the remaining ships, so
+      only the placements through it are tried, once per distinct ship size;
+    - once every hit is covered, the ships are placed in order, each ship of a given size
+      after the previous one of the same size, so that every layout is counted exactly once;
+    - the last two free ships are counted together from a table of the placements that
+      overlap (see `_conflicts`) rather than pair by pair;
+    - before placing more free ships than that, the product of their free placements is
+      checked against `limit`, so a search far too large stops before enumerating anything;
+    - a sub-state (ships left to place, occupied cells) met again is taken from a memo, and
+      a sub-state with more uncovered hits than cells left to place is dropped at once.
+
+    A sub-state is summarized by its number of layouts and the placements it is made of,
+    each weighted by the number of layouts using it, so layouts are never built one by one.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships still afloat.
+        blocked (int): Bitboard of the cells no ship can occupy (misses and sunk ships).
+        hits (int): Bitboard of the hits on ships that are not sunk yet.
+        limit (int, optional): Maximum number of layouts. Defaults to `DEFAULT_LIMIT`.
+        budget (int, optional): Maximum number of placements examined. Defaults to `DEFAULT_BUDGET`.
+
+    Returns:
+        tuple: The number of layouts and the flat list of the number of layouts occupying each
+            cell, or None if the search goes beyond `limit` or `budget`.
+    """
+    indexes = {size: placement_index(rows, cols, size) for size in set(sizes)}
+    memo = {}
+    work = [0]
+
+    def completions(remaining, occupied, floor, pools=None):
+        """
+        Returns the number of layouts of `remaining` and their weighted (placement, count) terms.
+
+        Once every hit is covered, placements are handled by their position in the placement
+        index: `floor` is the position the next ship must exceed, and `pools` maps each size to
+        the positions still free for it; it only narrows the scans and is not part of the memo key.
+        """
+        key = (remaining, occupied, floor)
+        if key in memo:
+            return memo[key]
+        uncovered = hits & ~occupied
+        taken = blocked | occupied
+        total = 0
+        terms = []
+        if not remaining:
+            total = 0 if uncovered else 1
+        elif uncovered.bit_count() <= sum(remaining):
+            if pools is None:
+                pools = {size: range(len(index)) for size, index in indexes.items()}
+            free = {}
+            for size in set(remaining):
+                masks = indexes[size].masks
+                free[size] = [i for i in pools[size] if not masks[i] & taken]
+                work[0] += len(pools[size])
+            if uncovered:
+                total, terms = cover(remaining, occupied, uncovered, taken, free)
+            else:
+                total, terms = place(remaining, occupied, floor, free)
+        if work[0] > budget or total > limit:
+            raise _TooLarge
+        memo[key] = (total, terms)
+        return total, terms
+
+    def cover(remaining, occupied, uncovered, taken, free):
+        """Places a remaining ship through the lowest uncovered hit, in every possible way."""
+        target = (uncovered & -uncovered).bit_length() - 1
+        total = 0
+        terms = []
+        for k, size in enumerate(remaining):
+            if size in remaining[:k]:
+                continue  # Ships of the same size are interchangeable
+            rest = remaining[:k] + remaining[k + 1:]
+            placements = indexes[size].through[target]
+            work[0] += len(placements)
+            for mask in placements:
+                if not mask & taken:
+                    count, child = completions(rest, occupied | mask, -1, free)
+                    if count:
+                        total += count
+                        terms.append((mask, count))
+                        terms.append(child)
+        return total, terms
+
+    def place(remaining, occupied, floor, free):
+        """Places the first remaining ship at every free position above `floor`, once every hit is covered."""
+        size, rest = remaining[0], remaining[1:]
+        masks = indexes[size].masks
+        first = [i for i in free[size] if i > floor]
+        if not rest:
+            total = len(first)
+            terms = [(masks[i], 1) for i in first]
+        elif len(rest) == 1:
+            # The last two ships are counted together from their overlaps
+            other = rest[0]
+            second = first if other == size else free[other]
+            conflicts = _conflicts(rows, cols, size, other)
+            available = _bitset(second)
+            counts = [(available & ~conflicts[i]).bit_count() for i in first]
+            total = sum(counts)
+            terms = [(masks[i], count) for i, count in zip(first, counts) if count]
+            if other == size:
+                total //= 2  # Each pair was counted from both of its placements
+            else:
+                conflicts = _conflicts(rows, cols, other, size)
+                available = _bitset(first)
+                others = indexes[other].masks
+                for j in second:
+                    count = (available & ~conflicts[j]).bit_count()
+                    if count:
+                        terms.append((others[j], count))
+        else:
+            estimate = len(first)
+            for other in rest:
+                estimate *= len(free[other])
+            if estimate > limit:
+                raise _TooLarge  # Free ships placed almost independently: far too many layouts
+            same = rest[0] == size
+            total = 0
+            terms = []
+            for i in first:
+                count, child = completions(rest, occupied | masks[i], i if same else -1, free)
+                if count:
+                    total += count
+                    terms.append((masks[i], count))
+                    terms.append(child)
+        return total, terms
+
+    try:
+        total, terms = completions(tuple(sorted(sizes, reverse=True)), 0, -1)
+    except _TooLarge:
+        return None
+
+    weights = {}  # Placement -> number of layouts using it
+    stack = [terms]
+    while stack:
+        for term in stack.pop():
+            if isinstance(term, tuple):
+                mask, count = term
+                weights[mask] = weights.get(mask, 0) + count
+            else:
+                stack.append(term)  # Terms of a sub-state, shared with the memo
+    counts = [0] * (rows * cols)
+    for mask, count in weights.items():
+        for cell in iter_bits(mask):
+            counts[cell] += count
+    return total, counts
+
+
+def _bitset(positions):
+    """Returns the bitset of a list of positions."""
+    bits = 0
+    for i in positions:
+        bits |= 1 << i
+    return bits
+
+
+@lru_cache(maxsize=None)
+def _conflicts(rows, cols, size, other):
+    """
+    Returns, for each placement of a ship of `size`, the bitset of the placements of a ship of `other` it overlaps.
+
+    Placements are numbered by their position in their `PlacementIndex`, so the placements of
+    `other` compatible with a placement `i` among a set of free ones are `free & ~conflicts[i]`.
+    """
+    others = placement_index(rows, cols, other).masks
+    covering = [0] * (rows * cols)
+    for j, mask in enumerate(others):
+        for cell in iter_bits(mask):
+            covering[cell] |= 1 << j
+    conflicts = []
+    for mask in placement_index(rows, cols, size).masks:
+        overlapping = 0
+        for cell in iter_bits(mask):
+            overlapping |= covering[cell]
+        conflicts.append(overlapping)
+    return tuple(conflicts)
+
+
+def endgame_move(rows, cols, sizes, blocked, hits, shots, limit=DEFAULT_LIMIT, budget=DEFAULT_BUDGET):
+    """
+    Returns the cell occupied by the most layouts of the remaining ships consistent with the observations.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships still afloat.
+        blocked (int): Bitboard of the misses and sunk ships.
+        hits (int): Bitboard of the hits on ships that are not sunk yet.
+        shots (int): Bitboard of the cells already targeted.
+        limit (int, optional): Maximum number of layouts. Defaults to `DEFAULT_LIMIT`.
+        budget (int, optional): Maximum number of placements examined. Defaults to `DEFAULT_BUDGET`.
+
+    Returns:
+        tuple: The (row, col) cell, the number of layouts occupying it and the number of layouts,
+            or None if the layouts could not be counted within the limits or none is consistent.
+    """
+    result = count_layouts(rows, cols, sizes, blocked, hits, limit, budget)
+    if result is None:
+        return None
+    total, counts = result
+    best_count = 0
+    best = None
+    for cell, count in enumerate(counts):
+        if count > best_count and not shots >> cell & 1:
+            best_count = count
+            best = cell
+    if best is None:
+        return None
+    return divmod(best, cols), best_count, total
@@ -0,0 +1,315 @@
+import argparse
+import math
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game.grid import make_grid
+from game.ia import AI
+from game.replay import Replay
+from game.placement import mask_to_positions, random_fleet, random_fleet_positions
+from game.ships import MISSED, ShipIndex
+from utils.boat_type import DEFAULT_FLEET
+
+
+class HeadlessGame:
+    """
+    A Battleship game between two AIs that runs without pygame.
+
+    This engine reproduces the rules of `game.board.Board` (random fleet placement,
+    alternating shots, hit counting and winner detection) without fonts, sounds or
+    a display surface, so that thousands of games can be simulated per second.
+
+    Attributes:
+        rows (int): Number of rows in each grid.
+        cols (int): Number of columns in each grid.
+        fleet (list): List of (name, size) tuples describing the ships of each side.
+        fleet_total (int): Number of ship cells a side must hit to win.
+        strategies (tuple): AI strategy used by side 0 and side 1.
+        sparse (bool): Whether the grids only store ships and shots (`SparseGrid`).
+        grids (list): For each side, the `Grid` holding its ships and the shots fired at it.
+        boats (list): For each side, a dictionary mapping ship names to their positions.
+        ships (list): For each side, the `ShipIndex` of its ships.
+        shots (list): For each side, the number of shots it has fired.
+        winner (int): Index of the winning side, or None while the game is running.
+        rng (random.Random): Random stream of the game, shared by the fleet placement and both AIs.
+        replay (Replay): Recording of the last game played, or None if `record` is False.
+    """
+
+    def __init__(self, rows=10, cols=10, fleet=None, strategies=("smart", "smart"), sparse=False, record=False):
+        """
+        Initializes a headless game.
+
+        Args:
+            rows (int, optional): Number of rows in each grid. Defaults to 10.
+            cols (int, optional): Number of columns in each grid. Defaults to 10.
+            fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+            strategies (tuple, optional): AI strategies for side 0 and side 1. Defaults to ("smart", "smart").
+            sparse (bool, optional): Use sparse grids, for very large boards. Defaults to False.
+            record (bool, optional): Record each game played in `replay`. Defaults to False.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.fleet = list(fleet if fleet is not None else DEFAULT_FLEET)
+        self.fleet_total = sum(size for _, size in self.fleet)
+        self.strategies = tuple(strategies)
+        self.sparse = sparse
+        self.grids = [make_grid(rows, cols, sparse=sparse) for _ in range(2)]
+        self.boats = [{}, {}]
+        self.ships = [ShipIndex(), ShipIndex()]
+        self.shots = [0, 0]
+        self.winner = None
+        self.rng = random.Random()
+        self.replay = Replay(rows, cols) if record else None
+        sizes = [size for _, size in self.fleet]
+        self.ais = [AI(strategy=strategy, ship_sizes=sizes, rng=self.rng) for strategy in self.strategies]
+
+    def reset(self):
+        """
+        Clears both sides and both AIs, in place, ready for a new game.
+
+        The grids, boat dictionaries and AIs are reused, so a game played by a reused
+        engine allocates almost nothing besides the ship positions.
+        """
+        self.winner = None
+        self.shots[0] = self.shots[1] = 0
+        for grid, boats, ships, ai in zip(self.grids, self.boats, self.ships, self.ais):
+            grid.clear()
+            boats.clear()
+            ships.clear()
+            ai.reset()
+
+    def place_fleet(self, side):
+        """
+        Randomly places the fleet of a side without overlap and within the grid.
+
+        Args:
+            side (int): Index of the side (0 or 1).
+
+        Raises:
+            ValueError: If the fleet cannot fit on the grid.
+        """
+        sizes = [size for _, size in self.fleet]
+        if self.sparse:
+            fleet_positions = random_fleet_positions(self.rows, self.cols, sizes, self.rng)
+        else:
+            fleet_positions = [mask_to_positions(mask, self.cols) for mask in random_fleet(self.rows, self.cols, sizes, self.rng)]
+        if self.replay is not None:
+            self.replay.set_fleet(side, fleet_positions)
+        for (name, _), positions in zip(self.fleet, fleet_positions):
+            self.grids[side].place_ship(positions)
+            self.ships[side].add(name, positions)
+            self.boats[side][name] = positions
+
+    def fire(self, side, row, col):
+        """
+        Resolves a shot fired by `side` at the opponent's grid.
+
+        Args:
+            side (int): Index of the side firing the shot.
+            row (int): Targeted row.
+            col (int): Targeted column.
+
+        Returns:
+            ShotResult: Miss, hit or sunk, with the ship hit and the cells of a sunk ship.
+        """
+        self.shots[side] += 1
+        if not self.grids[1 - side].shoot(row, col):
+            return MISSED
+        ships = self.ships[1 - side]
+        result = ships.resolve(row, col)
+        if result.sunk and ships.afloat == 0:
+            self.winner = side
+        return result
+
+    def shoot(self, side, row, col):
+        """
+        Resolves a shot fired by `side` at the opponent's grid.
+
+        Args:
+            side (int): Index of the side firing the shot.
+            row (int): Targeted row.
+            col (int): Targeted column.
+
+        Returns:
+            bool: True if the shot hit a ship, False otherwise.
+        """
+        return bool(self.fire(side, row, col))
+
+    def hits(self, side):
+        """Returns the number of ship cells hit by `side`."""
+        return self.grids[1 - side].hit_count()
+
+    def play(self, seed=None):
+        """
+        Plays a full game, side 0 firing first.
+
+        All the randomness of the game (fleets and AI moves) is drawn from `rng`, reseeded here,
+        so a game only depends on its seed and does not touch the global `random` module.
+
+        Args:
+            seed (int, optional): Seed of the game's random stream, making the game reproducible.
+
+        Returns:
+            dict: The winning side ("winner") and the number of shots it fired ("shots").
+        """
+        if seed is None and self.replay is not None:
+            seed = random.getrandbits(64)  # Draw a seed, so that the recorded game can be reproduced
+        if seed is not None:
+            self.rng.seed(seed)
+        self.reset()
+        record = None
+        if self.replay is not None:
+            self.replay.seed = seed
+            del self.replay.shots[:]
+            record = self.replay.shots.append
+        self.place_fleet(0)
+        self.place_fleet(1)
+
+        side = 0
+        cols = self.cols
+        # Each side fires at most once per cell
+        max_turns = 2 * self.rows * self.cols
+        for _ in range(max_turns):
+            ai = self.ais[side]
+            row, col = ai.choose_move(self.grids[1 - side], self.boats[1 - side])
+            if record is not None:
+                record(row * cols + col)
+            result = self.fire(side, row, col)
+            ai.update_last_hit(row, col, result.hit, result.cells)
+            if self.winner is not None:
+                break
+            side = 1 - side
+
+        return {"winner": self.winner, "shots": self.shots[self.winner] if self.winner is not None else None}
+
+
+def play_games(seeds, rows=10, cols=10, fleet=None, strategies=("smart", "smart"), sparse=False):
+    """
+    Plays one headless game per seed, reusing a single engine.
+
+    Args:
+        seeds (iterable): Seeds of the games to play.
+        rows (int, optional): Number of rows in each grid. Defaults to 10.
+        cols (int, optional): Number of columns in each grid. Defaults to 10.
+        fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+        strategies (tuple, optional): AI strategies for side 0 and side 1.
+        sparse (bool, optional): Use sparse grids, for very large boards. Defaults to False.
+
+    Returns:
+        tuple: A Counter of shots-to-win and a list with the number of wins of each side.
+    """
+    game = HeadlessGame(rows, cols, fleet, strategies, sparse)
+    distribution = Counter()
+    wins = [0, 0]
+    for seed in seeds:
+        result = game.play(seed)
+        if result["winner"] is not None:
+            distribution[result["shots"]] += 1
+            wins[result["winner"]] += 1
+    return distribution, wins
+
+
+def _play_chunk(args):
+    """Process pool entry point: unpacks the arguments of `play_games`."""
+    start, stop, rows, cols, fleet, strategies, sparse = args
+    return play_games(range(start, stop), rows, cols, fleet, strategies, sparse)
+
+
+def run_batch(n_games, seed=0, workers=None, rows=10, cols=10, fleet=None, strategies=("smart", "smart"), chunk_size=None, sparse=False):
+    """
+    Plays `n_games` seeded headless games across a process pool and aggregates the results.
+
+    Game `i` is played with seed `seed + i`, so a batch is reproducible whatever the
+    number of workers.
+
+    Args:
+        n_games (int): Number of games to play.
+        seed (int, optional): Seed of the first game. Defaults to 0.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            With 1 worker, the games are played in the current process.
+        rows (int, optional): Number of rows in each grid. Defaults to 10.
+        cols (int, optional): Number of columns in each grid. Defaults to 10.
+        fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+        strategies (tuple, optional): AI strategies for side 0 and side 1.
+        chunk_size (int, optional): Number of games sent to a worker at once.
+        sparse (bool, optional): Use sparse grids, for very large boards. Defaults to False.
+
+    Returns:
+        dict: Aggregate statistics with the keys:
+            - "games" (int): Number of games that produced a winner.
+            - "wins" (list): Number of wins of each side.
+            - "mean_shots" (float): Mean number of shots fired by the winner.
+            - "stdev_shots" (float): Standard deviation of the shots-to-win.
+            - "min_shots" (int) and "max_shots" (int): Extremes of the shots-to-win.
+            - "distribution" (dict): Number of games won in each number of shots.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(10_000, n_games // (workers * 4) or 1))
+    chunks = [
+        (start, min(start + chunk_size, seed + n_games), rows, cols, fleet, strategies, sparse)
+        for start in range(seed, seed + n_games, chunk_size)
+    ]
+
+    distribution = Counter()
+    wins = [0, 0]
+    if workers == 1:
+        results = map(_play_chunk, chunks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_play_chunk, chunks)
+    try:
+        for chunk_distribution, chunk_wins in results:
+            distribution.update(chunk_distribution)
+            wins[0] += chunk_wins[0]
+            wins[1] += chunk_wins[1]
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    return summarize(distribution, wins)
+
+
+def summarize(distribution, wins):
+    """
+    Builds the statistics dictionary returned by `run_batch` from a shots-to-win distribution.
+
+    Args:
+        distribution (Counter): Number of games won in each number of shots.
+        wins (list): Number of wins of each side.
+
+    Returns:
+        dict: See `run_batch`.
+    """
+    games = sum(distribution.values())
+    if games == 0:
+        return {"games": 0, "wins": wins, "mean_shots": None, "stdev_shots": None,
+                "min_shots": None, "max_shots": None, "distribution": {}}
+
+    mean = sum(shots * count for shots, count in distribution.items()) / games
+    variance = sum(count * (shots - mean) ** 2 for shots, count in distribution.items()) / games
+    return {
+        "games": games,
+        "wins": wins,
+        "mean_shots": mean,
+        "stdev_shots": math.sqrt(variance),
+        "min_shots": min(distribution),
+        "max_shots": max(distribution),
+        "distribution": dict(sorted(distribution.items())),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays seeded AI-vs-AI games without pygame.")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--strategy", nargs=2, default=["smart", "smart"])
+    args = parser.parse_args()
+
+    stats = run_batch(args.games, seed=args.seed, workers=args.workers, strategies=tuple(args.strategy))
+    print(f"{stats['games']} games, wins {stats['wins']}, "
+          f"shots-to-win {stats['mean_shots']:.2f} ± {stats['stdev_shots']:.2f} "
+          f"(min {stats['min_shots']}, max {stats['max_shots']})")
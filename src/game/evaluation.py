@@ -0,0 +1,290 @@
+import argparse
+import math
+import os
+import random
+import statistics
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from game import ia
+from game.engine import HeadlessGame
+from game.placement import mask_to_positions, random_fleet
+from game.replay import decode_ship, encode_ship
+from utils.boat_type import DEFAULT_FLEET
+
+PERCENTILES = (10, 50, 90)
+Z_95 = 1.959963984540054  # Two-sided 95 % quantile of the normal distribution
+
+_games = {}  # Engine reused by each worker process, per (rows, cols, fleet, strategy)
+
+
+def build_corpus(n_layouts, rows=10, cols=10, sizes=None, seed=0):
+    """
+    Draws a fixed corpus of random fleet layouts.
+
+    Each ship is stored as one integer, `first cell * 2 + horizontal`, in the order of
+    `sizes`: a corpus of 10 000 layouts of the default fleet takes 200 KB.
+
+    Args:
+        n_layouts (int): Number of layouts.
+        rows (int, optional): Number of rows in the grid. Defaults to 10.
+        cols (int, optional): Number of columns in the grid. Defaults to 10.
+        sizes (list, optional): Sizes of the ships. Defaults to the `BoatType` fleet.
+        seed (int, optional): Seed of the corpus. Defaults to 0.
+
+    Returns:
+        array: `n_layouts * len(sizes)` unsigned integers.
+    """
+    sizes = list(sizes) if sizes is not None else [size for _, size in DEFAULT_FLEET]
+    rng = random.Random(seed)
+    corpus = array("I")
+    for _ in range(n_layouts):
+        for mask in random_fleet(rows, cols, sizes, rng):
+            _, horizontal, start = encode_ship(mask_to_positions(mask, cols), cols)
+            corpus.append(start * 2 + horizontal)
+    return corpus
+
+
+def layout_positions(corpus, index, sizes, cols):
+    """Returns the list of (row, col) cells of each ship of the layout `index` of a corpus."""
+    offset = index * len(sizes)
+    return [decode_ship(size, code & 1, code >> 1, cols) for size, code in zip(sizes, corpus[offset:offset + len(sizes)])]
+
+
+def shots_to_sink(game, positions, seed):
+    """
+    Counts the shots side 0 of an engine needs to sink a given fleet.
+
+    Args:
+        game (HeadlessGame): Engine whose first AI fires; it is reset here.
+        positions (list): Cells of each ship of the target fleet.
+        seed (str): Seed of the AI's random stream.
+
+    Returns:
+        int: Number of shots fired until the last ship sank.
+    """
+    game.rng.seed(seed)
+    game.reset()
+    for (name, _), cells in zip(game.fleet, positions):
+        game.grids[1].place_ship(cells)
+        game.ships[1].add(name, cells)
+        game.boats[1][name] = cells
+    ai = game.ais[0]
+    for _ in range(game.rows * game.cols):
+        row, col = ai.choose_move(game.grids[1], game.boats[1])
+        result = game.fire(0, row, col)
+        ai.update_last_hit(row, col, result.hit, result.cells)
+        if game.winner is not None:
+            break
+    return game.shots[0]
+
+
+def _evaluate_chunk(args):
+    """
+    Process pool entry point: plays a range of layouts of the shared corpus with one strategy.
+
+    Returns:
+        tuple: The strategy, the first layout and the shots-to-sink of each layout.
+    """
+    name, start, stop, rows, cols, fleet, strategy, seed = args
+    key = (rows, cols, fleet, strategy)
+    if key not in _games:
+        _games[key] = HeadlessGame(rows, cols, fleet, (strategy, strategy))
+    game = _games[key]
+    sizes = [size for _, size in fleet]
+
+    block = shared_memory.SharedMemory(name=name)  # Pool workers share the creator's resource tracker
+    try:
+        corpus = block.buf.cast("I")
+        try:
+            shots = array("H", (shots_to_sink(game, layout_positions(corpus, i, sizes, cols), f"{seed}:{i}")
+                                for i in range(start, stop)))
+        finally:
+            corpus.release()
+    finally:
+        block.close()
+    return strategy, start, shots
+
+
+def evaluate(strategies=None, n_layouts=1000, rows=10, cols=10, fleet=None, seed=0, workers=None, chunk_size=None):
+    """
+    Plays every strategy against the same corpus of fleet layouts, across a process pool.
+
+    The corpus is built once and placed in shared memory, so the workers read it in place
+    instead of receiving a copy with each task. Layout `i` is fired at with the AI random
+    stream seeded "seed:i" whatever the strategy, so the results are paired layout by
+    layout and reproducible whatever the number of workers.
+
+    Args:
+        strategies (tuple, optional): Strategies to evaluate. Defaults to every strategy of
+            `game.ia.STRATEGIES`, including those added with `register_strategy`. The moves of
+            "montecarlo" depend on its sampling time budget, so its results, unlike the
+            others, may vary from one run to the next.
+        n_layouts (int, optional): Number of fleet layouts. Defaults to 1000.
+        rows (int, optional): Number of rows in the grid. Defaults to 10.
+        cols (int, optional): Number of columns in the grid. Defaults to 10.
+        fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+        seed (int, optional): Seed of the corpus and of the AIs. Defaults to 0.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            With 1 worker, the games are played in the current process.
+        chunk_size (int, optional): Number of layouts sent to a worker at once.
+
+    Returns:
+        dict: For each strategy, the `array` of its shots-to-sink, in corpus order.
+    """
+    strategies = tuple(strategies) if strategies is not None else tuple(ia.STRATEGIES)
+    fleet = tuple(fleet) if fleet is not None else tuple(DEFAULT_FLEET)
+    corpus = build_corpus(n_layouts, rows, cols, [size for _, size in fleet], seed)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(1000, n_layouts * len(strategies) // (workers * 4) or 1))
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(corpus) * corpus.itemsize))
+    try:
+        block.buf[:len(corpus) * corpus.itemsize] = corpus.tobytes()
+        tasks = [(block.name, start, min(start + chunk_size, n_layouts), rows, cols, fleet, strategy, seed)
+                 for strategy in strategies for start in range(0, n_layouts, chunk_size)]
+        results = {strategy: array("H", bytes(2 * n_layouts)) for strategy in strategies}
+        executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+        chunks = executor.map(_evaluate_chunk, tasks) if executor else map(_evaluate_chunk, tasks)
+        try:
+            for strategy, start, shots in chunks:
+                results[strategy][start:start + len(shots)] = shots
+        finally:
+            if executor:
+                executor.shutdown()
+    finally:
+        block.close()
+        block.unlink()
+    return results
+
+
+def percentile(ordered, p):
+    """Returns the `p`-th percentile of a sorted sequence (nearest rank)."""
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def describe(shots, percentiles=PERCENTILES):
+    """
+    Summarizes the shots-to-sink of a strategy, with 95 % confidence intervals.
+
+    The interval of the mean uses the normal approximation; the interval of each percentile
+    is given by the ranks `n*q ± 1.96 * sqrt(n*q*(1-q))` of the sorted sample, which needs
+    no resampling.
+
+    Args:
+        shots (sequence): Shots-to-sink of each layout.
+        percentiles (tuple, optional): Percentiles to report. Defaults to `PERCENTILES`.
+
+    Returns:
+        dict: "games", "mean", "stdev", "mean_ci" (low, high) and, for each percentile `p`,
+            "p<p>" with its value and "p<p>_ci" with its interval.
+    """
+    n = len(shots)
+    ordered = sorted(shots)
+    mean = statistics.fmean(ordered)
+    stdev = statistics.stdev(ordered) if n > 1 else 0.0
+    margin = Z_95 * stdev / math.sqrt(n)
+    summary = {"games": n, "mean": mean, "stdev": stdev, "mean_ci": (mean - margin, mean + margin)}
+    for p in percentiles:
+        q = p / 100
+        spread = Z_95 * math.sqrt(n * q * (1 - q))
+        low = max(0, math.floor(n * q - spread) - 1)
+        high = min(n - 1, math.ceil(n * q + spread) - 1)
+        summary[f"p{p}"] = percentile(ordered, p)
+        summary[f"p{p}_ci"] = (ordered[low], ordered[high])
+    return summary
+
+
+def paired_tests(a, b):
+    """
+    Compares two strategies played on the same layouts.
+
+    Args:
+        a (sequence): Shots-to-sink of the first strategy.
+        b (sequence): Shots-to-sink of the second strategy, layout by layout.
+
+    Returns:
+        dict:
+            - "mean_difference" (float): Mean of `a - b`; negative when `a` needs fewer shots.
+            - "t" (float) and "t_p_value" (float): Paired t statistic and its two-sided p-value
+              (normal approximation, accurate from a few dozen layouts).
+            - "wins", "losses", "ties" (int): Layouts where `a` needed fewer, more or as many shots.
+            - "sign_p_value" (float): Two-sided p-value of the sign test, ignoring ties.
+    """
+    differences = [x - y for x, y in zip(a, b)]
+    n = len(differences)
+    mean = statistics.fmean(differences)
+    stdev = statistics.stdev(differences) if n > 1 else 0.0
+    if stdev:
+        t = mean / (stdev / math.sqrt(n))
+        t_p_value = math.erfc(abs(t) / math.sqrt(2))
+    else:
+        t = 0.0 if mean == 0 else math.copysign(math.inf, mean)
+        t_p_value = 1.0 if mean == 0 else 0.0
+
+    wins = sum(1 for d in differences if d < 0)
+    losses = sum(1 for d in differences if d > 0)
+    return {"mean_difference": mean, "t": t, "t_p_value": t_p_value, "wins": wins, "losses": losses,
+            "ties": n - wins - losses, "sign_p_value": sign_test(wins, losses)}
+
+
+def sign_test(wins, losses):
+    """
+    Two-sided p-value of the sign test.
+
+    Exact binomial tail up to 1000 decisive layouts, normal approximation with continuity
+    correction beyond.
+
+    Args:
+        wins (int): Number of layouts won by the first strategy.
+        losses (int): Number of layouts won by the second strategy.
+
+    Returns:
+        float: The p-value.
+    """
+    n = wins + losses
+    if n == 0:
+        return 1.0
+    k = min(wins, losses)
+    if n <= 1000:
+        tail = sum(math.comb(n, i) for i in range(k + 1)) / 2 ** n
+        return min(1.0, 2 * tail)
+    z = (abs(wins - losses) - 1) / math.sqrt(n)
+    return min(1.0, math.erfc(z / math.sqrt(2)))
+
+
+def report(results):
+    """
+    Formats the summary of each strategy and the paired tests between every two strategies.
+
+    Args:
+        results (dict): Shots-to-sink of each strategy, as returned by `evaluate`.
+
+    Returns:
+        str: The report.
+    """
+    lines = []
+    for strategy, shots in results.items():
+        s = describe(shots)
+        quantiles = "  ".join(f"p{p} {s[f'p{p}']} [{s[f'p{p}_ci'][0]}-{s[f'p{p}_ci'][1]}]" for p in PERCENTILES)
+        lines.append(f"{strategy:12} mean {s['mean']:6.2f} [{s['mean_ci'][0]:.2f}-{s['mean_ci'][1]:.2f}]  {quantiles}")
+    names = list(results)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            test = paired_tests(results[a], results[b])
+            lines.append(f"{a} vs {b}: {test['mean_difference']:+.2f} shots, t={test['t']:.2f} (p={test['t_p_value']:.2g}), "
+                         f"{test['wins']}/{test['losses']}/{test['ties']} wins/losses/ties (sign p={test['sign_p_value']:.2g})")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares the AI strategies on a fixed corpus of fleet layouts.")
+    parser.add_argument("--strategies", nargs="+", default=None, choices=sorted(ia.STRATEGIES))
+    parser.add_argument("--layouts", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(report(evaluate(args.strategies, args.layouts, seed=args.seed, workers=args.workers)))
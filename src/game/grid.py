@@ -0,0 +1,339 @@
+class _GridView:
+    """Compatibility view shared by the grid types: grid[row][col]["ship"], len(grid), iteration over rows."""
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError("grid row out of range")
+        return _RowView(self, row)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield _RowView(self, row)
+
+
+class Grid(_GridView):
+    """
+    Compact game grid storing ships and shots as integer bitboards.
+
+    Cell (row, col) is bit `row * cols + col` of each bitboard, so every cell query is a
+    shift and a mask, a reset is two integer assignments and the number of hits is the
+    popcount of `ships & shots`.
+
+    For compatibility with the former list-of-dict grids, `grid[row][col]` returns a view
+    of the cell that supports `cell["ship"]`, `cell[hit_key]` and `cell.get(...)`, for
+    reading as well as writing.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        hit_key (str): Name under which the compatibility view exposes shots ("player_hit" or "ai_hit").
+        ships (int): Bitboard of the cells occupied by a ship.
+        shots (int): Bitboard of the cells that have been targeted.
+    """
+
+    def __init__(self, rows, cols, hit_key="player_hit"):
+        """
+        Initializes an empty grid.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            hit_key (str, optional): Key used by the compatibility view for shots. Defaults to "player_hit".
+        """
+        self.rows = rows
+        self.cols = cols
+        self.hit_key = hit_key
+        self.ships = 0
+        self.shots = 0
+
+    def index(self, row, col):
+        """Returns the bit index of the cell (row, col)."""
+        return row * self.cols + col
+
+    def has_ship(self, row, col):
+        """Returns True if a ship occupies the cell (row, col)."""
+        return (self.ships >> (row * self.cols + col)) & 1 == 1
+
+    def is_shot(self, row, col):
+        """Returns True if the cell (row, col) has already been targeted."""
+        return (self.shots >> (row * self.cols + col)) & 1 == 1
+
+    def set_ship(self, row, col, value=True):
+        """
+        Marks or clears a ship on the cell (row, col).
+
+        Args:
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+            value (bool, optional): True to place a ship, False to remove it. Defaults to True.
+        """
+        bit = 1 << (row * self.cols + col)
+        self.ships = self.ships | bit if value else self.ships & ~bit
+
+    def set_shot(self, row, col, value=True):
+        """
+        Marks or clears a shot on the cell (row, col).
+
+        Args:
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+            value (bool, optional): True to mark the cell as targeted, False to clear it. Defaults to True.
+        """
+        bit = 1 << (row * self.cols + col)
+        self.shots = self.shots | bit if value else self.shots & ~bit
+
+    def shoot(self, row, col):
+        """
+        Marks the cell (row, col) as targeted.
+
+        Args:
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+
+        Returns:
+            bool: True if a ship occupies the cell, False otherwise.
+        """
+        bit = 1 << (row * self.cols + col)
+        self.shots |= bit
+        return self.ships & bit != 0
+
+    @property
+    def hits(self):
+        """Bitboard of the ship cells that have been targeted."""
+        return self.ships & self.shots
+
+    def hit_count(self):
+        """Returns the number of ship cells that have been targeted."""
+        return (self.ships & self.shots).bit_count()
+
+    def ship_count(self):
+        """Returns the number of cells occupied by a ship."""
+        return self.ships.bit_count()
+
+    def clear(self):
+        """Removes every ship and shot from the grid, in place."""
+        self.ships = 0
+        self.shots = 0
+
+    def place_ship(self, positions):
+        """
+        Marks every (row, col) cell of a ship.
+
+        Args:
+            positions (iterable): The cells occupied by the ship.
+        """
+        for row, col in positions:
+            self.ships |= 1 << (row * self.cols + col)
+
+
+class SparseGrid(_GridView):
+    """
+    Grid storing only the occupied and targeted cells, for very large boards.
+
+    Memory scales with the number of ship cells and shots instead of `rows * cols`, which
+    makes 1000x1000 boards practical. It offers the same interface as `Grid`; the `ships`,
+    `shots` and `hits` bitboards are built on demand and cost O(occupied cells).
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        hit_key (str): Name under which the compatibility view exposes shots ("player_hit" or "ai_hit").
+        ship_cells (set): Indexes (row * cols + col) of the cells occupied by a ship.
+        shot_cells (set): Indexes of the cells that have been targeted.
+    """
+
+    def __init__(self, rows, cols, hit_key="player_hit"):
+        """
+        Initializes an empty sparse grid.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            hit_key (str, optional): Key used by the compatibility view for shots. Defaults to "player_hit".
+        """
+        self.rows = rows
+        self.cols = cols
+        self.hit_key = hit_key
+        self.ship_cells = set()
+        self.shot_cells = set()
+        self._hit_count = 0
+
+    def index(self, row, col):
+        """Returns the index of the cell (row, col)."""
+        return row * self.cols + col
+
+    def has_ship(self, row, col):
+        """Returns True if a ship occupies the cell (row, col)."""
+        return row * self.cols + col in self.ship_cells
+
+    def is_shot(self, row, col):
+        """Returns True if the cell (row, col) has already been targeted."""
+        return row * self.cols + col in self.shot_cells
+
+    def set_ship(self, row, col, value=True):
+        """Marks or clears a ship on the cell (row, col)."""
+        cell = row * self.cols + col
+        value = bool(value)
+        if value == (cell in self.ship_cells):
+            return
+        if cell in self.shot_cells:
+            self._hit_count += 1 if value else -1
+        if value:
+            self.ship_cells.add(cell)
+        else:
+            self.ship_cells.discard(cell)
+
+    def set_shot(self, row, col, value=True):
+        """Marks or clears a shot on the cell (row, col)."""
+        cell = row * self.cols + col
+        value = bool(value)
+        if value == (cell in self.shot_cells):
+            return
+        if cell in self.ship_cells:
+            self._hit_count += 1 if value else -1
+        if value:
+            self.shot_cells.add(cell)
+        else:
+            self.shot_cells.discard(cell)
+
+    def shoot(self, row, col):
+        """
+        Marks the cell (row, col) as targeted.
+
+        Returns:
+            bool: True if a ship occupies the cell, False otherwise.
+        """
+        self.set_shot(row, col)
+        return row * self.cols + col in self.ship_cells
+
+    @property
+    def ships(self):
+        """Bitboard of the cells occupied by a ship, built on demand."""
+        return sum(1 << cell for cell in self.ship_cells)
+
+    @property
+    def shots(self):
+        """Bitboard of the cells that have been targeted, built on demand."""
+        return sum(1 << cell for cell in self.shot_cells)
+
+    @property
+    def hits(self):
+        """Bitboard of the ship cells that have been targeted, built on demand."""
+        return sum(1 << cell for cell in self.ship_cells & self.shot_cells)
+
+    def hit_count(self):
+        """Returns the number of ship cells that have been targeted."""
+        return self._hit_count
+
+    def ship_count(self):
+        """Returns the number of cells occupied by a ship."""
+        return len(self.ship_cells)
+
+    def clear(self):
+        """Removes every ship and shot from the grid, in place."""
+        self.ship_cells.clear()
+        self.shot_cells.clear()
+        self._hit_count = 0
+
+    def place_ship(self, positions):
+        """
+        Marks every (row, col) cell of a ship.
+
+        Args:
+            positions (iterable): The cells occupied by the ship.
+        """
+        for row, col in positions:
+            self.set_ship(row, col)
+
+
+def make_grid(rows, cols, hit_key="player_hit", sparse=False):
+    """
+    Creates an empty grid.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        hit_key (str, optional): Key used by the compatibility view for shots. Defaults to "player_hit".
+        sparse (bool, optional): True for a `SparseGrid`, False for a bitboard `Grid`. Defaults to False.
+
+    Returns:
+        Grid or SparseGrid: The new grid.
+    """
+    return (SparseGrid if sparse else Grid)(rows, cols, hit_key)
+
+
+class _RowView:
+    """A row of a `Grid`, indexable by column."""
+
+    __slots__ = ("grid", "row")
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.grid.cols:
+            raise IndexError("grid column out of range")
+        return _CellView(self.grid, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.grid.cols):
+            yield _CellView(self.grid, self.row, col)
+
+
+class _CellView:
+    """A cell of a `Grid`, behaving like the former {"ship": ..., hit_key: ...} dictionary."""
+
+    __slots__ = ("grid", "row", "col")
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+
+    def keys(self):
+        return ("ship", self.grid.hit_key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key == "ship":
+            return self.grid.has_ship(self.row, self.col)
+        if key == self.grid.hit_key:
+            return self.grid.is_shot(self.row, self.col)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "ship":
+            self.grid.set_ship(self.row, self.col, value)
+        elif key == self.grid.hit_key:
+            self.grid.set_shot(self.row, self.col, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, _CellView)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
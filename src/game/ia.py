@@ -1,23 +1,320 @@
 import random
 
+from game.density import probability_density, to_bitboard
+from game.endgame import DEFAULT_BUDGET, DEFAULT_LIMIT, endgame_move
+from game.montecarlo import FleetSampler
+from game.opening import BOOK_DIR, load_book
+from game.tracker import DensityTracker
+from utils.boat_type import BoatType
+
+POOL_LIMIT = 1 << 16  # Boards with more cells skip the remaining-cell pool and the shot bitboard
+ENDGAME_SHIPS = 2  # The exact endgame search is tried once this many ships or fewer are afloat
+PARITY_ATTEMPTS = 64  # Random parity cells drawn by the large-board hunt before any open cell is accepted
+
+STRATEGIES = {}  # Name -> function(ai, grid) returning the (row, col) of the next shot
+
+
+def register_strategy(name, function=None):
+    """
+    Registers an AI strategy under a name, as a function or as a decorator::
+
+        @register_strategy("diagonal")
+        def diagonal_strategy(ai, grid):
+            ...
+            return ai._record_shot(cell)
+
+    A strategy receives the `AI` and the grid, reads and updates the AI's `state` (the shots
+    through `AI._record_shot`), and returns the chosen cell.
+
+    Args:
+        name (str): Name of the strategy, as passed to `AI`.
+        function (callable, optional): The strategy. Defaults to None, to use as a decorator.
+
+    Returns:
+        callable: The strategy, or the decorator registering it.
+    """
+    def register(function):
+        STRATEGIES[name] = function
+        return function
+    return register(function) if function is not None else register
+
+
+class AIState:
+    """
+    Everything an AI learns during one game.
+
+    The state only holds flat containers of cells and integers, so `copy` duplicates it with
+    a handful of shallow copies: search strategies and simulators can fork a game in a few
+    microseconds instead of deep-copying the AI.
+
+    Attributes:
+        shots (set): Shots already made.
+        shot_mask (int): Bitboard of the shots already made (bit row * cols + col).
+        hits (list): Successful hits on ships that are not sunk yet.
+        sunk (list): Cells of the ships already sunk.
+        sunk_ships (list): Cells of each sunk ship, in the order they were sunk.
+        remaining_ships (list): Sizes of the ships still afloat.
+        possible_targets (dict): Target mode frontier: priority of each open cell next to the unsunk hits.
+        probability_grid (list): Probability grid of the last smart move, or None (always on boards larger than `POOL_LIMIT`).
+        density (DensityTracker): Probability density kept up to date by each shot, once a smart move needed it, or None.
+        current_orientation (str): Axis ("horizontal" or "vertical") of the longest line of unsunk hits, or None.
+        remaining_cells (list): Cells not targeted yet, in no particular order.
+        remaining_index (dict): Position of each cell in `remaining_cells`.
+        sampler (FleetSampler): Fleet layout sampler of the "montecarlo" strategy, or None.
+    """
+
+    __slots__ = ("shots", "shot_mask", "hits", "sunk", "sunk_ships", "remaining_ships", "possible_targets",
+                 "probability_grid", "density", "current_orientation", "remaining_cells", "remaining_index", "sampler")
+
+    def __init__(self, ship_sizes=()):
+        self.shots = set()
+        self.shot_mask = 0
+        self.hits = []
+        self.sunk = []
+        self.sunk_ships = []
+        self.remaining_ships = list(ship_sizes)
+        self.possible_targets = {}
+        self.probability_grid = None
+        self.density = None
+        self.current_orientation = None
+        self.remaining_cells = []
+        self.remaining_index = {}
+        self.sampler = None
+
+    def reset(self, ship_sizes, all_cells=None):
+        """
+        Forgets the game, in place: the containers are emptied rather than replaced.
+
+        Args:
+            ship_sizes (tuple): Sizes of the opponent's ships.
+            all_cells (tuple, optional): Every cell of the grid, to refill the pool of remaining
+                cells. Defaults to None (no pool).
+        """
+        self.shots.clear()
+        self.shot_mask = 0
+        self.hits.clear()
+        self.sunk.clear()
+        self.sunk_ships.clear()
+        self.remaining_ships[:] = ship_sizes
+        self.possible_targets.clear()
+        self.probability_grid = None
+        self.current_orientation = None
+        if self.density is not None:
+            self.density.reset(ship_sizes)
+        if self.sampler is not None:
+            self.sampler.reset()
+        if all_cells is not None:
+            self.remaining_cells[:] = all_cells
+            self.remaining_index.clear()
+            self.remaining_index.update(zip(all_cells, range(len(all_cells))))
+
+    def copy(self):
+        """
+        Returns an independent copy of the state.
+
+        Returns:
+            AIState: The copy. The cells are tuples, shared with the original.
+        """
+        clone = AIState.__new__(AIState)
+        clone.shots = set(self.shots)
+        clone.shot_mask = self.shot_mask
+        clone.hits = list(self.hits)
+        clone.sunk = list(self.sunk)
+        clone.sunk_ships = list(self.sunk_ships)  # Sunk ships are never modified once recorded
+        clone.remaining_ships = list(self.remaining_ships)
+        clone.possible_targets = dict(self.possible_targets)
+        clone.probability_grid = self.probability_grid  # Replaced, never modified, by each smart move
+        clone.density = self.density.copy() if self.density is not None else None
+        clone.current_orientation = self.current_orientation
+        clone.remaining_cells = list(self.remaining_cells)
+        clone.remaining_index = dict(self.remaining_index)
+        clone.sampler = self.sampler.copy() if self.sampler is not None else None
+        return clone
+
+
+def _room(is_open, cell, dr, dc, limit):
+    """Counts the open cells from `cell` onwards in the direction (dr, dc), up to `limit`."""
+    count = 0
+    while count < limit and is_open(cell):
+        count += 1
+        cell = (cell[0] + dr, cell[1] + dc)
+    return count
+
+
+def _state_attribute(name):
+    """Returns a property reading and writing the attribute `name` of the AI's `state`."""
+    return property(lambda ai: getattr(ai.state, name), lambda ai, value: setattr(ai.state, name, value),
+                    doc=f"`AIState.{name}` of the current game.")
+
+
 class AI:
     """
     Class representing the AI for the Battleship game.
     Implements a strategy combining Hunt/Target, parity, probability density, and advanced logic.
+
+    The AI holds its settings; what it learns during a game lives in `state` (see `AIState`),
+    also reachable through the attributes of the same name (`ai.shots`, `ai.hits`...).
+    Strategies are looked up by name in `STRATEGIES` (see `register_strategy`).
     """
-    def __init__(self, strategy="smart"):
+    shots = _state_attribute("shots")
+    shot_mask = _state_attribute("shot_mask")
+    hits = _state_attribute("hits")
+    sunk = _state_attribute("sunk")
+    sunk_ships = _state_attribute("sunk_ships")
+    remaining_ships = _state_attribute("remaining_ships")
+    possible_targets = _state_attribute("possible_targets")
+    probability_grid = _state_attribute("probability_grid")
+    current_orientation = _state_attribute("current_orientation")
+    remaining_cells = _state_attribute("remaining_cells")
+    remaining_index = _state_attribute("remaining_index")
+    sampler = _state_attribute("sampler")
+
+    def __init__(self, strategy="smart", samples=200, time_budget=0.003, ship_sizes=None, rng=random,
+                 endgame_limit=DEFAULT_LIMIT, endgame_budget=DEFAULT_BUDGET, book_dir=BOOK_DIR):
         """
         Initializes the AI with a given strategy.
 
         Args:
-            strategy (str): The strategy to use ("random", "targeted", "smart").
+            strategy (str): The strategy to use: "random", "targeted", "smart", "montecarlo",
+                or any name registered with `register_strategy`.
+            ship_sizes (list, optional): Sizes of the opponent's ships. Defaults to the `BoatType` fleet.
+            samples (int, optional): Number of fleet layouts kept by the "montecarlo" strategy. Defaults to 200.
+            time_budget (float, optional): Sampling time budget per "montecarlo" move, in seconds. Defaults to 0.003.
+            rng (random.Random, optional): Random number generator, e.g. the seeded stream of a game.
+                Defaults to the random module.
+            endgame_limit (int, optional): Number of layouts the exact endgame search of the "smart"
+                strategy may enumerate before giving up (0 disables it). Defaults to `DEFAULT_LIMIT`.
+            endgame_budget (int, optional): Placements examined at most by the exact search per move,
+                which bounds its cost. Defaults to `DEFAULT_BUDGET`.
+            book_dir (str, optional): Directory of the opening books of the "smart" strategy (see
+                `game.opening`), or None to compute every move. Defaults to `BOOK_DIR`.
         """
         self.strategy = strategy
-        self.shots = []  # List of shots already made
-        self.hits = []  # List of successful hits
-        self.possible_targets = []  # Adjacent cells to explore in Target mode
-        self.probability_grid = None  # Probability grid for density
-        self.current_orientation = None  # Detected orientation ("horizontal" or "vertical")
+        self.rng = rng
+        self.samples = samples
+        self.time_budget = time_budget
+        self.endgame_limit = endgame_limit
+        self.endgame_budget = endgame_budget
+        self.book_dir = book_dir
+        self.ship_sizes = tuple(ship_sizes) if ship_sizes is not None else tuple(boat.size for boat in BoatType)
+        self.state = AIState(self.ship_sizes)  # What the AI knows about the current game
+        self.rows = None  # Grid dimensions, known from the first grid received
+        self.cols = None
+        self.large_board = False  # True above POOL_LIMIT cells: memory then scales with the shots only
+        self._all_cells = ()  # Every cell of the grid, to refill the pool on reset
+
+    def reset(self):
+        """
+        Forgets the current game, in place, so that the AI can play a new game on a grid of the same size.
+
+        The containers are emptied rather than replaced, and the pool of remaining cells is
+        refilled from the cells kept since the first game, so a reset allocates almost nothing.
+        """
+        pool = self._all_cells if self.rows is not None and not self.large_board else None
+        self.state.reset(self.ship_sizes, pool)
+
+    def snapshot(self):
+        """
+        Returns a copy of the current game state, to `restore` later.
+
+        Returns:
+            AIState: The copy.
+        """
+        return self.state.copy()
+
+    def restore(self, state):
+        """
+        Goes back to a state returned by `snapshot`. The snapshot stays usable for later restores.
+
+        Args:
+            state (AIState): The state to restore.
+        """
+        self.state = state.copy()
+        if self.rows is not None and not self.large_board and len(self.state.remaining_index) + len(self.state.shots) < len(self._all_cells):
+            self._fill_pool()  # Snapshot taken before the AI saw the grid
+
+    def fork(self, rng=None):
+        """
+        Returns an AI with the same settings and its own copy of the current game state.
+
+        Args:
+            rng (random.Random, optional): Random number generator of the fork. Defaults to
+                the generator of this AI, shared.
+
+        Returns:
+            AI: The fork.
+        """
+        clone = AI.__new__(AI)
+        clone.__dict__.update(self.__dict__)
+        clone.state = self.state.copy()
+        if rng is not None:
+            clone.rng = rng
+            if clone.state.sampler is not None:
+                clone.state.sampler.rng = rng
+        return clone
+
+    def _ensure_board(self, grid):
+        """
+        Builds the pool of remaining cells the first time the AI sees the grid.
+
+        On boards larger than `POOL_LIMIT` cells, no pool nor shot bitboard is kept: random
+        moves are drawn by rejection against the (sparse) set of shots instead.
+
+        Args:
+            grid (list): The game grid.
+        """
+        if self.rows is not None:
+            return
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.large_board = self.rows * self.cols > POOL_LIMIT
+        if self.large_board:
+            return
+        self._all_cells = tuple((row, col) for row in range(self.rows) for col in range(self.cols))
+        self._fill_pool()
+
+    def _fill_pool(self):
+        """Builds the pool of remaining cells and the shot bitboard from the shots of the state."""
+        state = self.state
+        state.remaining_cells = [cell for cell in self._all_cells if cell not in state.shots]
+        state.remaining_index = {cell: i for i, cell in enumerate(state.remaining_cells)}
+        state.shot_mask = to_bitboard(state.shots, self.cols)
+
+    def _is_open(self, cell):
+        """Returns True if the cell is inside the grid and has not been targeted yet."""
+        if self.large_board:
+            return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols and cell not in self.state.shots
+        return cell in self.state.remaining_index
+
+    def _shot_bitboard(self):
+        """Returns the bitboard of the shots already made."""
+        if self.large_board:
+            return to_bitboard(self.state.shots, self.cols)
+        return self.state.shot_mask
+
+    def _record_shot(self, cell):
+        """
+        Records a shot in O(1): adds it to the set of shots and swaps it out of the pool of remaining cells.
+
+        Args:
+            cell (tuple): The (row, col) cell targeted.
+
+        Returns:
+            tuple: The cell, for convenience.
+        """
+        state = self.state
+        if cell in state.shots:
+            return cell
+        state.shots.add(cell)
+        if self.rows is not None and not self.large_board:
+            state.shot_mask |= 1 << (cell[0] * self.cols + cell[1])
+            i = state.remaining_index.pop(cell, None)
+            if i is not None:
+                last = state.remaining_cells.pop()
+                if last != cell:
+                    state.remaining_cells[i] = last
+                    state.remaining_index[last] = i
+        return cell
 
     def choose_move(self, grid, player_boats):
         """
@@ -29,38 +326,53 @@ class AI:
 
         Returns:
             tuple: The coordinates (row, col) of the chosen move.
+
+        Raises:
+            ValueError: If the strategy is not registered.
         """
-        if self.strategy == "random":
-            return self.random_strategy(grid)
-        elif self.strategy == "targeted":
-            return self.targeted_strategy(grid)
-        elif self.strategy == "smart":
-            return self.smart_strategy(grid)
-        else:
+        self._ensure_board(grid)
+        strategy = STRATEGIES.get(self.strategy)
+        if strategy is None:
             raise ValueError(f"Unknown strategy: {self.strategy}")
+        return strategy(self, grid)
 
     def random_strategy(self, grid):
         """
         Random strategy: chooses a random cell that has not been targeted yet.
 
+        The cell is drawn directly from the pool of remaining cells, so the cost does not
+        grow as the board fills up.
+
         Args:
             grid (list): The game grid.
 
         Returns:
             tuple: The coordinates (row, col) of the chosen move.
+
+        Raises:
+            ValueError: If every cell has already been targeted.
         """
-        rows = len(grid)
-        cols = len(grid[0])
-        while True:
-            row = random.randint(0, rows - 1)
-            col = random.randint(0, cols - 1)
-            if (row, col) not in self.shots:
-                self.shots.append((row, col))  # Record the shot
-                return row, col
+        self._ensure_board(grid)
+        state = self.state
+        if self.large_board:
+            if len(state.shots) >= self.rows * self.cols:
+                raise ValueError("No cell left to target")
+            while True:
+                cell = (self.rng.randrange(self.rows), self.rng.randrange(self.cols))
+                if cell not in state.shots:
+                    return self._record_shot(cell)
+        if not state.remaining_cells:
+            raise ValueError("No cell left to target")
+        cell = state.remaining_cells[self.rng.randrange(len(state.remaining_cells))]
+        return self._record_shot(cell)
 
     def targeted_strategy(self, grid):
         """
-        Targeted strategy: continues to shoot around a hit cell to sink the ship.
+        Targeted strategy: continues to shoot around the hits to sink the ship.
+
+        The next shot is the cell of highest priority in the frontier kept by `update_last_hit`:
+        first the ends of the longest line of hits, then the neighbours of isolated hits.
+        Without unsunk hits, the strategy hunts at random.
 
         Args:
             grid (list): The game grid.
@@ -68,26 +380,14 @@ class AI:
         Returns:
             tuple: The coordinates (row, col) of the chosen move.
         """
-        if self.possible_targets:
-            target = self.possible_targets.pop(0)
-            self.shots.append(target)
-            return target
+        self._ensure_board(grid)
 
-        # If there are successful hits, explore adjacent cells
-        if self.hits:
-            for hit in self.hits:
-                row, col = hit
-                directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # North, South, West, East
-
-                for dr, dc in directions:
-                    new_row, new_col = row + dr, col + dc
-                    if 0 <= new_row < len(grid) and 0 <= new_col < len(grid[0]) and (new_row, new_col) not in self.shots:
-                        self.possible_targets.append((new_row, new_col))
-
-            if self.possible_targets:
-                target = self.possible_targets.pop(0)
-                self.shots.append(target)
-                return target
+        targets = self.state.possible_targets
+        while targets:
+            target = max(targets, key=targets.__getitem__)  # The oldest of the best, on ties
+            del targets[target]
+            if self._is_open(target):  # The frontier may predate the first grid
+                return self._record_shot(target)
 
         # If no adjacent targets are available, return to Hunt mode
         return self.random_strategy(grid)
@@ -96,84 +396,341 @@ class AI:
         """
         Smart strategy: combines Hunt/Target, parity, and probability density.
 
+        The probability grid is kept up to date shot by shot from the misses, the hits and the
+        sunk ships. Placements through unsunk hits are heavily weighted, so the densest cell
+        is next to a hit in Target mode and follows the remaining fleet in Hunt mode.
+        Ties are broken in favour of parity cells (checkerboard pattern).
+
+        While every shot has missed, the move is read from the opening book of the board size
+        and fleet when there is one, since it only depends on the cells missed.
+        Once `ENDGAME_SHIPS` ships or fewer are afloat, the AI first tries to enumerate every
+        consistent layout of the last ships (see `game.endgame`) and fires at the cell occupied
+        by most of them; when the search goes beyond its limits, it keeps using the density.
+
         Args:
             grid (list): The game grid.
 
         Returns:
             tuple: The coordinates (row, col) of the chosen move.
         """
-        # Step 1: If in Target mode, continue targeting around the last hit cell
-        if self.hits or self.possible_targets:
-            return self.targeted_strategy(grid)
+        state = self.state
+
+        # Step 0: Play the opening from the book while every shot has missed
+        if self.book_dir is not None and not state.hits and not state.sunk_ships and not self.large_board:
+            book = load_book(self.rows, self.cols, self.ship_sizes, self.book_dir)
+            move = book.lookup(state.shot_mask) if book is not None else None
+            if move is not None and move not in state.shots:
+                return self._record_shot(move)
 
-        # Step 2: Hunt mode with parity (checkerboard pattern)
-        for row in range(len(grid)):
-            for col in range(len(grid[0])):
-                if (row + col) % 2 == 0 and (row, col) not in self.shots:
-                    self.shots.append((row, col))
-                    return row, col
+        # Step 1: Solve the endgame exactly when few layouts remain
+        if self.endgame_limit and len(state.remaining_ships) <= ENDGAME_SHIPS:
+            move = self._endgame_move(grid)
+            if move is not None:
+                return self._record_shot(move)
 
-        # Step 3: Calculate probability density
-        if self.probability_grid is None:
-            self.probability_grid = self.calculate_probability(grid)
+        # Step 2: On large boards, only the area around the unsunk hits gets a density
+        if self.large_board:
+            state.probability_grid = None
+            return self._large_board_move(grid)
 
-        max_prob = 0
+        # Step 3: Refresh the probability density
+        state.probability_grid = self.calculate_probability(grid)
+
+        # Step 4: Choose the densest cell, preferring parity cells
+        shots = state.shots
+        best_key = (0, False)
         best_move = None
-        for row in range(len(grid)):
-            for col in range(len(grid[0])):
-                if (row, col) not in self.shots and self.probability_grid[row][col] > max_prob:
-                    max_prob = self.probability_grid[row][col]
+        for row, densities in enumerate(state.probability_grid):
+            for col, density in enumerate(densities):
+                key = (density, (row + col) % 2 == 0)
+                if density and key > best_key and (row, col) not in shots:
+                    best_key = key
                     best_move = (row, col)
 
         if best_move:
-            self.shots.append(best_move)
-            return best_move
+            return self._record_shot(best_move)
 
-        # Step 4: If no other strategy applies, shoot randomly
+        # Step 5: If no other strategy applies, shoot randomly
         return self.random_strategy(grid)
 
-    def calculate_probability(self, grid):
+    def _large_board_move(self, grid):
         """
-        Calculates a probability grid based on possible ship configurations.
+        Chooses the smart move on a board larger than `POOL_LIMIT` cells.
+
+        The density is only computed on a window around the oldest unsunk hit that a remaining
+        ship could still extend through an open cell, wide enough for every placement of the
+        remaining ships through it, so a move costs the same on any board size and nothing of
+        the size of the board is allocated. Without such a hit, the AI hunts at random on the
+        parity cells (checkerboard pattern).
 
         Args:
             grid (list): The game grid.
 
         Returns:
-            list: A 2D grid containing probabilities for each cell.
+            tuple: The coordinates (row, col) of the chosen move.
+        """
+        state = self.state
+        hits = set(state.hits)
+        sunk = set(state.sunk)
+        reach = max(state.remaining_ships, default=1) - 1
+        smallest = min(state.remaining_ships, default=1)
+        for row, col in state.hits:
+            if not self._extends(row, col, hits, reach, smallest):
+                continue
+            top, left = max(0, row - reach), max(0, col - reach)
+            bottom, right = min(self.rows, row + reach + 1), min(self.cols, col + reach + 1)
+            rows, cols = bottom - top, right - left
+
+            hit_mask = sunk_mask = miss_mask = 0
+            for r in range(top, bottom):
+                for c in range(left, right):
+                    if (r, c) in state.shots:
+                        bit = 1 << ((r - top) * cols + c - left)
+                        if (r, c) in hits:
+                            hit_mask |= bit
+                        elif (r, c) in sunk:
+                            sunk_mask |= bit
+                        else:
+                            miss_mask |= bit
+
+            density = probability_density(rows, cols, miss_mask, hit_mask, sunk_mask, state.remaining_ships)
+            best_key = (0, False)
+            best_move = None
+            for i, value in enumerate(density):
+                if value:
+                    r, c = divmod(i, cols)
+                    key = (value, (r + top + c + left) % 2 == 0)
+                    if key > best_key:
+                        best_key = key
+                        best_move = (r + top, c + left)
+            if best_move:
+                return self._record_shot(best_move)
+
+        # Hunt: a ship of 2 cells or more always covers a parity cell
+        for _ in range(PARITY_ATTEMPTS):
+            row = self.rng.randrange(self.rows)
+            count = (self.cols - row % 2 + 1) // 2
+            if count:
+                cell = (row, 2 * self.rng.randrange(count) + row % 2)
+                if cell not in state.shots:
+                    return self._record_shot(cell)
+        return self.random_strategy(grid)
+
+    def _extends(self, row, col, hits, reach, smallest):
+        """
+        Returns True if a ship of at least `smallest` cells may lie through the hit and an open cell.
+
+        Only the cells within `reach` of the hit along its row and its column are looked at.
+
+        Args:
+            row (int): Row of the hit.
+            col (int): Column of the hit.
+            hits (set): The unsunk hits.
+            reach (int): Number of cells looked at on each side of the hit.
+            smallest (int): Size of the smallest ship still afloat.
+
+        Returns:
+            bool: Whether the hit may still lead to an unsunk ship.
         """
+        shots = self.state.shots
+        for dr, dc in ((0, 1), (1, 0)):
+            length = 1
+            has_open = False
+            for sign in (-1, 1):
+                r, c = row, col
+                for _ in range(reach):
+                    r, c = r + sign * dr, c + sign * dc
+                    if not (0 <= r < self.rows and 0 <= c < self.cols):
+                        break
+                    if (r, c) in shots:
+                        if (r, c) not in hits:
+                            break
+                    else:
+                        has_open = True
+                    length += 1
+            if has_open and length >= smallest:
+                return True
+        return False
+
+    def _endgame_move(self, grid):
+        """Returns the best cell found by the exact endgame search, or None beyond its limits."""
+        state = self.state
         rows = len(grid)
         cols = len(grid[0])
-        probability_grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        if rows * cols > POOL_LIMIT or not state.remaining_ships:
+            return None
+        hits = to_bitboard(state.hits, cols)
+        shot_mask = self._shot_bitboard() if self.cols == cols else to_bitboard(state.shots, cols)
+        result = endgame_move(rows, cols, state.remaining_ships, shot_mask & ~hits, hits, shot_mask,
+                              self.endgame_limit, self.endgame_budget)
+        return result[0] if result is not None else None
+
+    def montecarlo_strategy(self, grid):
+        """
+        Monte Carlo strategy: fires at the cell most often occupied across sampled fleet layouts.
+
+        The sampler keeps its layouts between moves and only drops those contradicted by the
+        latest observations, then tops the pool up within `samples` and `time_budget`.
 
-        # Iterate through all cells and calculate probabilities
-        for row in range(rows):
-            for col in range(cols):
-                if (row, col) not in self.shots:
-                    # Check horizontal configurations
-                    for length in [5, 4, 3, 2]:  # Sizes of remaining ships
-                        if col + length <= cols and all((row, c) not in self.shots for c in range(col, col + length)):
-                            for c in range(col, col + length):
-                                probability_grid[row][c] += 1
+        Args:
+            grid (list): The game grid.
+
+        Returns:
+            tuple: The coordinates (row, col) of the chosen move.
+        """
+        self._ensure_board(grid)
+        state = self.state
+        if state.sampler is None:
+            state.sampler = FleetSampler(self.rows, self.cols, self.samples, self.time_budget, self.rng)
+
+        hits = to_bitboard(state.hits, self.cols)
+        sunk = to_bitboard(state.sunk, self.cols)
+        shot_mask = self._shot_bitboard()
+        misses = shot_mask & ~(hits | sunk)
+        sunk_ships = [(len(cells), to_bitboard(cells, self.cols)) for cells in state.sunk_ships]
+        state.sampler.update(misses, hits, sunk_ships)
+        state.sampler.refill(misses | sunk, hits, state.remaining_ships)
+
+        counts = state.sampler.occupancy(shot_mask)
+        best = max(range(len(counts)), key=counts.__getitem__)
+        if counts[best] == 0:
+            # No consistent layout found in the budget: fall back to the density
+            return self.smart_strategy(grid)
+        return self._record_shot(divmod(best, self.cols))
 
-                    # Check vertical configurations
-                    for length in [5, 4, 3, 2]:
-                        if row + length <= rows and all((r, col) not in self.shots for r in range(row, row + length)):
-                            for r in range(row, row + length):
-                                probability_grid[r][col] += 1
+    def calculate_probability(self, grid):
+        """
+        Calculates a probability grid based on possible ship configurations.
+
+        Every legal placement of each remaining ship (avoiding misses and sunk ships) adds
+        its weight to the cells it covers; placements through unsunk hits weigh more.
+        See `game.density.probability_density`.
+
+        On the grid of the game, the density is read from the `DensityTracker` of the state,
+        built on the first call and then updated by `update_last_hit`, so a move only pays for
+        the placements through the last cell shot.
 
-        return probability_grid
+        Args:
+            grid (list): The game grid.
+
+        Returns:
+            list: A 2D grid containing probabilities for each cell.
+        """
+        state = self.state
+        rows = len(grid)
+        cols = len(grid[0])
+        if state.density is not None and (rows, cols) == (self.rows, self.cols):
+            return state.density.grid()
+        hits = to_bitboard(state.hits, cols)
+        sunk = to_bitboard(state.sunk, cols)
+        shot_mask = self._shot_bitboard() if self.cols == cols else to_bitboard(state.shots, cols)
+        misses = shot_mask & ~(hits | sunk)
+        if (rows, cols) == (self.rows, self.cols) and not self.large_board:
+            state.density = DensityTracker.from_board(rows, cols, misses, hits, sunk, state.remaining_ships)
+            return state.density.grid()
+        density = probability_density(rows, cols, misses, hits, sunk, state.remaining_ships)
+        return [density[row * cols:(row + 1) * cols] for row in range(rows)]
 
-    def update_last_hit(self, row, col, hit):
+    def update_last_hit(self, row, col, hit, sunk=None):
         """
-        Updates the lists of shots and successful hits.
+        Updates the shots and successful hits, and queues the neighbours of a hit for Target mode.
 
         Args:
             row (int): Row of the cell.
             col (int): Column of the cell.
             hit (bool): Indicates if the cell contains a ship.
+            sunk (list, optional): Cells of the ship sunk by this shot, if any. Its cells leave
+                the list of hits and its size leaves the remaining fleet.
         """
+        state = self.state
+        self._record_shot((row, col))
+        state.possible_targets.pop((row, col), None)
         if hit:
-            self.hits.append((row, col))
-        else:
-            self.current_orientation = None
\ No newline at end of file
+            state.hits.append((row, col))
+
+        if sunk:
+            state.sunk.extend(sunk)
+            state.sunk_ships.append(list(sunk))
+            state.hits[:] = [cell for cell in state.hits if cell not in sunk]
+            if len(sunk) in state.remaining_ships:
+                state.remaining_ships.remove(len(sunk))
+            self._update_targets()
+        elif hit:
+            self._target_around((row, col))
+
+        if state.density is not None:
+            if sunk:
+                state.density.sink(sunk)
+            elif hit:
+                state.density.hit((row, col))
+            else:
+                state.density.miss((row, col))
+
+    def _open(self, cell):
+        """Returns True if the cell may still be targeted, even before the AI has seen the grid."""
+        if self.rows is None:
+            return cell[0] >= 0 and cell[1] >= 0 and cell not in self.state.shots
+        return self._is_open(cell)
+
+    def _update_targets(self):
+        """Rebuilds the Target mode frontier from the unsunk hits, after a ship was sunk."""
+        state = self.state
+        state.possible_targets.clear()
+        state.current_orientation = None
+        for cell in state.hits:
+            self._target_around(cell)
+
+    def _target_around(self, cell):
+        """
+        Adds to the Target mode frontier the cells that extend the lines of hits through a hit.
+
+        Along each axis, the hit belongs to a line of adjacent hits:
+        - the open cell past each end of a line of 2 hits or more gets the length of the line
+          as priority, so the longest line is extended first, in both directions;
+        - an isolated hit gives priority 1 to its open neighbours, or 0 across a line it belongs
+          to (a neighbouring ship is only looked for once the line is exhausted).
+
+        An axis is dropped when the line cannot extend far enough, between misses, sunk ships
+        and the edges, to hold the smallest ship still afloat. A cell keeps its best priority.
+        Only the lines through the new hit change, so a hit costs O(length of its lines);
+        a miss just leaves the frontier, and a sunk ship rebuilds it (`_update_targets`).
+
+        Args:
+            cell (tuple): The (row, col) hit.
+        """
+        state = self.state
+        hits = state.hits
+        frontier = state.possible_targets
+        smallest = min(state.remaining_ships, default=1)
+        is_open = state.remaining_index.__contains__ if self.rows is not None and not self.large_board else self._open
+        row, col = cell
+        lines = []
+        for axis, dr, dc in (("horizontal", 0, 1), ("vertical", 1, 0)):
+            before = (row - dr, col - dc)
+            while before in hits:
+                before = (before[0] - dr, before[1] - dc)
+            after = (row + dr, col + dc)
+            while after in hits:
+                after = (after[0] + dr, after[1] + dc)
+            length = after[0] - before[0] + after[1] - before[1] - 1
+            if length >= smallest or length + _room(is_open, before, -dr, -dc, smallest) + _room(is_open, after, dr, dc, smallest) >= smallest:
+                lines.append((axis, length, before, after))
+            elif length > 1:
+                lines.append((axis, length, None, None))  # A line, but no room to extend it
+
+        in_line = any(length > 1 for _, length, _, _ in lines)
+        for axis, length, before, after in lines:
+            if length > 1:
+                priority = length
+                state.current_orientation = axis
+            else:
+                priority = 0 if in_line else 1
+            for end in (before, after):
+                if end is not None and is_open(end) and frontier.get(end, -1) < priority:
+                    frontier[end] = priority
+
+
+register_strategy("random", AI.random_strategy)
+register_strategy("targeted", AI.targeted_strategy)
+register_strategy("smart", AI.smart_strategy)
+register_strategy("montecarlo", AI.montecarlo_strategy)
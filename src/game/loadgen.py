@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import random
+import time
+
+from game.evaluation import percentile
+from game.ia import AI
+from game.placement import mask_to_positions, random_fleet
+from game.protocol import (ERROR, FIRE, JOIN, JOINED, MODE_AI, MODE_HUMAN, OVER, PLACE, RESULT, START, FrameReader,
+                           decode, encode)
+from game.replay import decode_ship, encode_ship
+from game.server import DEFAULT_PORT, GameServer
+
+
+async def play_match(reader, writer, mode=MODE_AI, strategy="targeted", rng=None, latencies=None):
+    """
+    Plays one match as a client of a `GameServer`, with an `AI` choosing the placements and the shots.
+
+    Args:
+        reader (asyncio.StreamReader): Stream from the server.
+        writer (asyncio.StreamWriter): Stream to the server.
+        mode (int, optional): `MODE_AI` or `MODE_HUMAN`. Defaults to `MODE_AI`.
+        strategy (str, optional): Strategy of the client's AI. Defaults to "targeted".
+        rng (random.Random, optional): Random stream of the AI and of its fleet.
+        latencies (list, optional): Receives the time between each shot and its result, in seconds.
+
+    Returns:
+        dict: The side of the client ("side"), the winner ("winner"), the number of shots it
+            fired ("shots") and the error codes received ("errors").
+
+    Raises:
+        ConnectionError: If the server closes the connection before the end of the match.
+    """
+    rng = rng or random.Random()
+    frames = FrameReader()
+    writer.write(encode(JOIN, mode))
+    ai = grid = side = cols = None
+    shots = 0
+    errors = []
+    sent = 0.0
+    while True:
+        data = await reader.read(1 << 16)
+        if not data:
+            raise ConnectionError("The server closed the connection")
+        my_turn = False
+        for kind, body in frames.feed(data):
+            fields = decode(kind, body)
+            if kind == JOINED:
+                _, side, rows, cols, sizes = fields
+                ai = AI(strategy=strategy, ship_sizes=list(sizes), rng=rng)
+                grid = [[None] * cols for _ in range(rows)]
+                placements = [encode_ship(mask_to_positions(mask, cols), cols) for mask in random_fleet(rows, cols, list(sizes), rng)]
+                writer.write(b"".join(encode(PLACE, ship, horizontal, start)
+                                      for ship, (_, horizontal, start) in enumerate(placements)))
+            elif kind == START:
+                my_turn = fields[0] == side
+            elif kind == RESULT:
+                shooter, cell, outcome, size, horizontal, start, _ = fields
+                if shooter == side:
+                    if latencies is not None:
+                        latencies.append(time.perf_counter() - sent)
+                    row, col = divmod(cell, cols)
+                    ai.update_last_hit(row, col, outcome != 0, decode_ship(size, horizontal, start, cols) if outcome == 2 else None)
+                my_turn = shooter != side
+            elif kind == OVER:
+                return {"side": side, "winner": fields[0], "shots": shots, "errors": errors}
+            elif kind == ERROR:
+                errors.append(fields[0])
+        if my_turn:
+            row, col = ai.choose_move(grid, {})
+            shots += 1
+            sent = time.perf_counter()
+            writer.write(encode(FIRE, row * cols + col))
+
+
+async def run_load(matches, mode=MODE_AI, strategy="targeted", concurrency=None, host=None, port=DEFAULT_PORT,
+                   server=None, seed=0):
+    """
+    Plays many concurrent matches against a server and measures its throughput.
+
+    Without `host`, the matches are played against `server` (by default a new `GameServer`
+    in this process, whose AIs use `strategy`) through in-memory connections: the server can
+    then be benchmarked without network nor file descriptors.
+
+    Args:
+        matches (int): Number of matches.
+        mode (int, optional): `MODE_AI` (one client per match) or `MODE_HUMAN` (two clients). Defaults to `MODE_AI`.
+        strategy (str, optional): Strategy of the clients' AIs. Defaults to "targeted".
+        concurrency (int, optional): Matches played at the same time. Defaults to all of them.
+        host (str, optional): Host of a TCP server. Defaults to None, for an in-process server.
+        port (int, optional): Port of the TCP server. Defaults to `DEFAULT_PORT`.
+        server (GameServer, optional): In-process server. Defaults to a new `GameServer`.
+        seed (int, optional): Seed of the clients' random streams. Defaults to 0.
+
+    Returns:
+        dict: The number of matches ("matches"), shots ("shots") and errors ("errors"), the
+            duration ("seconds"), the throughput ("matches_per_second", "shots_per_second")
+            and the 50th and 99th percentiles of the shot latency ("p50", "p99"), in seconds.
+    """
+    if host is None and server is None:
+        server = GameServer(ai_strategy=strategy, seed=seed)
+    clients = matches * (2 if mode == MODE_HUMAN else 1)
+    limit = asyncio.Semaphore(concurrency * (2 if mode == MODE_HUMAN else 1) if concurrency else clients)
+    latencies = []
+
+    async def client(i):
+        async with limit:
+            if host is None:
+                reader, writer = await server.connect()
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+            try:
+                return await play_match(reader, writer, mode, strategy, random.Random(f"{seed}:{i}"), latencies)
+            finally:
+                writer.close()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(i) for i in range(clients)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    shots = sum(result["shots"] for result in results)
+    return {
+        "matches": matches,
+        "shots": shots,
+        "errors": sum(len(result["errors"]) for result in results),
+        "seconds": seconds,
+        "matches_per_second": matches / seconds,
+        "shots_per_second": shots / seconds,
+        "p50": percentile(latencies, 50) if latencies else None,
+        "p99": percentile(latencies, 99) if latencies else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays many concurrent matches against a game server.")
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--mode", choices=("ai", "human"), default="ai")
+    parser.add_argument("--strategy", default="targeted", help="Strategy of the clients (and of the in-process server's AIs)")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--host", default=None, help="TCP server to load (default: an in-process server)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load(args.matches, MODE_AI if args.mode == "ai" else MODE_HUMAN, args.strategy,
+                                 args.concurrency, args.host, args.port, seed=args.seed))
+    print(f"{stats['matches']} matches, {stats['shots']} shots in {stats['seconds']:.2f} s: "
+          f"{stats['matches_per_second']:.0f} matches/s, {stats['shots_per_second']:.0f} shots/s, "
+          f"latency p50 {stats['p50'] * 1e3:.2f} ms, p99 {stats['p99'] * 1e3:.2f} ms, {stats['errors']} errors")
@@ -0,0 +1,109 @@
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger("battleship")
+if not logger.handlers:
+    logger.addHandler(logging.NullHandler())  # Silent until `enable_logging` is called
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+
+
+def log_event(level, event, message, **fields):
+    """
+    Logs a structured game event.
+
+    Hot paths check `logger.isEnabledFor(level)` before building the message and the fields,
+    so that a disabled logger costs a single cached level check::
+
+        if logger.isEnabledFor(INFO):
+            log_event(INFO, "shot", f"Player missed at ({row}, {col}).", shooter="player", row=row, col=col, outcome="miss")
+
+    Args:
+        level (int): Logging level (`DEBUG`, `INFO`, `WARNING`...).
+        event (str): Name of the event, e.g. "shot" or "placement".
+        message (str): Human-readable message.
+        **fields: Data of the event, emitted as JSON keys by `JsonLinesFormatter`.
+    """
+    logger.log(level, message, extra={"event": event, "fields": fields})
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object: time, level, event, message and the event's fields."""
+
+    def format(self, record):
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class EventLog:
+    """
+    Output installed by `enable_logging`. Closing it flushes the pending events and silences the logger again.
+
+    Attributes:
+        handler (logging.Handler): The handler writing the events.
+        listener (QueueListener): The background thread feeding `handler`, or None if synchronous.
+    """
+
+    def __init__(self, installed, handler, listener):
+        self._installed = installed
+        self.handler = handler
+        self.listener = listener
+
+    def close(self):
+        """Writes the pending events, removes the output and restores the silent logger."""
+        logger.removeHandler(self._installed)
+        if self.listener is not None:
+            self.listener.stop()  # Waits for the queued events to be written
+        self.handler.close()
+        if all(isinstance(h, logging.NullHandler) for h in logger.handlers):  # No other output left
+            logger.setLevel(logging.NOTSET)
+            logger.propagate = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def enable_logging(level=INFO, stream=None, path=None, json_lines=False, asynchronous=False):
+    """
+    Sends the game events of `level` and above to a stream or a file.
+
+    Args:
+        level (int, optional): Minimum level of the events written. Defaults to `INFO`.
+        stream (file, optional): Stream to write to. Defaults to the standard output.
+        path (str, optional): File to append to, instead of a stream. Defaults to None.
+        json_lines (bool, optional): Write one JSON object per event instead of the message. Defaults to False.
+        asynchronous (bool, optional): Queue the events and write them from a background thread,
+            so that the game never waits for the I/O. Defaults to False.
+
+    Returns:
+        EventLog: The installed output, to close when done.
+    """
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter("%(message)s"))
+
+    listener = None
+    installed = handler
+    if asynchronous:
+        events = queue.SimpleQueue()
+        listener = QueueListener(events, handler)
+        listener.start()
+        installed = QueueHandler(events)
+
+    logger.addHandler(installed)
+    logger.setLevel(level)
+    logger.propagate = False  # Do not write the events twice through the root logger
+    return EventLog(installed, handler, listener)
@@ -1,5 +1,8 @@
 import pygame
 from game.rules import Rules  # Import directly from rules.py
+from game.text_cache import render_text
+from game.assets import sound_path
+from game.log import WARNING, log_event
 
 class Menu:
     """
@@ -33,17 +36,10 @@ class Menu:
         self.rules = Rules(screen_width, screen_height)  # Instance of the Rules class
         self.update_buttons()  # Initialize buttons
         
-        self.menu_music = "src/assets/sounds/music_menu.mp3"
-        pygame.mixer.music.load(self.menu_music)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1)  
-        
-        self.ingame_music = "src/assets/sounds/music_ingame.mp3"
-        pygame.mixer.music.load(self.ingame_music)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1)
-        
-        # Play menu music by default
+        self.menu_music = sound_path("music_menu.mp3")
+        self.ingame_music = sound_path("music_ingame.mp3")
+
+        # Play menu music by default (the music is streamed, so only its first chunk is decoded here)
         self.play_music(self.menu_music)
 
     def play_music(self, music_path):
@@ -58,10 +54,15 @@ class Menu:
 
         Note:
             Ensure that the `pygame.mixer` module is initialized before calling
-            this method, and the provided music file path is valid and accessible.
+            this method. If the music file cannot be loaded, a warning is logged
+            and the game continues without music.
         """
         pygame.mixer.music.stop()  # Stop any currently playing music
-        pygame.mixer.music.load(music_path)  # Load the new music file
+        try:
+            pygame.mixer.music.load(music_path)  # Load the new music file
+        except pygame.error as e:
+            log_event(WARNING, "asset_error", f"Could not load the music {music_path}: {e}", path=music_path)
+            return
         pygame.mixer.music.set_volume(0.5)  # Set the volume (0.0 to 1.0)
         pygame.mixer.music.play(-1)  # Play the music in an infinite loop
 
@@ -126,18 +127,18 @@ class Menu:
         """
         """Draws the main menu."""
         screen.fill((30, 30, 30))  # Dark gray background
-        title = self.font.render("Battle Ship", True, (255, 255, 255))
+        title = render_text(self.font, "Battle Ship", True, (255, 255, 255))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, int(self.screen_height * 0.1)))
 
         for button in self.buttons:
             pygame.draw.rect(screen, (0, 128, 255), button["rect"])  # Button background
             pygame.draw.rect(screen, (255, 255, 255), button["rect"], 2)  # Border
-            label = self.font.render(button["label"], True, (255, 255, 255))
+            label = render_text(self.font, button["label"], True, (255, 255, 255))
             screen.blit(label, (button["rect"].x + button["rect"].width // 2 - label.get_width() // 2,
                                 button["rect"].y + button["rect"].height // 2 - label.get_height() // 2))
 
         # Display the version in the bottom right corner
-        version_text = self.small_font.render("Version 1.0.0", True, (200, 200, 200))
+        version_text = render_text(self.small_font, "Version 1.0.0", True, (200, 200, 200))
         screen.blit(version_text, (self.screen_width - version_text.get_width() - 10, self.screen_height - version_text.get_height() - 10))
 
     def handle_event(self, event):
@@ -0,0 +1,174 @@
+import random
+import time
+
+from game.density import counter_add, counter_unpack
+from game.placement import placement_index
+
+
+class FleetSampler:
+    """
+    Samples fleet layouts consistent with the observed misses, hits and sunk ships.
+
+    A layout is a list of (size, mask) pairs, one per ship still afloat, and the bitboard of
+    the cells they occupy. Layouts are kept between moves: each new observation only removes
+    the layouts it contradicts, and the pool is then topped up within a sample and time budget.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        samples (int): Number of layouts to keep in the pool.
+        time_budget (float): Maximum time, in seconds, spent sampling per move.
+        layouts (list): The pool of (occupancy, ships) layouts.
+    """
+
+    def __init__(self, rows, cols, samples=200, time_budget=0.003, rng=random):
+        """
+        Initializes an empty sampler.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            samples (int, optional): Number of layouts to keep in the pool. Defaults to 200.
+            time_budget (float, optional): Sampling time budget per move, in seconds. Defaults to 0.003.
+            rng (random.Random, optional): Random number generator. Defaults to the random module.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.samples = samples
+        self.time_budget = time_budget
+        self.rng = rng
+        self.layouts = []
+        self.sunk_seen = 0  # Number of sunk ships already applied to the pool
+
+    def reset(self):
+        """Empties the pool of layouts, in place, for a new game."""
+        self.layouts.clear()
+        self.sunk_seen = 0
+
+    def copy(self):
+        """
+        Returns a sampler with its own pool, holding the same layouts.
+
+        Layouts are never modified in place, so only the list of the pool is copied.
+        """
+        clone = FleetSampler.__new__(FleetSampler)
+        clone.__dict__.update(self.__dict__)
+        clone.layouts = list(self.layouts)
+        return clone
+
+    def update(self, misses, hits, sunk_ships):
+        """
+        Removes the layouts contradicted by the observations.
+
+        Args:
+            misses (int): Bitboard of the missed shots.
+            hits (int): Bitboard of the hits on ships that are not sunk yet.
+            sunk_ships (list): (size, mask) of every sunk ship, in the order they were sunk.
+        """
+        for size, mask in sunk_ships[self.sunk_seen:]:
+            kept = []
+            for occupancy, ships in self.layouts:
+                if (size, mask) in ships:
+                    ships = [ship for ship in ships if ship != (size, mask)]
+                    kept.append((occupancy & ~mask, ships))
+            self.layouts = kept
+        self.sunk_seen = len(sunk_ships)
+
+        self.layouts = [
+            layout for layout in self.layouts
+            if not layout[0] & misses and layout[0] & hits == hits
+        ]
+
+    def sample(self, blocked, hits, ship_sizes):
+        """
+        Draws one layout of the remaining ships.
+
+        Ships are placed one at a time and every placement is checked against the blocked cells
+        and the ships already placed. Uncovered hits are handled first by choosing a placement
+        through one of them, so late-game samples rarely need to be rejected.
+
+        Args:
+            blocked (int): Bitboard of the cells no ship can occupy (misses and sunk ships).
+            hits (int): Bitboard of the hits on ships that are not sunk yet.
+            ship_sizes (list): Sizes of the ships still afloat.
+
+        Returns:
+            tuple: The (occupancy, ships) layout, or None if the attempt failed.
+        """
+        rng = self.rng
+        occupied = blocked
+        uncovered = hits
+        unplaced = list(ship_sizes)
+        ships = []
+
+        # Cover the hits first
+        while uncovered:
+            if not unplaced:
+                return None
+            low = uncovered & -uncovered
+            cell = low.bit_length() - 1
+            candidates = [
+                (i, mask)
+                for i, size in enumerate(unplaced)
+                for mask in placement_index(self.rows, self.cols, size).through[cell]
+                if not mask & occupied
+            ]
+            if not candidates:
+                return None
+            i, mask = candidates[rng.randrange(len(candidates))]
+            ships.append((unplaced.pop(i), mask))
+            occupied |= mask
+            uncovered &= ~mask
+
+        # Place the other ships anywhere they fit
+        for size in unplaced:
+            masks = placement_index(self.rows, self.cols, size).masks
+            for _ in range(20):
+                mask = masks[rng.randrange(len(masks))]
+                if not mask & occupied:
+                    break
+            else:
+                masks = [mask for mask in masks if not mask & occupied]
+                if not masks:
+                    return None
+                mask = masks[rng.randrange(len(masks))]
+            ships.append((size, mask))
+            occupied |= mask
+
+        return occupied & ~blocked, ships
+
+    def refill(self, blocked, hits, ship_sizes):
+        """
+        Tops up the pool of layouts until it holds `samples` layouts or the time budget is spent.
+
+        Args:
+            blocked (int): Bitboard of the cells no ship can occupy (misses and sunk ships).
+            hits (int): Bitboard of the hits on ships that are not sunk yet.
+            ship_sizes (list): Sizes of the ships still afloat.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        attempts = 0
+        while len(self.layouts) < self.samples:
+            layout = self.sample(blocked, hits, ship_sizes)
+            if layout is not None:
+                self.layouts.append(layout)
+            attempts += 1
+            if attempts % 8 == 0 and time.perf_counter() > deadline:
+                break
+
+    def occupancy(self, shots):
+        """
+        Counts, for every cell not shot yet, the number of layouts in the pool occupying it.
+
+        Args:
+            shots (int): Bitboard of the cells already targeted.
+
+        Returns:
+            list: Flat list of `rows * cols` counts.
+        """
+        planes = []
+        for occupancy, _ in self.layouts:
+            counter_add(planes, occupancy)
+        counts = [0] * (self.rows * self.cols)
+        counter_unpack(planes, ((1 << (self.rows * self.cols)) - 1) & ~shots, 1, counts)
+        return counts
@@ -0,0 +1,242 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+from game.log import WARNING, log_event
+from utils.boat_type import BoatType
+
+MAGIC = b"BSOB"
+VERSION = 1
+BOOK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "books")
+DEFAULT_DEPTH = 40  # Number of consecutive misses covered by a book
+
+_HEADER = struct.Struct("<4sBBHHI")  # magic, version, number of ships, rows, cols, number of entries
+_SIZE = struct.Struct("<B")
+_ENTRY = struct.Struct("<QI")  # key of the miss history, cell of the next shot
+
+_books = {}  # Path -> OpeningBook (or None if missing or invalid), mapped once per process
+
+
+def history_key(misses, cells):
+    """
+    Returns the 64-bit key of a miss history.
+
+    The key only depends on the set of cells missed, not on their order, so the same position
+    reached through different move orders shares its entry.
+
+    Args:
+        misses (int): Bitboard of the cells missed.
+        cells (int): Number of cells in the grid.
+
+    Returns:
+        int: The key.
+    """
+    digest = hashlib.blake2b(misses.to_bytes((cells + 7) // 8, "little"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def book_path(rows, cols, sizes, directory=BOOK_DIR):
+    """
+    Returns the file of the opening book of a board size and a fleet.
+
+    The name carries the board size, the fleet and the format version, so books of different
+    configurations live side by side and a new format never reads an old file.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships of the fleet.
+        directory (str, optional): Directory of the books. Defaults to `BOOK_DIR`.
+
+    Returns:
+        str: The path of the book.
+    """
+    fleet = "-".join(str(size) for size in sorted(sizes, reverse=True))
+    return os.path.join(directory, f"{rows}x{cols}_{fleet}.v{VERSION}.book")
+
+
+class OpeningBook:
+    """
+    A read-only opening book, memory-mapped from its file.
+
+    The file holds a header (see `write_book`) followed by (key, cell) entries sorted by key,
+    so a lookup is a binary search in the mapping: nothing is read into memory at load time
+    and every process playing with the same book shares its pages.
+
+    Attributes:
+        path (str): The file of the book.
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (tuple): Sizes of the ships, largest first.
+    """
+
+    def __init__(self, path):
+        """
+        Maps an opening book.
+
+        Args:
+            path (str): The file of the book.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a book of a supported version, or is truncated.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Empty opening book: {path}") from None
+        try:
+            magic, version, n_sizes, self.rows, self.cols, self._count = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a version {VERSION} opening book: {path}")
+            self.sizes = tuple(self._map[_HEADER.size:_HEADER.size + n_sizes])
+            self._offset = _HEADER.size + n_sizes * _SIZE.size
+            if len(self._map) < self._offset + self._count * _ENTRY.size:
+                raise ValueError(f"Truncated opening book: {path}")
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"Truncated opening book: {path}") from None
+        except ValueError:
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, misses):
+        """
+        Returns the next shot of a miss history, or None if the book does not cover it.
+
+        Args:
+            misses (int): Bitboard of the cells missed (every shot so far).
+
+        Returns:
+            tuple: The (row, col) cell, or None.
+        """
+        key = history_key(misses, self.rows * self.cols)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry, cell = _ENTRY.unpack_from(self._map, self._offset + middle * _ENTRY.size)
+            if entry == key:
+                return divmod(cell, self.cols)
+            if entry < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def close(self):
+        """Unmaps the book."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_book(rows, cols, sizes, directory=BOOK_DIR):
+    """
+    Returns the opening book of a board size and a fleet, mapped once per process.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships of the fleet.
+        directory (str, optional): Directory of the books. Defaults to `BOOK_DIR`.
+
+    Returns:
+        OpeningBook: The book, or None if there is no valid book for this configuration.
+    """
+    path = book_path(rows, cols, sizes, directory)
+    if path not in _books:
+        book = None
+        if os.path.exists(path):
+            try:
+                book = OpeningBook(path)
+            except (OSError, ValueError) as e:
+                log_event(WARNING, "book_error", f"Could not load the opening book {path}: {e}", path=path)
+            else:
+                if (book.rows, book.cols, book.sizes) != (rows, cols, tuple(sorted(sizes, reverse=True))):
+                    log_event(WARNING, "book_error", f"The opening book {path} is for another configuration", path=path)
+                    book.close()
+                    book = None
+        _books[path] = book
+    return _books[path]
+
+
+def build_book(rows, cols, sizes, depth=DEFAULT_DEPTH):
+    """
+    Computes the opening moves of the "smart" strategy, offline.
+
+    While every shot misses, the "smart" strategy only depends on the cells missed, so its
+    opening is the line of moves it plays against a sequence of misses. The line is played
+    by a live `AI` without book, so the book always agrees with the density engine.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships of the fleet.
+        depth (int, optional): Number of consecutive misses covered. Defaults to `DEFAULT_DEPTH`.
+
+    Returns:
+        dict: The cell index of the next shot, for the key of each miss history.
+    """
+    from game.ia import AI
+
+    ai = AI(strategy="smart", ship_sizes=sizes, book_dir=None)
+    grid = [[None] * cols for _ in range(rows)]
+    entries = {}
+    misses = 0
+    for _ in range(min(depth, rows * cols)):
+        row, col = ai.choose_move(grid, {})
+        entries[history_key(misses, rows * cols)] = row * cols + col
+        ai.update_last_hit(row, col, hit=False)
+        misses |= 1 << (row * cols + col)
+    return entries
+
+
+def write_book(path, rows, cols, sizes, entries):
+    """
+    Writes an opening book.
+
+    The file is written next to its destination and renamed, so a process mapping the
+    previous book never sees a partial file.
+
+    Args:
+        path (str): The file of the book.
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships of the fleet.
+        entries (dict): The cell index of the next shot, for the key of each miss history.
+    """
+    sizes = sorted(sizes, reverse=True)
+    chunks = [_HEADER.pack(MAGIC, VERSION, len(sizes), rows, cols, len(entries))]
+    chunks.extend(_SIZE.pack(size) for size in sizes)
+    chunks.extend(_ENTRY.pack(key, cell) for key, cell in sorted(entries.items()))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as f:
+        f.write(b"".join(chunks))
+    os.replace(temp_file, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates the opening book of the smart strategy.")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[boat.size for boat in BoatType])
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--directory", default=BOOK_DIR)
+    args = parser.parse_args()
+
+    path = book_path(args.rows, args.cols, args.sizes, args.directory)
+    entries = build_book(args.rows, args.cols, args.sizes, args.depth)
+    write_book(path, args.rows, args.cols, args.sizes, entries)
+    print(f"{path}: {len(entries)} positions")
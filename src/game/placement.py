@@ -0,0 +1,326 @@
+import random
+from functools import lru_cache
+
+from game.density import start_mask
+
+
+class PlacementIndex:
+    """
+    Every legal placement of a ship of a given size on an empty grid, as bitboards.
+
+    The index is computed once per (rows, cols, size) and shared by fleet generation and
+    the AI strategies. Cell (row, col) is bit `row * cols + col`.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        size (int): Length of the ship.
+        masks (tuple): The bitboard of every placement, horizontal ones first.
+        through (tuple): For each cell, the tuple of placements covering it.
+    """
+
+    def __init__(self, rows, cols, size):
+        self.rows = rows
+        self.cols = cols
+        self.size = size
+
+        masks = []
+        for horizontal, step in ((True, 1), (False, cols)):
+            pattern = sum(1 << (k * step) for k in range(size))
+            starts = start_mask(rows, cols, size, horizontal)
+            while starts:
+                low = starts & -starts
+                masks.append(pattern << (low.bit_length() - 1))
+                starts ^= low
+        self.masks = tuple(masks)
+
+        through = [[] for _ in range(rows * cols)]
+        for mask in self.masks:
+            for cell in iter_bits(mask):
+                through[cell].append(mask)
+        self.through = tuple(tuple(masks) for masks in through)
+
+    def __len__(self):
+        return len(self.masks)
+
+
+@lru_cache(maxsize=None)
+def placement_index(rows, cols, size):
+    """
+    Returns the shared `PlacementIndex` of a ship of `size` on a rows x cols grid.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        size (int): Length of the ship.
+
+    Returns:
+        PlacementIndex: The index, built on the first call.
+    """
+    return PlacementIndex(rows, cols, size)
+
+
+def iter_bits(mask):
+    """Yields the index of every set bit of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_to_positions(mask, cols):
+    """
+    Converts a bitboard to the list of (row, col) cells it contains, in row-major order.
+
+    Args:
+        mask (int): The bitboard.
+        cols (int): Number of columns in the grid.
+
+    Returns:
+        list: The (row, col) cells.
+    """
+    return [divmod(cell, cols) for cell in iter_bits(mask)]
+
+
+def random_fleet(rows, cols, sizes, rng=random, occupied=0, max_nodes=200000):
+    """
+    Draws a random non-overlapping placement for each ship.
+
+    Ships are placed largest first, each drawn directly among the indexed placements that do
+    not overlap the ships already placed, and a dead end sends the search back to the previous
+    choice. Cells that no remaining ship can cover any more are counted against the spare room
+    of the grid, which prunes most dead ends early. Once the grid is nearly full, the search
+    covers the most constrained empty cell first instead, which finds tight and exactly tiling
+    fleets quickly. The search is iterative and restarted with a new random draw, and a larger
+    budget, whenever a restart runs out of nodes.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships.
+        rng (random.Random, optional): Random number generator. Defaults to the random module.
+        occupied (int, optional): Bitboard of cells that must stay empty. Defaults to 0.
+        max_nodes (int, optional): Total number of search nodes allowed over all the restarts.
+            Defaults to 200000.
+
+    Returns:
+        list: The bitboard of each ship, in the order of `sizes`.
+
+    Raises:
+        ValueError: If the fleet cannot be placed on the grid, or if no placement was found
+            within `max_nodes` nodes.
+    """
+    sizes = list(sizes)
+    free_cells = rows * cols - occupied.bit_count()
+    if sum(sizes) > free_cells:
+        raise ValueError(f"A fleet of {sizes} covers {sum(sizes)} cells but a {rows}x{cols} grid has {free_cells} free cells")
+
+    full = (1 << (rows * cols)) - 1
+    indexes = {size: placement_index(rows, cols, size) for size in set(sizes)}
+    remaining = tuple(sorted(sizes, reverse=True))
+    budget = max(1, min(1000, max_nodes))
+    spent = 0
+    while spent < max_nodes:
+        restart_budget = min(budget, max_nodes - spent)
+        placed, nodes = _search_fleet(indexes, full, occupied, remaining, rng, restart_budget)
+        spent += nodes
+        if placed is not None:
+            break
+        if nodes < restart_budget:
+            # The whole search tree was explored: no placement exists
+            raise ValueError(f"Failed to place a fleet of {sizes} on a {rows}x{cols} grid")
+        budget *= 2
+    else:
+        raise ValueError(f"Gave up placing a fleet of {sizes} on a {rows}x{cols} grid after {max_nodes} search nodes")
+
+    by_size = {}
+    for size, mask in placed:
+        by_size.setdefault(size, []).append(mask)
+    return [by_size[size].pop() for size in sizes]
+
+
+def _search_fleet(indexes, full, occupied, remaining, rng, budget):
+    """
+    Runs one randomized depth-first search for `random_fleet`.
+
+    Args:
+        indexes (dict): The placement index of each ship size.
+        full (int): Bitboard of every cell of the grid.
+        occupied (int): Bitboard of the cells that must stay empty.
+        remaining (tuple): Sizes of the ships to place, largest first.
+        rng (random.Random): Random number generator.
+        budget (int): Number of nodes the search may expand.
+
+    Returns:
+        tuple: The list of (size, mask) placements, or None if none was found, and the number
+            of nodes expanded. Fewer nodes than `budget` with no placement means the search
+            space was exhausted.
+    """
+    placed = []
+    # Each frame is (occupied, remaining, untried moves); a move is (size, mask), size 0
+    # meaning "leave the cell of `mask` empty"
+    stack = [(occupied, remaining, None)]
+    nodes = 0
+    while stack:
+        occupied, remaining, moves = stack[-1]
+        if moves is None:
+            if not remaining:
+                return placed, nodes
+            if nodes == budget:
+                return None, nodes
+            nodes += 1
+            moves = _fleet_moves(indexes, full, occupied, remaining)
+            stack[-1] = (occupied, remaining, moves)
+        elif placed:
+            placed.pop()
+
+        if not moves:
+            stack.pop()
+            continue
+        j = rng.randrange(len(moves))
+        size, mask = moves[j]
+        moves[j] = moves[-1]
+        moves.pop()
+        if size:
+            i = remaining.index(size)
+            placed.append((size, mask))
+            stack.append((occupied | mask, remaining[:i] + remaining[i + 1:], None))
+        else:
+            placed.append((0, mask))
+            stack.append((occupied | mask, remaining, None))
+    return None, nodes
+
+
+def _fleet_moves(indexes, full, occupied, remaining):
+    """
+    Lists the moves of a `_search_fleet` node, or an empty list if the node is a dead end.
+
+    Args:
+        indexes (dict): The placement index of each ship size.
+        full (int): Bitboard of every cell of the grid.
+        occupied (int): Bitboard of the cells already taken or left empty.
+        remaining (tuple): Sizes of the ships left to place, largest first.
+
+    Returns:
+        list: The (size, mask) moves; size 0 leaves the cell of `mask` empty.
+    """
+    empty = full & ~occupied
+    slack = empty.bit_count() - sum(remaining)
+
+    # A placement of the smallest ship fits through every cell a larger ship could cover
+    coverable = 0
+    for mask in indexes[remaining[-1]].masks:
+        if not mask & occupied:
+            coverable |= mask
+    dead = empty & ~coverable
+    slack -= dead.bit_count()
+    if slack < 0:
+        return []
+    occupied |= dead
+    empty ^= dead
+
+    if slack >= remaining[0]:
+        # Plenty of room: draw the next largest ship anywhere it fits
+        size = remaining[0]
+        return [(size, mask) for mask in indexes[size].masks if not mask & occupied]
+
+    # Nearly full: every empty cell but `slack` of them must be covered, so branch on the
+    # cell with the fewest placements through it
+    best = None
+    for cell in iter_bits(empty):
+        moves = [
+            (size, mask)
+            for size in sorted(set(remaining))
+            for mask in indexes[size].through[cell]
+            if not mask & occupied
+        ]
+        if best is None or len(moves) < len(best):
+            best = moves
+            if slack:
+                best.append((0, 1 << cell))
+            if len(best) <= 1:
+                break
+    return best
+
+
+def random_fleet_positions(rows, cols, sizes, rng=random, max_attempts=1000):
+    """
+    Draws a random non-overlapping placement for each ship without building a placement index.
+
+    Meant for very large, sparsely occupied boards where indexing every placement would not
+    fit in memory: each ship is drawn uniformly among all its placements on the empty grid and
+    drawn again on overlap, which almost never happens when the fleet is small relative to
+    the board. A ship still overlapping after `max_attempts` draws is drawn uniformly among
+    its free placements instead, found by scanning the grid, so a dense fleet only fails
+    when a ship really has no room left. Memory scales with the size of the fleet.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        sizes (list): Sizes of the ships, placed in this order.
+        rng (random.Random, optional): Random number generator. Defaults to the random module.
+        max_attempts (int, optional): Number of random draws per ship before scanning the grid.
+            Defaults to 1000.
+
+    Returns:
+        list: The list of (row, col) positions of each ship, in the order of `sizes`.
+
+    Raises:
+        ValueError: If a ship does not fit on the cells left free by the previous ones.
+    """
+    occupied = set()
+    fleet = []
+    for size in sizes:
+        horizontal = rows * max(0, cols - size + 1)
+        vertical = max(0, rows - size + 1) * cols
+        if horizontal + vertical == 0:
+            raise ValueError(f"A ship of size {size} does not fit on a {rows}x{cols} grid")
+        for _ in range(max_attempts):
+            draw = rng.randrange(horizontal + vertical)
+            if draw < horizontal:
+                row, col = divmod(draw, cols - size + 1)
+                positions = [(row, col + k) for k in range(size)]
+            else:
+                row, col = divmod(draw - horizontal, cols)
+                positions = [(row + k, col) for k in range(size)]
+            if occupied.isdisjoint(positions):
+                break
+        else:
+            count = sum(1 for _ in _free_placements(rows, cols, size, occupied))
+            if not count:
+                raise ValueError(f"A ship of size {size} does not fit on the free cells of a {rows}x{cols} grid")
+            chosen = rng.randrange(count)
+            for i, (row, col, is_horizontal) in enumerate(_free_placements(rows, cols, size, occupied)):
+                if i == chosen:
+                    break
+            positions = [(row, col + k) if is_horizontal else (row + k, col) for k in range(size)]
+        occupied.update(positions)
+        fleet.append(positions)
+    return fleet
+
+
+def _free_placements(rows, cols, size, occupied):
+    """
+    Yields the (row, col, horizontal) start of every placement of a ship avoiding the occupied cells.
+
+    Each line of the grid is scanned once, keeping the length of the run of free cells, so
+    the cost is one lookup per cell whatever the size of the ship.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        size (int): Length of the ship.
+        occupied (set): The (row, col) cells already taken.
+    """
+    for row in range(rows):
+        run = 0
+        for col in range(cols):
+            run = 0 if (row, col) in occupied else run + 1
+            if run >= size:
+                yield row, col - size + 1, True
+    for col in range(cols):
+        run = 0
+        for row in range(rows):
+            run = 0 if (row, col) in occupied else run + 1
+            if run >= size:
+                yield row - size + 1, col, False
@@ -1,3 +1,7 @@
+from game.log import DEBUG, WARNING, log_event, logger
+from game.ships import Fleet
+
+
 class Player:
     """
     Représente un joueur dans le jeu de bataille navale.
@@ -5,22 +9,48 @@ class Player:
     Attributes:
         name (str): Le nom du joueur.
         is_enemy (bool): Indique si le joueur est un ennemi.
-        boats (dict): Un dictionnaire contenant les bateaux et leurs emplacements.
+        rows (int): Nombre de lignes de la grille du joueur.
+        cols (int): Nombre de colonnes de la grille du joueur.
+        boats (Fleet): Les emplacements de chaque bateau, par nom, avec le bateau de chaque case.
+            Un dictionnaire ordinaire affecté à `boats` est converti en `Fleet`.
         move_historic (list): Une liste des mouvements effectués par le joueur.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, rows=10, cols=10):
         """
         Initialise un joueur avec un nom.
 
         Args:
             name (str): Le nom du joueur.
+            rows (int, optional): Nombre de lignes de la grille. Par défaut 10.
+            cols (int, optional): Nombre de colonnes de la grille. Par défaut 10.
         """
         self.name = name
         self.is_enemy = False
-        self.boats = {}
+        self.rows = rows
+        self.cols = cols
+        self.boats = Fleet()
         self.move_historic = []
 
+    @property
+    def boats(self):
+        """Fleet: Les bateaux du joueur et leurs emplacements."""
+        return self._boats
+
+    @boats.setter
+    def boats(self, boats):
+        self._boats = boats if isinstance(boats, Fleet) else Fleet(boats)
+
+    def reset(self):
+        """
+        Vide les bateaux et l'historique des mouvements, sur place, pour une nouvelle partie.
+
+        Les objets `boats` et `move_historic` sont conservés : les références détenues
+        ailleurs (plateau, IA) restent valides.
+        """
+        self.boats.clear()
+        self.move_historic.clear()
+
     def change_name(self, name):
         """
         Change le nom du joueur.
@@ -34,31 +64,29 @@ class Player:
         """
         Définit l'emplacement d'un bateau sur la grille.
 
+        La collision avec un autre bateau est vérifiée par une seule recherche dans `Fleet.ship_at`.
+
         Args:
             boat_name (str): Le nom du bateau.
-            X (int): La position X sur la grille (entre 1 et 10).
-            Y (int): La position Y sur la grille (entre 1 et 10).
+            X (int): La ligne sur la grille (entre 0 et rows - 1).
+            Y (int): La colonne sur la grille (entre 0 et cols - 1).
 
         Raises:
             ValueError: Si les coordonnées (X, Y) sont hors limites ou déjà attribuées.
         """
-        if not (1 <= X <= 10 and 1 <= Y <= 10):
-            print(f"Error: ({X}, {Y}) must be between 1 and 10.")
+        if not (0 <= X < self.rows and 0 <= Y < self.cols):
+            log_event(WARNING, "invalid_placement", f"Error: ({X}, {Y}) must be within the {self.rows}x{self.cols} grid.", row=X, col=Y)
             return
 
-        for boat in self.boats.values():
-            if (X, Y) in boat:
-                print(f"Error: ({X}, {Y}) already attributed.")
-                return
-
-        if boat_name not in self.boats:
-            self.boats[boat_name] = []
-
-        if (X, Y) not in self.boats[boat_name]:
-            self.boats[boat_name].append((X, Y))
-            print(f"Boat '{boat_name}' added to ({X}, {Y}).")
+        owner = self.boats.ship_at.get((X, Y))
+        if owner is None:
+            self.boats.add_cell(boat_name, (X, Y))
+            if logger.isEnabledFor(DEBUG):
+                log_event(DEBUG, "placement", f"Boat '{boat_name}' added to ({X}, {Y}).", player=self.name, boat=boat_name, row=X, col=Y)
+        elif owner == boat_name:
+            log_event(WARNING, "invalid_placement", f"Error: ({X}, {Y}) already attributed to '{boat_name}'.", row=X, col=Y, boat=boat_name)
         else:
-            print(f"Error: ({X}, {Y}) already attributed to '{boat_name}'.")
+            log_event(WARNING, "invalid_placement", f"Error: ({X}, {Y}) already attributed.", row=X, col=Y)
 
     def record_move(self, X, Y, hit):
         """
@@ -70,4 +98,5 @@ class Player:
             hit (bool): Indique si le mouvement a touché un bateau.
         """
         self.move_historic.append(((X, Y), hit))
-        print(f"Move at ({X}, {Y}) recorded. Hit: {hit}")
\ No newline at end of file
+        if logger.isEnabledFor(DEBUG):
+            log_event(DEBUG, "move", f"Move at ({X}, {Y}) recorded. Hit: {hit}", player=self.name, row=X, col=Y, hit=hit)
\ No newline at end of file
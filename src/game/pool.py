@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+
+
+class ObjectPool:
+    """
+    Pool of reusable objects, such as `Board`, `Player` or `HeadlessGame` instances.
+
+    Released objects are reset and kept for the next `acquire` instead of being dropped,
+    so code playing many games back to back does not pay for the allocation (and the
+    garbage collection) of a new board, new players and new grids each time.
+
+    Attributes:
+        factory (callable): Creates a new object when the pool is empty.
+        reset (callable): Called with each released object to prepare it for its next use, or None.
+        maxsize (int): Maximum number of idle objects kept.
+        created (int): Number of objects created by `factory`.
+        reused (int): Number of objects served from the pool.
+    """
+
+    def __init__(self, factory, reset=None, maxsize=64):
+        """
+        Initializes an empty pool.
+
+        Args:
+            factory (callable): Creates a new object, called without arguments.
+            reset (callable, optional): Called with each released object to prepare it for reuse. Defaults to None.
+            maxsize (int, optional): Maximum number of idle objects kept. Defaults to 64.
+        """
+        self.factory = factory
+        self.reset = reset
+        self.maxsize = maxsize
+        self.created = 0
+        self.reused = 0
+        self._idle = []
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self):
+        """
+        Returns an idle object, or a new one if the pool is empty.
+
+        Returns:
+            object: An object ready for use.
+        """
+        if self._idle:
+            self.reused += 1
+            return self._idle.pop()
+        self.created += 1
+        return self.factory()
+
+    def release(self, obj):
+        """
+        Resets an object and gives it back to the pool. It is dropped if the pool is full.
+
+        Args:
+            obj (object): An object obtained from `acquire`, no longer used by the caller.
+        """
+        if len(self._idle) >= self.maxsize:
+            return
+        if self.reset is not None:
+            self.reset(obj)
+        self._idle.append(obj)
+
+    @contextmanager
+    def borrowed(self):
+        """Context manager acquiring an object and releasing it on exit."""
+        obj = self.acquire()
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+
+def player_pool(name="IA", rows=10, cols=10, maxsize=64):
+    """
+    Returns a pool of `Player` instances, emptied with `Player.reset` on release.
+
+    Args:
+        name (str, optional): Name given to the new players. Defaults to "IA".
+        rows (int, optional): Number of rows of the players' grids. Defaults to 10.
+        cols (int, optional): Number of columns of the players' grids. Defaults to 10.
+        maxsize (int, optional): Maximum number of idle players kept. Defaults to 64.
+
+    Returns:
+        ObjectPool: The pool.
+    """
+    from game.player import Player
+
+    return ObjectPool(lambda: Player(name, rows, cols), reset=Player.reset, maxsize=maxsize)
+
+
+def board_pool(rows=10, cols=10, cell_size=40, fleet=None, maxsize=8):
+    """
+    Returns a pool of `Board` instances, each with its own player and enemy, reset with `Board.reset_grid` on release.
+
+    Creating a board requires pygame (fonts), unlike `game.engine.HeadlessGame`, which
+    `game.engine.play_games` reuses on its own.
+
+    Args:
+        rows (int, optional): Number of rows in the grids. Defaults to 10.
+        cols (int, optional): Number of columns in the grids. Defaults to 10.
+        cell_size (int, optional): Size of each cell in pixels. Defaults to 40.
+        fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+        maxsize (int, optional): Maximum number of idle boards kept. Defaults to 8.
+
+    Returns:
+        ObjectPool: The pool.
+    """
+    from game.board import Board
+    from game.player import Player
+
+    def create():
+        return Board(rows, cols, cell_size, Player("Player", rows, cols), Player("IA", rows, cols), fleet)
+
+    return ObjectPool(create, reset=Board.reset_grid, maxsize=maxsize)
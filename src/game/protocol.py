@@ -0,0 +1,119 @@
+import struct
+
+# Client messages
+JOIN = 0x01  # mode
+PLACE = 0x02  # ship, horizontal, first cell
+FIRE = 0x03  # cell
+
+# Server messages
+JOINED = 0x81  # match, side, rows, cols, then the size of each ship
+START = 0x82  # side firing first
+RESULT = 0x83  # side firing, cell, outcome, then the size, orientation and first cell of a sunk ship
+OVER = 0x84  # winner, reason
+ERROR = 0x85  # error code
+
+MODE_AI = 0  # Play against an AI of the server
+MODE_HUMAN = 1  # Play against the next client asking for a human opponent
+
+OUTCOMES = ("miss", "hit", "sunk")  # Outcome codes of `RESULT`, as in `game.ships`
+
+OVER_WIN = 0  # Every ship of the loser is sunk
+OVER_FORFEIT = 1  # The loser left the match
+
+BAD_MESSAGE = 1  # Unknown or malformed message
+WRONG_STATE = 2  # Message not expected in the current state of the match
+BAD_PLACEMENT = 3  # Ship outside the grid, overlapping another or already placed
+NOT_YOUR_TURN = 4
+BAD_SHOT = 5  # Cell outside the grid or already targeted
+
+MAX_FRAME = 1024  # Longest frame accepted, in bytes
+
+_LENGTH = struct.Struct("<H")  # Number of bytes following: message type and fields
+_FIELDS = {
+    JOIN: struct.Struct("<B"),
+    PLACE: struct.Struct("<BBH"),
+    FIRE: struct.Struct("<H"),
+    JOINED: struct.Struct("<IBBB"),
+    START: struct.Struct("<B"),
+    RESULT: struct.Struct("<BHBBBH"),
+    OVER: struct.Struct("<BB"),
+    ERROR: struct.Struct("<B"),
+}
+_FRAMES = {kind: struct.Struct("<HB" + fields.format[1:]) for kind, fields in _FIELDS.items()}
+
+
+def encode(kind, *fields, tail=b""):
+    """
+    Encodes a message as a frame: its length on 2 bytes, its type, its fields and an optional tail.
+
+    Args:
+        kind (int): Type of the message, e.g. `FIRE`.
+        *fields: Fields of the message, in the order of its structure.
+        tail (bytes, optional): Variable-length data following the fields. Defaults to b"".
+
+    Returns:
+        bytes: The frame (little-endian). A shot result takes 11 bytes.
+    """
+    frame = _FRAMES[kind]
+    return frame.pack(frame.size - _LENGTH.size + len(tail), kind, *fields) + tail
+
+
+def decode(kind, body):
+    """
+    Decodes the fields of a message.
+
+    Args:
+        kind (int): Type of the message.
+        body (bytes): The frame without its length and type.
+
+    Returns:
+        tuple: The fields, then the tail (bytes).
+
+    Raises:
+        ValueError: If the type is unknown or the body too short.
+    """
+    fields = _FIELDS.get(kind)
+    if fields is None or len(body) < fields.size:
+        raise ValueError(f"Malformed message of type {kind:#x}")
+    return fields.unpack_from(body) + (bytes(body[fields.size:]),)
+
+
+class FrameReader:
+    """
+    Splits a byte stream into frames.
+
+    The data received is appended to a buffer and every complete frame is cut from it, so a
+    single read can carry many frames and a frame can span several reads.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Adds received data and returns the frames it completes.
+
+        Args:
+            data (bytes): Data read from the stream.
+
+        Returns:
+            list: (type, body) of each complete frame, in order.
+
+        Raises:
+            ValueError: If a frame is empty or longer than `MAX_FRAME`.
+        """
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(buffer, offset)
+            if not 0 < length <= MAX_FRAME:
+                raise ValueError(f"Invalid frame length {length}")
+            end = offset + _LENGTH.size + length
+            if end > len(buffer):
+                break
+            frames.append((buffer[offset + _LENGTH.size], bytes(buffer[offset + _LENGTH.size + 1:end])))
+            offset = end
+        del buffer[:offset]
+        return frames
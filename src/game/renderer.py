@@ -0,0 +1,160 @@
+import string
+
+import pygame
+
+from game.placement import iter_bits
+from game.text_cache import render_text
+
+
+def column_label(col):
+    """
+    Returns the spreadsheet-style label of a column: A..Z, then AA, AB, ... past 26 columns.
+
+    Args:
+        col (int): 0-based column index.
+
+    Returns:
+        str: The column label.
+    """
+    label = ""
+    col += 1
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        label = string.ascii_uppercase[remainder] + label
+    return label
+
+
+class GridRenderer:
+    """
+    Retained-mode renderer of a `Grid`.
+
+    The grid, its title and its row/column labels are drawn once on a cached `pygame.Surface`.
+    On later calls to `render`, the ship and shot bitboards are compared with the ones last
+    drawn and only the cells that changed are redrawn, so an idle frame costs two integer XORs.
+
+    Attributes:
+        grid (Grid): The grid to draw.
+        cell_size (int): Size of each cell (in pixels).
+        font (pygame.font.Font): Font used for the title and the labels.
+        show_ships (bool): If True, displays ships on the grid.
+        show_hits (bool): If True, displays the player's hits (crosses) on the grid.
+        title (str): Title displayed above the grid.
+        surface (pygame.Surface): The cached rendering, or None until the first call to `render`.
+    """
+
+    LABEL_WIDTH = 20  # Room left of the grid for the row numbers
+    HEADER_HEIGHT = 40  # Room above the grid for the title and the column letters
+    BACKGROUND = (30, 30, 30)
+
+    def __init__(self, grid, cell_size, font, show_ships=True, show_hits=True, title=""):
+        self.grid = grid
+        self.cell_size = cell_size
+        self.font = font
+        self.show_ships = show_ships
+        self.show_hits = show_hits
+        self.title = title
+        self.surface = None
+        self._ships = 0  # Bitboards as last drawn on the surface
+        self._shots = 0
+
+    @property
+    def offset(self):
+        """Position of the top-left corner of cell (0, 0) on the cached surface."""
+        return self.LABEL_WIDTH, self.HEADER_HEIGHT
+
+    def invalidate(self):
+        """Forces a full redraw on the next call to `render`."""
+        self.surface = None
+
+    def render(self):
+        """
+        Brings the cached surface up to date with the grid.
+
+        Returns:
+            list: The rectangles of the surface (in surface coordinates) that were redrawn.
+                The whole surface on the first call, an empty list if nothing changed.
+        """
+        ships = self.grid.ships
+        shots = self.grid.shots
+
+        if self.surface is None:
+            self._draw_all(ships, shots)
+            return [self.surface.get_rect()]
+
+        changed = (ships ^ self._ships) | (shots ^ self._shots)
+        self._ships = ships
+        self._shots = shots
+        cols = self.grid.cols
+        return [self._draw_cell(*divmod(cell, cols), ships, shots) for cell in iter_bits(changed)]
+
+    def _draw_all(self, ships, shots):
+        """Creates the surface and draws the title, the labels and every cell."""
+        rows, cols = self.grid.rows, self.grid.cols
+        left, top = self.offset
+        self.surface = pygame.Surface((left + cols * self.cell_size, top + rows * self.cell_size))
+        self.surface.fill(self.BACKGROUND)
+
+        # Draw the grid title
+        grid_title = render_text(self.font, self.title, True, (255, 255, 255))
+        self.surface.blit(grid_title, (max(0, left + (cols * self.cell_size) // 2 - grid_title.get_width() // 2), 0))
+
+        # Draw row numbers (on the left)
+        for row in range(rows):
+            text = render_text(self.font, str(row), True, (255, 255, 255))  # White
+            self.surface.blit(text, (0, top + row * self.cell_size + self.cell_size // 4))
+
+        # Draw column letters (on top)
+        for col in range(cols):
+            letter = column_label(col)  # Convert index to letter (A, B, ..., Z, AA, ...)
+            text = render_text(self.font, letter, True, (255, 255, 255))  # White
+            self.surface.blit(text, (left + col * self.cell_size + self.cell_size // 4, top - 20))
+
+        # Draw the cells
+        for row in range(rows):
+            for col in range(cols):
+                self._draw_cell(row, col, ships, shots)
+        self._ships = ships
+        self._shots = shots
+
+    def _draw_cell(self, row, col, ships, shots):
+        """
+        Draws one cell on the cached surface.
+
+        Visual Elements:
+            - Ships are displayed as blue cells if `show_ships` is True.
+            - Player hits are displayed as red crosses for hits and white crosses for misses if `show_hits` is True.
+            - AI hits are displayed as red circles for hits and white circles for misses.
+
+        Returns:
+            pygame.Rect: The rectangle of the cell on the surface.
+        """
+        left, top = self.offset
+        size = self.cell_size
+        x = left + col * size
+        y = top + row * size
+        rect = pygame.Rect(x, y, size, size)
+        bit = 1 << (row * self.grid.cols + col)
+        ship = ships & bit
+        shot = shots & bit
+
+        # Draw the background color
+        if self.show_ships and ship:
+            pygame.draw.rect(self.surface, (0, 128, 255), rect)  # Blue for ship
+        else:
+            pygame.draw.rect(self.surface, (173, 216, 230), rect)  # Light blue for empty
+
+        if shot:
+            color = (255, 0, 0) if ship else (255, 255, 255)  # Red for a hit, white for a miss
+            if self.grid.hit_key == "player_hit":
+                # Draw a smaller cross if the cell was hit by the player
+                if self.show_hits:
+                    offset = size // 6  # Smaller cross offset
+                    pygame.draw.line(self.surface, color, (x + offset, y + offset), (x + size - offset, y + size - offset), 2)  # Diagonal \
+                    pygame.draw.line(self.surface, color, (x + offset, y + size - offset), (x + size - offset, y + offset), 2)  # Diagonal /
+            else:
+                # Draw a larger circle if the AI hit this cell
+                pygame.draw.circle(self.surface, color, (x + size // 2, y + size // 2), size // 3, 2)
+
+        # Draw the cell border
+        pygame.draw.rect(self.surface, (0, 0, 0), rect, 1)  # Black border
+        return rect
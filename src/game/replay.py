@@ -0,0 +1,237 @@
+import argparse
+import struct
+import sys
+import time
+from array import array
+
+MAGIC = b"BSRP"
+VERSION = 1
+WIDE_CELLS = 0x01  # Flag: cells are stored on 4 bytes (boards of more than 65536 cells)
+
+_HEADER = struct.Struct("<4sBBHHQB")  # magic, version, flags, rows, cols, seed, first side
+_SHIP = struct.Struct("<BBI")  # size, horizontal, first cell
+_COUNT = struct.Struct("<I")
+
+
+def encode_ship(positions, cols):
+    """
+    Encodes the cells of a straight ship as (size, horizontal, first cell).
+
+    Args:
+        positions (list): The (row, col) cells of the ship.
+        cols (int): Number of columns in the grid.
+
+    Returns:
+        tuple: The size, True if the ship is horizontal, and the index of its first cell.
+    """
+    first = min(positions)
+    horizontal = all(row == first[0] for row, _ in positions)
+    return len(positions), horizontal, first[0] * cols + first[1]
+
+
+def decode_ship(size, horizontal, start, cols):
+    """Returns the (row, col) cells of a ship encoded by `encode_ship`."""
+    row, col = divmod(start, cols)
+    if horizontal:
+        return [(row, col + k) for k in range(size)]
+    return [(row + k, col) for k in range(size)]
+
+
+class Replay:
+    """
+    A recorded game: the board size, the seed of its random stream, both fleets and every shot.
+
+    The shots alternate between the sides, starting with `first`, and are stored as cell
+    indexes (`row * cols + col`) in an `array`: 2 bytes per shot, 4 on boards of more than
+    65536 cells. A 10x10 game of 100 shots takes about 250 bytes.
+
+    Attributes:
+        rows (int): Number of rows in each grid.
+        cols (int): Number of columns in each grid.
+        seed (int): Seed of the game's random stream.
+        first (int): Side that fired the first shot.
+        fleets (list): For each side, the list of (size, horizontal, first cell) of its ships.
+        shots (array): Cell index of every shot, in the order they were fired.
+    """
+
+    def __init__(self, rows, cols, seed=0, first=0):
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.first = first
+        self.fleets = [[], []]
+        self.shots = array("I" if rows * cols > 1 << 16 else "H")
+
+    def set_fleet(self, side, fleet):
+        """
+        Records the ships of a side.
+
+        Args:
+            side (int): Index of the side (0 or 1).
+            fleet (iterable): The list of (row, col) cells of each ship.
+        """
+        self.fleets[side] = [encode_ship(positions, self.cols) for positions in fleet]
+
+    def fleet_positions(self, side):
+        """Returns the list of (row, col) cells of each ship of a side."""
+        return [decode_ship(size, horizontal, start, self.cols) for size, horizontal, start in self.fleets[side]]
+
+    def moves(self):
+        """Yields the (side, row, col) of every shot, in order."""
+        side = self.first
+        for cell in self.shots:
+            row, col = divmod(cell, self.cols)
+            yield side, row, col
+            side = 1 - side
+
+    def to_bytes(self):
+        """
+        Serializes the replay.
+
+        Returns:
+            bytes: The binary replay (little-endian).
+        """
+        flags = WIDE_CELLS if self.shots.typecode == "I" else 0
+        chunks = [_HEADER.pack(MAGIC, VERSION, flags, self.rows, self.cols, self.seed, self.first)]
+        for fleet in self.fleets:
+            chunks.append(_COUNT.pack(len(fleet)))
+            chunks.extend(_SHIP.pack(size, horizontal, start) for size, horizontal, start in fleet)
+        shots = self.shots
+        if sys.byteorder == "big":
+            shots = array(shots.typecode, shots)
+            shots.byteswap()
+        chunks.append(_COUNT.pack(len(shots)))
+        chunks.append(shots.tobytes())
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads a replay serialized by `to_bytes`.
+
+        Args:
+            data (bytes): The binary replay.
+
+        Returns:
+            Replay: The replay.
+
+        Raises:
+            ValueError: If the data is not a replay of a supported version, or is truncated.
+        """
+        try:
+            magic, version, flags, rows, cols, seed, first = _HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a version {VERSION} replay")
+            replay = cls(rows, cols, seed, first)
+            offset = _HEADER.size
+            for side in range(2):
+                (count,) = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                ships = (_SHIP.unpack_from(data, offset + i * _SHIP.size) for i in range(count))
+                replay.fleets[side] = [(size, bool(horizontal), start) for size, horizontal, start in ships]
+                offset += count * _SHIP.size
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+        except struct.error as e:
+            raise ValueError(f"Truncated replay: {e}") from None
+
+        replay.shots = array("I" if flags & WIDE_CELLS else "H")
+        end = offset + count * replay.shots.itemsize
+        if len(data) < end:
+            raise ValueError("Truncated replay: missing shots")
+        replay.shots.frombytes(data[offset:end])
+        if sys.byteorder == "big":
+            replay.shots.byteswap()
+        return replay
+
+    def write(self, path):
+        """Writes the replay to the file `path`."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def read(cls, path):
+        """Reads the replay stored in the file `path`."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def replay_game(replay, fleet=None):
+    """
+    Re-simulates a recorded game headlessly, at full speed, by firing the recorded shots.
+
+    Args:
+        replay (Replay): The recorded game.
+        fleet (list, optional): (name, size) tuples naming the ships, in the recorded order.
+            Defaults to generic names.
+
+    Returns:
+        dict: The winning side ("winner"), the number of shots it fired ("shots") and the
+            number of ships each shot sank, as counted while re-simulating ("sunk").
+    """
+    from game.engine import HeadlessGame
+
+    if fleet is None:
+        fleet = [(f"Ship {i}", size) for i, (size, _, _) in enumerate(replay.fleets[0])]
+    game = HeadlessGame(replay.rows, replay.cols, fleet, sparse=replay.rows * replay.cols > 1 << 16)
+    for side in range(2):
+        for (name, _), positions in zip(fleet, replay.fleet_positions(side)):
+            game.grids[side].place_ship(positions)
+            game.ships[side].add(name, positions)
+            game.boats[side][name] = positions
+
+    sunk = [0, 0]
+    for side, row, col in replay.moves():
+        if game.fire(side, row, col).sunk:
+            sunk[side] += 1
+        if game.winner is not None:
+            break
+    return {"winner": game.winner, "shots": game.shots[game.winner] if game.winner is not None else None, "sunk": sunk}
+
+
+def rerun(replay, strategies=("smart", "smart"), fleet=None):
+    """
+    Plays the recorded game again with the AIs and the recorded seed, and compares the shots.
+
+    Useful to reproduce a game: strategies that only draw from the game's random stream replay
+    it identically, while time-budgeted ones ("montecarlo") may diverge.
+
+    Args:
+        replay (Replay): The recorded game.
+        strategies (tuple, optional): AI strategies of side 0 and side 1. Defaults to ("smart", "smart").
+        fleet (list, optional): (name, size) tuples of the fleet. Defaults to generic names.
+
+    Returns:
+        int: The index of the first shot that differs from the recording, or None if the game is identical.
+    """
+    from game.engine import HeadlessGame
+
+    if fleet is None:
+        fleet = [(f"Ship {i}", size) for i, (size, _, _) in enumerate(replay.fleets[0])]
+    game = HeadlessGame(replay.rows, replay.cols, fleet, strategies, record=True)
+    game.play(replay.seed)
+    replayed = game.replay.shots
+    for i, (recorded, played) in enumerate(zip(replay.shots, replayed)):
+        if recorded != played:
+            return i
+    if len(replayed) != len(replay.shots):
+        return min(len(replayed), len(replay.shots))
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-simulates recorded Battleship games without pygame.")
+    parser.add_argument("paths", nargs="+", help="Replay files")
+    parser.add_argument("--rerun", nargs=2, metavar="STRATEGY", help="Also replay the AIs from the seed and report divergences")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        replay = Replay.read(path)
+        start = time.perf_counter()
+        result = replay_game(replay)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {replay.rows}x{replay.cols}, seed {replay.seed}, {len(replay.shots)} shots, "
+              f"winner {result['winner']} in {result['shots']} shots ({elapsed * 1e6:.0f} µs)")
+        if args.rerun:
+            divergence = rerun(replay, tuple(args.rerun))
+            print("  identical replay" if divergence is None else f"  diverges at shot {divergence}")
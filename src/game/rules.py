@@ -1,5 +1,6 @@
 import pygame
 from game.button import draw_back_button  # Import the draw_back_button function
+from game.text_cache import render_text
 
 class Rules:
     """
@@ -33,7 +34,7 @@ class Rules:
     def draw(self, screen):
         """Draws the rules page."""
         screen.fill((30, 30, 30))  # Dark gray background
-        title = self.font.render("Règles du Jeu", True, (255, 255, 255))
+        title = render_text(self.font, "Règles du Jeu", True, (255, 255, 255))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, int(self.screen_height * 0.05)))
 
         # Rules text
@@ -58,7 +59,7 @@ class Rules:
 
         # Display each line of the rules
         for i, rule in enumerate(rules):
-            rule_text = self.small_font.render(rule, True, (255, 255, 255))
+            rule_text = render_text(self.small_font, rule, True, (255, 255, 255))
             screen.blit(rule_text, (int(self.screen_width * 0.05), int(self.screen_height * 0.15) + i * int(self.screen_height * 0.03)))
 
         # Draw the back button
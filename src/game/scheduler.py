@@ -0,0 +1,105 @@
+import time
+
+import pygame
+
+
+class FrameScheduler:
+    """
+    Paces the main loop and measures how much of the time it spends waiting.
+
+    Two modes are available:
+        - "capped": the loop polls the events and runs at most `fps` frames per second.
+        - "idle": same cap while something is animating; otherwise the loop sleeps in
+          `pygame.event.wait` until an event arrives or `idle_timeout` expires, so an idle
+          screen costs (almost) no CPU.
+
+    Typical use::
+
+        for event in scheduler.events():
+            ...
+        ...  # draw the frame
+        scheduler.end_frame(animating=False)
+
+    Attributes:
+        fps (int): Maximum number of frames per second (0 for no cap).
+        mode (str): "capped" or "idle".
+        idle_timeout (float): Longest wait for an event in idle mode, in seconds.
+        animating (bool): Whether the last frame asked for the next one without waiting for an event.
+        frame_time (float): Wall-clock duration of the last frame, waiting included, in seconds.
+        busy_time (float): Part of the last frame spent working rather than waiting, in seconds.
+        idle_fraction (float): Smoothed fraction of the time spent waiting, between 0 and 1.
+    """
+
+    MODES = ("capped", "idle")
+
+    def __init__(self, fps=60, mode="idle", idle_timeout=0.25, smoothing=0.1):
+        """
+        Initializes the scheduler.
+
+        Args:
+            fps (int, optional): Maximum number of frames per second, 0 for no cap. Defaults to 60.
+            mode (str, optional): "capped" or "idle". Defaults to "idle".
+            idle_timeout (float, optional): Longest wait for an event in idle mode, in seconds. Defaults to 0.25.
+            smoothing (float, optional): Weight of the last frame in `idle_fraction`. Defaults to 0.1.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+        self.fps = fps
+        self.mode = mode
+        self.idle_timeout = idle_timeout
+        self.smoothing = smoothing
+        self.clock = pygame.time.Clock()
+        self.animating = True  # Draw the first frame without waiting
+        self.frame_time = 0.0
+        self.busy_time = 0.0
+        self.idle_fraction = 0.0
+        self._frame_start = None
+        self._waited = 0.0  # Time spent waiting during the current frame
+
+    def events(self):
+        """
+        Returns the pending events, first waiting for one in idle mode when nothing is animating.
+
+        Returns:
+            list: The events to handle this frame (possibly empty after a timeout).
+        """
+        now = time.perf_counter()
+        if self._frame_start is None:
+            self._frame_start = now
+
+        events = []
+        if self.mode == "idle" and not self.animating:
+            event = pygame.event.wait(int(self.idle_timeout * 1000))
+            self._waited += time.perf_counter() - now
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events.extend(pygame.event.get())
+        return events
+
+    def end_frame(self, animating=False):
+        """
+        Ends the frame: sleeps to respect the frame cap and updates the measurements.
+
+        Args:
+            animating (bool, optional): True if the next frame must be drawn even without any event
+                (e.g. during an animation). Only used in idle mode. Defaults to False.
+        """
+        self.animating = animating
+        start = time.perf_counter()
+        if self.fps:
+            self.clock.tick(self.fps)
+        end = time.perf_counter()
+        self._waited += end - start
+
+        if self._frame_start is None:
+            self._frame_start = start
+        self.frame_time = end - self._frame_start
+        self.busy_time = max(0.0, self.frame_time - self._waited)
+        if self.frame_time > 0:
+            idle = min(1.0, self._waited / self.frame_time)
+            self.idle_fraction += self.smoothing * (idle - self.idle_fraction)
+        self._frame_start = end
+        self._waited = 0.0
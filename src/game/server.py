@@ -0,0 +1,483 @@
+import argparse
+import asyncio
+import itertools
+import random
+
+from game.ia import AI
+from game.log import DEBUG, INFO, enable_logging, log_event, logger
+from game.placement import mask_to_positions, random_fleet
+from game.protocol import (BAD_MESSAGE, BAD_PLACEMENT, BAD_SHOT, ERROR, FIRE, JOIN, JOINED, MODE_AI, MODE_HUMAN,
+                           NOT_YOUR_TURN, OVER, OVER_FORFEIT, OVER_WIN, PLACE, RESULT, START, WRONG_STATE,
+                           FrameReader, decode, encode)
+from game.replay import decode_ship, encode_ship
+from game.ships import HIT, SUNK, ShipIndex
+from utils.boat_type import DEFAULT_FLEET
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+READ_SIZE = 1 << 16  # Bytes read from a client at once
+HIGH_WATER = 1 << 16  # Bytes waiting to be sent to a client before its messages stop being read
+
+PLACING = "placing"
+PLAYING = "playing"
+FINISHED = "finished"
+
+_OUTCOMES = {HIT: 1, SUNK: 2}  # Outcome codes of `RESULT`, 0 for a miss
+
+
+class Connection:
+    """
+    A client of the server, with the messages waiting to be sent to it.
+
+    Messages are not written one by one: they are appended to a buffer, written at once
+    when the event loop has finished the current batch of work. A shot against an AI, the
+    AI's reply and the end of the match thus leave in a single write.
+
+    Attributes:
+        writer (asyncio.StreamWriter): Stream to the client.
+        match (Match): Match the client plays, or None before it joins one.
+        side (int): Side of the client in its match.
+    """
+
+    __slots__ = ("writer", "match", "side", "_buffer", "_scheduled", "_loop")
+
+    def __init__(self, writer, loop):
+        self.writer = writer
+        self.match = None
+        self.side = None
+        self._buffer = bytearray()
+        self._scheduled = False
+        self._loop = loop
+
+    def send(self, frame):
+        """Queues a frame, to be written with the other frames of the current batch."""
+        self._buffer += frame
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon(self.flush)
+
+    def flush(self):
+        """Writes the queued frames."""
+        self._scheduled = False
+        if self._buffer and not self.writer.is_closing():
+            self.writer.write(bytes(self._buffer))
+        self._buffer.clear()
+
+
+class Match:
+    """
+    The state machine of a match between two sides: placing, playing, then finished.
+
+    Each side places its fleet ship by ship; once both fleets are complete, the sides fire
+    in turn, side 0 first, until every ship of one side is sunk. Placements and shots are
+    validated like in the game: a ship is a straight line of cells inside the grid (see
+    `Board.is_continuous`) that overlaps no other ship, and a cell is targeted at most once;
+    shots are resolved by the `ShipIndex` of the fleet fired at, like in `Action.fire`.
+
+    A side without connection is played by an AI of the server, which places its fleet at
+    random and fires as soon as its turn comes.
+
+    Attributes:
+        id (int): Number of the match.
+        players (list): `Connection` of each side, None for the AI side.
+        state (str): `PLACING`, `PLAYING` or `FINISHED`.
+        turn (int): Side whose turn it is to fire.
+        winner (int): Winning side, None while the match is running.
+    """
+
+    __slots__ = ("id", "rows", "cols", "fleet", "players", "ships", "placed", "shots", "state", "turn", "winner",
+                 "ai", "_grid", "_on_finish")
+
+    def __init__(self, match_id, rows, cols, fleet, players, ai=None, grid=None, on_finish=None):
+        """
+        Creates a match.
+
+        Args:
+            match_id (int): Number of the match.
+            rows (int): Number of rows in each grid.
+            cols (int): Number of columns in each grid.
+            fleet (list): List of (name, size) tuples.
+            players (list): `Connection` of each side, None for the side played by `ai`.
+            ai (AI, optional): AI of the side without connection.
+            grid (list, optional): Grid given to the AI (only its dimensions are read).
+            on_finish (callable, optional): Called with the match when it is finished.
+        """
+        self.id = match_id
+        self.rows = rows
+        self.cols = cols
+        self.fleet = fleet
+        self.players = players
+        self.ships = [ShipIndex(), ShipIndex()]
+        self.placed = [set(), set()]
+        self.shots = [0, 0]  # Bitboard of the cells targeted by each side
+        self.state = PLACING
+        self.turn = 0
+        self.winner = None
+        self.ai = ai
+        self._grid = grid
+        self._on_finish = on_finish
+        for side, player in enumerate(players):
+            if player is None:
+                sizes = [size for _, size in fleet]
+                for ship, mask in enumerate(random_fleet(rows, cols, sizes, ai.rng)):
+                    self.ships[side].add(ship, mask_to_positions(mask, cols))
+                    self.placed[side].add(ship)
+
+    def broadcast(self, frame):
+        """Sends a frame to both players."""
+        for player in self.players:
+            if player is not None:
+                player.send(frame)
+
+    def place(self, side, ship, horizontal, start):
+        """
+        Places a ship of a side.
+
+        Args:
+            side (int): Side placing the ship.
+            ship (int): Index of the ship in the fleet.
+            horizontal (bool): Orientation of the ship.
+            start (int): Index of its first (top or left) cell.
+
+        Returns:
+            int: An error code, or None if the ship was placed.
+        """
+        if self.state != PLACING:
+            return WRONG_STATE
+        if ship >= len(self.fleet) or ship in self.placed[side]:
+            return BAD_PLACEMENT
+        size = self.fleet[ship][1]
+        row, col = divmod(start, self.cols)
+        if row >= self.rows or (col + size > self.cols if horizontal else row + size > self.rows):
+            return BAD_PLACEMENT
+        positions = decode_ship(size, horizontal, start, self.cols)
+        ships = self.ships[side]
+        if any(cell in ships.ship_at for cell in positions):
+            return BAD_PLACEMENT
+        ships.add(ship, positions)
+        self.placed[side].add(ship)
+        if all(len(placed) == len(self.fleet) for placed in self.placed):
+            self.state = PLAYING
+            self.broadcast(encode(START, self.turn))
+            self._play_ai()
+        return None
+
+    def fire(self, side, cell):
+        """
+        Fires a shot of a side, then lets the AI reply when it plays the other side.
+
+        Args:
+            side (int): Side firing.
+            cell (int): Index of the cell targeted.
+
+        Returns:
+            int: An error code, or None if the shot was fired.
+        """
+        if self.state != PLAYING:
+            return WRONG_STATE
+        if side != self.turn:
+            return NOT_YOUR_TURN
+        if cell >= self.rows * self.cols or self.shots[side] >> cell & 1:
+            return BAD_SHOT
+        self._resolve(side, cell)
+        self._play_ai()
+        return None
+
+    def _resolve(self, side, cell):
+        """Resolves a valid shot, reports it to both players and passes the turn."""
+        self.shots[side] |= 1 << cell
+        row, col = divmod(cell, self.cols)
+        result = self.ships[1 - side].resolve(row, col)
+        size = horizontal = start = 0
+        if result.sunk:
+            size, horizontal, start = encode_ship(result.cells, self.cols)
+        self.broadcast(encode(RESULT, side, cell, _OUTCOMES.get(result.outcome, 0), size, horizontal, start))
+        if self.players[side] is None:
+            self.ai.update_last_hit(row, col, result.hit, result.cells)
+        if result.sunk and self.ships[1 - side].afloat == 0:
+            self.finish(side, OVER_WIN)
+        else:
+            self.turn = 1 - side
+
+    def _play_ai(self):
+        """Fires the AI's shots for as long as it is its turn."""
+        while self.state == PLAYING and self.players[self.turn] is None:
+            row, col = self.ai.choose_move(self._grid, {})
+            self._resolve(self.turn, row * self.cols + col)
+
+    def leave(self, side):
+        """Ends a running match when a side leaves it: the other side wins by forfeit."""
+        self.players[side] = None
+        if self.state != FINISHED:
+            self.finish(1 - side, OVER_FORFEIT)
+
+    def finish(self, winner, reason):
+        """Ends the match and announces the winner."""
+        self.state = FINISHED
+        self.winner = winner
+        self.broadcast(encode(OVER, winner, reason))
+        if self._on_finish is not None:
+            self._on_finish(self)
+
+
+class GameServer:
+    """
+    An asyncio server hosting many Battleship matches, against an AI or between two clients.
+
+    Every client speaks the binary protocol of `game.protocol`. A client joins a match
+    (`JOIN`), places its ships (`PLACE`), then fires (`FIRE`); the server answers with the
+    results of both sides' shots and the end of the match. All the matches run in one event
+    loop: a match only costs memory while its players think, and every message is handled
+    without blocking.
+
+    Attributes:
+        rows (int): Number of rows in each grid.
+        cols (int): Number of columns in each grid.
+        fleet (list): List of (name, size) tuples of each side.
+        ai_strategy (str): Strategy of the AI opponents.
+        matches (dict): Running matches, by number.
+        finished (int): Number of matches finished.
+    """
+
+    def __init__(self, rows=10, cols=10, fleet=None, ai_strategy="smart", seed=None):
+        """
+        Initializes the server.
+
+        Args:
+            rows (int, optional): Number of rows in each grid. Defaults to 10.
+            cols (int, optional): Number of columns in each grid. Defaults to 10.
+            fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+            ai_strategy (str, optional): Strategy of the AI opponents. Defaults to "smart".
+            seed (int, optional): Seed of the AIs' random streams.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.fleet = list(fleet if fleet is not None else DEFAULT_FLEET)
+        self.ai_strategy = ai_strategy
+        self.matches = {}
+        self.finished = 0
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._waiting = None  # Client waiting for a human opponent
+        self._grid = [[None] * cols for _ in range(rows)]
+        self._joined = bytes(size for _, size in self.fleet)
+        self._tasks = set()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Starts listening for TCP clients.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        log_event(INFO, "server_started", f"Listening on {host}:{port}", host=host, port=port)
+        return server
+
+    async def connect(self):
+        """
+        Connects an in-process client through an in-memory transport, without socket.
+
+        Returns:
+            tuple: The `StreamReader` and `StreamWriter` of the client.
+        """
+        (client_reader, client_writer), (reader, writer) = memory_connection()
+        task = asyncio.get_running_loop().create_task(self.handle_client(reader, writer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return client_reader, client_writer
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves a client until it disconnects.
+
+        Every frame of a read is handled before the next read; when too many messages wait
+        to be sent to a slow client, its messages stop being read until they are sent.
+        """
+        connection = Connection(writer, asyncio.get_running_loop())
+        frames = FrameReader()
+        transport = writer.transport
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                for kind, body in frames.feed(data):
+                    self.dispatch(connection, kind, body)
+                if transport.get_write_buffer_size() > HIGH_WATER:
+                    connection.flush()
+                    await writer.drain()
+        except ValueError:
+            connection.send(encode(ERROR, BAD_MESSAGE))  # Unreadable stream: the client is dropped
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(connection)
+            connection.flush()
+            writer.close()
+
+    def dispatch(self, connection, kind, body):
+        """Handles a message of a client."""
+        try:
+            fields = decode(kind, body)
+        except ValueError:
+            connection.send(encode(ERROR, BAD_MESSAGE))
+            return
+        match = connection.match
+        if kind == JOIN:
+            error = self.join(connection, fields[0])
+        elif match is None and kind in (PLACE, FIRE):
+            error = WRONG_STATE
+        elif kind == PLACE:
+            error = match.place(connection.side, fields[0], bool(fields[1]), fields[2])
+        elif kind == FIRE:
+            error = match.fire(connection.side, fields[0])
+        else:
+            error = BAD_MESSAGE
+        if error is not None:
+            connection.send(encode(ERROR, error))
+
+    def join(self, connection, mode):
+        """
+        Puts a client in a new match, against an AI or against the next client asking for a human.
+
+        Returns:
+            int: An error code, or None.
+        """
+        if (connection.match is not None and connection.match.state != FINISHED) or connection is self._waiting:
+            return WRONG_STATE
+        if mode == MODE_AI:
+            ai = AI(strategy=self.ai_strategy, ship_sizes=[size for _, size in self.fleet],
+                    rng=random.Random(self._rng.getrandbits(64)))
+            self._open(connection, None, ai)
+        elif mode == MODE_HUMAN:
+            if self._waiting is None:
+                self._waiting = connection
+            else:
+                first, self._waiting = self._waiting, None
+                self._open(first, connection)
+        else:
+            return BAD_MESSAGE
+        return None
+
+    def _open(self, first, second, ai=None):
+        """Creates a match between two clients, or a client and an AI."""
+        match = Match(next(self._ids), self.rows, self.cols, self.fleet, [first, second], ai, self._grid, self._close)
+        self.matches[match.id] = match
+        for side, player in enumerate(match.players):
+            if player is not None:
+                player.match = match
+                player.side = side
+                player.send(encode(JOINED, match.id, side, self.rows, self.cols, tail=self._joined))
+        if logger.isEnabledFor(DEBUG):
+            log_event(DEBUG, "match_started", f"Match {match.id} started", match=match.id, ai=ai is not None)
+
+    def _close(self, match):
+        """Forgets a finished match."""
+        self.matches.pop(match.id, None)
+        self.finished += 1
+        if logger.isEnabledFor(DEBUG):
+            log_event(DEBUG, "match_over", f"Match {match.id} won by side {match.winner}", match=match.id, winner=match.winner)
+
+    def disconnect(self, connection):
+        """Removes a client from the waiting list, or from its match which its opponent then wins."""
+        if connection is self._waiting:
+            self._waiting = None
+        if connection.match is not None:
+            connection.match.leave(connection.side)
+
+
+class MemoryTransport(asyncio.Transport):
+    """
+    One end of an in-memory connection between two asyncio streams.
+
+    What is written on one end is delivered to the other end on the next iteration of the
+    event loop, in order, as a socket would; no file descriptor is used, so the number of
+    connections is only limited by memory.
+    """
+
+    def __init__(self, loop):
+        super().__init__()
+        self._loop = loop
+        self._protocol = None
+        self._peer = None
+        self._closing = False
+
+    def set_protocol(self, protocol):
+        self._protocol = protocol
+
+    def get_protocol(self):
+        return self._protocol
+
+    def is_closing(self):
+        return self._closing
+
+    def get_write_buffer_size(self):
+        return 0
+
+    def can_write_eof(self):
+        return False
+
+    def write(self, data):
+        if data and not self._closing:
+            self._loop.call_soon(self._peer._receive, bytes(data))
+
+    def _receive(self, data):
+        if not self._closing:
+            self._protocol.data_received(data)
+
+    def _hang_up(self):
+        if not self._closing:
+            self._protocol.eof_received()
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        self._loop.call_soon(self._peer._hang_up)
+        self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def abort(self):
+        self.close()
+
+
+def memory_connection():
+    """
+    Creates two connected pairs of asyncio streams, in memory. Must be called from a running event loop.
+
+    Returns:
+        tuple: (reader, writer) of each end.
+    """
+    loop = asyncio.get_running_loop()
+    transports = MemoryTransport(loop), MemoryTransport(loop)
+    transports[0]._peer, transports[1]._peer = transports[1], transports[0]
+    ends = []
+    for transport in transports:
+        reader = asyncio.StreamReader(loop=loop)
+        protocol = asyncio.StreamReaderProtocol(reader, loop=loop)
+        transport.set_protocol(protocol)
+        protocol.connection_made(transport)
+        ends.append((reader, asyncio.StreamWriter(transport, protocol, reader, loop)))
+    return tuple(ends)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """Runs a `GameServer` on a TCP port until cancelled."""
+    server = await GameServer(**options).start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hosts Battleship matches over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--strategy", default="smart", help="Strategy of the AI opponents")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    with enable_logging(INFO):
+        try:
+            asyncio.run(serve(args.host, args.port, ai_strategy=args.strategy, seed=args.seed))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,249 @@
+from collections import namedtuple
+
+MISS = "miss"
+HIT = "hit"
+SUNK = "sunk"
+
+
+class ShotResult(namedtuple("ShotResult", ["outcome", "ship", "cells"])):
+    """
+    Outcome of a shot.
+
+    A `ShotResult` is truthy when the shot hit a ship, so it can replace the former
+    boolean results (`if result: ...`).
+
+    Attributes:
+        outcome (str): `MISS`, `HIT` or `SUNK` (the shot hit the last afloat cell of the ship).
+        ship: Key of the ship hit (as in the `boats` dictionaries), or None on a miss.
+        cells (tuple): Cells of the ship when it was sunk by this shot, empty otherwise.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return self.outcome != MISS
+
+    @property
+    def hit(self):
+        """True if the shot hit a ship."""
+        return self.outcome != MISS
+
+    @property
+    def sunk(self):
+        """True if the shot sank a ship."""
+        return self.outcome == SUNK
+
+
+MISSED = ShotResult(MISS, None, ())
+
+
+def ship_name(ship):
+    """Returns the display name of a ship key: the name itself, or the name of a (name, size) key."""
+    return ship[0] if isinstance(ship, tuple) else ship
+
+
+class ShipIndex:
+    """
+    Maps every ship cell to its ship and counts the cells of each ship still afloat.
+
+    Resolving a shot, detecting a sunk ship and checking the victory are dictionary lookups
+    and counter updates, whatever the size of the fleet.
+
+    Attributes:
+        ship_at (dict): Ship key of every (row, col) ship cell.
+        positions (dict): Cells of each ship, in the order they were added.
+        remaining (dict): Number of cells of each ship not hit yet.
+        afloat (int): Number of ships with at least one cell not hit.
+    """
+
+    def __init__(self):
+        self.ship_at = {}
+        self.positions = {}
+        self.remaining = {}
+        self.afloat = 0
+        self._hit = set()  # Ship cells already hit
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, ship, positions):
+        """
+        Registers the cells of a ship.
+
+        Args:
+            ship: Key of the ship (as in the `boats` dictionaries).
+            positions (iterable): The (row, col) cells of the ship.
+        """
+        for cell in positions:
+            self.add_cell(ship, cell)
+
+    def add_cell(self, ship, cell):
+        """
+        Registers one more cell of a ship, for ships placed cell by cell.
+
+        Args:
+            ship: Key of the ship.
+            cell (tuple): The (row, col) cell.
+        """
+        if cell in self.ship_at:
+            return
+        if ship not in self.positions:
+            self.positions[ship] = []
+            self.remaining[ship] = 0
+        if self.remaining[ship] == 0:
+            self.afloat += 1  # A new ship, or a sunk one growing again
+        self.ship_at[cell] = ship
+        self.positions[ship].append(cell)
+        self.remaining[ship] += 1
+
+    def resolve(self, row, col):
+        """
+        Resolves a shot at (row, col) and updates the counters.
+
+        A ship cell that was already hit is reported as a hit again, without being counted twice.
+
+        Args:
+            row (int): Row of the shot.
+            col (int): Column of the shot.
+
+        Returns:
+            ShotResult: The outcome, the ship hit and, if it was sunk, its cells.
+        """
+        cell = (row, col)
+        ship = self.ship_at.get(cell)
+        if ship is None:
+            return MISSED
+        if cell in self._hit:
+            return ShotResult(HIT, ship, ())
+        self._hit.add(cell)
+        self.remaining[ship] -= 1
+        if self.remaining[ship]:
+            return ShotResult(HIT, ship, ())
+        self.afloat -= 1
+        return ShotResult(SUNK, ship, tuple(self.positions[ship]))
+
+    def all_sunk(self):
+        """Returns True if at least one ship was registered and every ship is sunk."""
+        return bool(self.positions) and self.afloat == 0
+
+    def clear(self):
+        """Removes every ship, in place."""
+        self.ship_at.clear()
+        self.positions.clear()
+        self.remaining.clear()
+        self._hit.clear()
+        self.afloat = 0
+
+
+class Fleet(dict):
+    """
+    Ships of a player: the cells of each ship not hit yet, by ship key, and the ship of every cell.
+
+    A `Fleet` is the `boats` dictionary of a `Player`. It reads and compares like the former
+    `{name: [(row, col), ...]}` dictionary, but every change made through it also updates
+    `ship_at`, so placing a cell, checking a collision and finding the ship hit by a shot are
+    dictionary lookups instead of scans of every ship.
+
+    The position lists are stored as given, so they may be shared (e.g. with a board); they
+    must then only be changed through the fleet (`add_cell`, `hit`) for `ship_at` to follow.
+
+    Attributes:
+        ship_at (dict): Ship key of every cell of the fleet not hit yet.
+    """
+
+    __slots__ = ("ship_at",)
+
+    def __init__(self, boats=()):
+        """
+        Initializes a fleet.
+
+        Args:
+            boats (dict or iterable, optional): Positions of each ship, as a dictionary or
+                (key, positions) pairs. Defaults to no ship.
+        """
+        super().__init__()
+        self.ship_at = {}
+        self.update(boats)
+
+    def __reduce__(self):
+        return Fleet, (dict(self),)
+
+    def __setitem__(self, ship, positions):
+        if ship in self:
+            self._forget(ship)
+        super().__setitem__(ship, positions)
+        ship_at = self.ship_at
+        for cell in positions:
+            ship_at[cell] = ship
+
+    def __delitem__(self, ship):
+        self._forget(ship)
+        super().__delitem__(ship)
+
+    def _forget(self, ship):
+        """Removes the cells of a ship from `ship_at`."""
+        ship_at = self.ship_at
+        for cell in dict.__getitem__(self, ship):
+            if ship_at.get(cell) == ship:
+                del ship_at[cell]
+
+    def pop(self, ship, *default):
+        if ship in self:
+            self._forget(ship)
+        return super().pop(ship, *default)
+
+    def popitem(self):
+        ship, positions = super().popitem()
+        for cell in positions:
+            self.ship_at.pop(cell, None)
+        return ship, positions
+
+    def setdefault(self, ship, positions=None):
+        if ship not in self:
+            self[ship] = positions if positions is not None else []
+        return dict.__getitem__(self, ship)
+
+    def update(self, *boats, **named):
+        for ship, positions in dict(*boats, **named).items():
+            self[ship] = positions
+
+    def clear(self):
+        """Removes every ship, in place."""
+        super().clear()
+        self.ship_at.clear()
+
+    def add_cell(self, ship, cell):
+        """
+        Adds a cell to a ship, creating the ship if needed.
+
+        Args:
+            ship: Key of the ship.
+            cell (tuple): The (row, col) cell.
+
+        Returns:
+            bool: True if the cell was added, False if it already belongs to a ship.
+        """
+        if cell in self.ship_at:
+            return False
+        positions = self.get(ship)
+        if positions is None:
+            positions = []
+            super().__setitem__(ship, positions)
+        positions.append(cell)
+        self.ship_at[cell] = ship
+        return True
+
+    def hit(self, cell):
+        """
+        Removes a hit cell from its ship.
+
+        Args:
+            cell (tuple): The (row, col) cell shot.
+
+        Returns:
+            The key of the ship hit, or None if no ship occupies the cell (any more).
+        """
+        ship = self.ship_at.pop(cell, None)
+        if ship is not None:
+            dict.__getitem__(self, ship).remove(cell)
+        return ship
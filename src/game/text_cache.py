@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Least-recently-used cache of rendered text surfaces.
+
+    Rendering text with `pygame.font.Font.render` rasterizes every glyph on each call. The
+    labels of the game hardly ever change, so each (font, text, color, antialias) combination
+    is rendered once and the same surface is returned afterwards. The surfaces are shared:
+    callers must only blit them, never draw on them.
+
+    Attributes:
+        maxsize (int): Maximum number of surfaces kept; the least recently used one is dropped first.
+        hits (int): Number of calls answered from the cache.
+        misses (int): Number of calls that had to render the text.
+    """
+
+    def __init__(self, maxsize=512):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of surfaces kept. Defaults to 512.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, antialias, color):
+        """
+        Returns the rendering of `text`, with the same arguments as `pygame.font.Font.render`.
+
+        Args:
+            font (pygame.font.Font): Font used for the text.
+            text (str): Text to render.
+            antialias (bool): If True, the characters have smooth edges.
+            color (tuple): RGB color of the text.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (font, text, tuple(color), bool(antialias))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)  # Drop the least recently used surface
+        return surface
+
+    def clear(self):
+        """Drops every cached surface and resets the counters."""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()  # Cache shared by every screen of the game
+
+
+def render_text(font, text, antialias, color):
+    """
+    Renders `text` through the shared `text_cache`. Drop-in replacement for `font.render(text, antialias, color)`.
+
+    Args:
+        font (pygame.font.Font): Font used for the text.
+        text (str): Text to render.
+        antialias (bool): If True, the characters have smooth edges.
+        color (tuple): RGB color of the text.
+
+    Returns:
+        pygame.Surface: The rendered text.
+    """
+    return text_cache.render(font, text, antialias, color)
@@ -0,0 +1,494 @@
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.engine import HeadlessGame
+from game.ia import AI
+from game.log import INFO, log_event
+from utils.boat_type import DEFAULT_FLEET
+
+FORMATS = ("round-robin", "swiss")
+INITIAL_RATING = 1500.0
+K_FACTOR = 16.0  # Largest rating change per game
+CHECKPOINT_INTERVAL = 5.0  # Seconds between two checkpoints during a round
+
+_results = None  # Queue receiving the results of the worker process, set by `_init_worker`
+_engines = {}  # Engine reused by each worker process, per (rows, cols, fleet)
+_ais = {}  # AI reused by each worker process, per (rows, cols, fleet, strategy, parameters)
+
+
+def parse_entrant(text):
+    """
+    Parses an entrant given on the command line: "strategy", "name=strategy" or
+    "name=strategy:parameter=value,...", e.g. "quick=smart:endgame_limit=0,book_dir=None".
+
+    Values are read as Python literals when possible (numbers, None...), as strings otherwise.
+
+    Args:
+        text (str): The description of the entrant.
+
+    Returns:
+        tuple: Its name and its settings, a dict with the strategy ("strategy") and the
+            keyword arguments of its `AI` ("params").
+    """
+    head, _, options = text.partition(":")
+    name, named, strategy = head.partition("=")
+    if not named:
+        name, strategy = text, head
+    params = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return name, {"strategy": strategy, "params": params}
+
+
+class Tournament:
+    """
+    A tournament between AI strategies, or variants of their parameters: its schedule, its
+    results and the Elo rating of each entrant.
+
+    Every pairing plays `games` games on seeded fleets. Games go by two on the same seed,
+    the entrants taking turns to fire first, so both face the same fleets. A pairing is won
+    by the entrant winning the most games, for 1 point (0.5 each for a tie).
+
+    "round-robin" schedules every pairing at once. "swiss" plays `rounds` rounds, each pairing
+    entrants with close scores that have not met yet; with an odd number of entrants, the
+    lowest ranked entrant without a bye gets one, worth 1 point.
+
+    Results may arrive in any order; the ratings are updated as soon as every earlier pairing
+    has its result, so they do not depend on the number of workers (as long as the strategies
+    do not depend on time, like the sampling budget of "montecarlo").
+
+    Attributes:
+        entrants (dict): Settings of each entrant (see `parse_entrant`), by name.
+        format (str): "round-robin" or "swiss".
+        games (int): Number of games per pairing.
+        rounds (int): Number of rounds.
+        rows (int): Number of rows in the grids.
+        cols (int): Number of columns in the grids.
+        fleet (tuple): (name, size) of each ship.
+        seed (int): Seed of the tournament, from which the seed of every game is derived.
+        pairings (list): (round, first entrant, second entrant or None for a bye) of every pairing scheduled.
+        results (dict): Result of each finished pairing, by index.
+        ratings (dict): Elo rating of each entrant.
+        standings (dict): Points, wins, losses, draws, games and total shots-to-win of each entrant.
+        applied (int): Number of pairings, from the first, whose result is in the ratings and standings.
+    """
+
+    def __init__(self, entrants, format="round-robin", games=10, rounds=None, rows=10, cols=10, fleet=None, seed=0):
+        """
+        Initializes a tournament with nothing played yet.
+
+        Args:
+            entrants (dict): Settings of each entrant by name: a strategy name, or a dict with
+                the strategy ("strategy") and the keyword arguments of its `AI` ("params").
+            format (str, optional): "round-robin" or "swiss". Defaults to "round-robin".
+            games (int, optional): Number of games per pairing. Defaults to 10.
+            rounds (int, optional): Number of Swiss rounds. Defaults to log2 of the number of entrants, rounded up.
+            rows (int, optional): Number of rows in the grids. Defaults to 10.
+            cols (int, optional): Number of columns in the grids. Defaults to 10.
+            fleet (list, optional): List of (name, size) tuples. Defaults to the `BoatType` fleet.
+            seed (int, optional): Seed of the tournament. Defaults to 0.
+
+        Raises:
+            ValueError: If the format is unknown or there are fewer than two entrants.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown tournament format {format!r}, expected one of {FORMATS}")
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+        self.entrants = {
+            name: {"strategy": settings, "params": {}} if isinstance(settings, str) else
+            {"strategy": settings["strategy"], "params": dict(settings.get("params", {}))}
+            for name, settings in entrants.items()
+        }
+        self.format = format
+        self.games = games
+        if format == "round-robin":
+            self.rounds = 1
+        else:
+            self.rounds = rounds if rounds is not None else math.ceil(math.log2(len(entrants)))
+        self.rows = rows
+        self.cols = cols
+        self.fleet = tuple(tuple(ship) for ship in fleet) if fleet is not None else tuple(DEFAULT_FLEET)
+        self.seed = seed
+        self.pairings = []
+        self.results = {}
+        self.ratings = dict.fromkeys(self.entrants, INITIAL_RATING)
+        self.standings = {name: {"points": 0.0, "wins": 0, "losses": 0, "draws": 0, "games": 0, "shots": 0}
+                          for name in self.entrants}
+        self.applied = 0
+
+    @property
+    def round(self):
+        """Number of rounds scheduled so far."""
+        return self.pairings[-1][0] + 1 if self.pairings else 0
+
+    @property
+    def finished(self):
+        """True once every round is scheduled and played."""
+        return self.round == self.rounds and len(self.results) == len(self.pairings)
+
+    def pending(self):
+        """Returns the indices of the pairings scheduled but not played, in order."""
+        return [i for i in range(len(self.pairings)) if i not in self.results]
+
+    def schedule_round(self):
+        """
+        Schedules the next round, once the previous one is over.
+
+        Returns:
+            list: Indices of the pairings to play, empty if a round is still being played
+                or the tournament is over. Byes are recorded at once and not returned.
+        """
+        if self.pending() or self.round == self.rounds:
+            return []
+        number = self.round
+        names = list(self.entrants)
+        if self.format == "round-robin":
+            pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+        else:
+            pairs = self._swiss_pairs()
+        first = len(self.pairings)
+        self.pairings.extend((number, a, b) for a, b in pairs)
+        log_event(INFO, "tournament_round", f"Round {number + 1}/{self.rounds}: {len(pairs)} pairings",
+                  round=number, pairings=len(pairs))
+        for i in range(first, len(self.pairings)):
+            if self.pairings[i][2] is None:
+                self.record({"pairing": i, "bye": True})
+        return self.pending()
+
+    def _swiss_pairs(self):
+        """
+        Pairs the entrants in ranking order, each with the closest ranked entrant it has not met
+        yet, backtracking when the last ones could only meet again. Rematches are only allowed
+        when there is no other way.
+        """
+        met = {frozenset((a, b)) for _, a, b in self.pairings}
+        byes = {a for _, a, b in self.pairings if b is None}
+        ranked = [row["name"] for row in self.leaderboard()]
+        pairs = []
+        if len(ranked) % 2:
+            bye = next((name for name in reversed(ranked) if name not in byes), ranked[-1])
+            ranked.remove(bye)
+            pairs.append((bye, None))
+
+        def pair(unpaired):
+            if not unpaired:
+                return []
+            a = unpaired[0]
+            for i, b in enumerate(unpaired[1:], 1):
+                if frozenset((a, b)) not in met:
+                    rest = pair(unpaired[1:i] + unpaired[i + 1:])
+                    if rest is not None:
+                        return [(a, b)] + rest
+            return None
+
+        new = pair(ranked)
+        if new is None:
+            new = list(zip(ranked[::2], ranked[1::2]))
+        return pairs + new
+
+    def task(self, index):
+        """Returns the arguments of `play_pairing` for a pairing, as sent to a worker process."""
+        _, a, b = self.pairings[index]
+        return (index, self.rows, self.cols, self.fleet, self._settings(a), self._settings(b), self.games,
+                f"{self.seed}:{index}")
+
+    def _settings(self, name):
+        """Returns the strategy and the sorted parameters of an entrant, hashable."""
+        settings = self.entrants[name]
+        return settings["strategy"], tuple(sorted(settings["params"].items()))
+
+    def record(self, result):
+        """
+        Stores the result of a pairing, then applies every result that no earlier pairing still waits for.
+
+        Args:
+            result (dict): Result of `play_pairing`, or {"pairing": index, "bye": True}.
+        """
+        self.results[result["pairing"]] = result
+        while self.applied in self.results:
+            self._apply(self.pairings[self.applied], self.results[self.applied])
+            self.applied += 1
+
+    def _apply(self, pairing, result):
+        """Updates the ratings and the standings with the result of a pairing."""
+        _, a, b = pairing
+        if b is None:
+            self.standings[a]["points"] += 1
+            return
+        wins = result["wins"]
+        draws = result["draws"]
+        played = wins[0] + wins[1] + draws
+        expected = 1 / (1 + 10 ** ((self.ratings[b] - self.ratings[a]) / 400))
+        change = K_FACTOR * (wins[0] + draws / 2 - played * expected)
+        self.ratings[a] += change
+        self.ratings[b] -= change
+        for side, name in enumerate((a, b)):
+            row = self.standings[name]
+            row["wins"] += wins[side]
+            row["losses"] += wins[1 - side]
+            row["draws"] += draws
+            row["games"] += played
+            row["shots"] += result["shots"][side]
+            row["points"] += 1 if wins[side] > wins[1 - side] else 0.5 if wins[side] == wins[1 - side] else 0
+
+    def leaderboard(self):
+        """
+        Ranks the entrants by points, then by rating.
+
+        Returns:
+            list: For each entrant, best first, a dict with its "name", "rating", "points",
+                "wins", "losses", "draws", "games" and mean shots per game won ("mean_shots", or None).
+        """
+        rows = [
+            {"name": name, "rating": self.ratings[name], **{key: value for key, value in row.items() if key != "shots"},
+             "mean_shots": row["shots"] / row["wins"] if row["wins"] else None}
+            for name, row in self.standings.items()
+        ]
+        rows.sort(key=lambda row: (-row["points"], -row["rating"], row["name"]))
+        return rows
+
+    def to_dict(self):
+        """Returns the settings, schedule and results of the tournament, as JSON-compatible data."""
+        return {
+            "entrants": self.entrants, "format": self.format, "games": self.games, "rounds": self.rounds,
+            "rows": self.rows, "cols": self.cols, "fleet": self.fleet, "seed": self.seed,
+            "pairings": self.pairings, "results": [self.results[i] for i in sorted(self.results)],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a tournament from `to_dict` data, replaying its results to restore the ratings.
+
+        Args:
+            data (dict): The data.
+
+        Returns:
+            Tournament: The tournament, ready to resume.
+        """
+        tournament = cls(data["entrants"], data["format"], data["games"], data["rounds"], data["rows"],
+                         data["cols"], data["fleet"], data["seed"])
+        tournament.pairings = [tuple(pairing) for pairing in data["pairings"]]
+        for result in data["results"]:
+            tournament.record(result)
+        return tournament
+
+    def save(self, path):
+        """
+        Writes a checkpoint of the tournament, atomically: a crash leaves the previous checkpoint intact.
+
+        Args:
+            path (str): Path of the JSON checkpoint.
+        """
+        temp_file = f"{path}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_file, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a checkpoint written by `save`.
+
+        Args:
+            path (str): Path of the JSON checkpoint.
+
+        Returns:
+            Tournament: The tournament, ready to resume with `run_tournament`.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def play_pairing(game, ais, games, seed):
+    """
+    Plays the games of a pairing on an engine.
+
+    Game `k` is played with the seed "seed:k//2", the second AI firing first when `k` is odd.
+
+    Args:
+        game (HeadlessGame): Engine playing the games; its AIs are replaced by `ais`.
+        ais (tuple): AIs of the two entrants, sharing the random stream of the engine.
+        games (int): Number of games.
+        seed (str): Seed of the pairing.
+
+    Returns:
+        tuple: The number of games won by each AI, the number of games without a winner
+            and the total shots fired by each AI in the games it won.
+    """
+    wins = [0, 0]
+    shots = [0, 0]
+    draws = 0
+    for k in range(games):
+        first = k % 2
+        game.ais[0], game.ais[1] = ais[first], ais[1 - first]
+        result = game.play(f"{seed}:{k // 2}")
+        if result["winner"] is None:
+            draws += 1
+            continue
+        winner = result["winner"] ^ first
+        wins[winner] += 1
+        shots[winner] += result["shots"]
+    return wins, draws, shots
+
+
+def _play(task):
+    """
+    Plays a pairing of `Tournament.task`, reusing the engine and the AIs of this process.
+
+    Returns:
+        dict: The pairing ("pairing"), the games won by each entrant ("wins"), the draws
+            ("draws") and the shots of each entrant in the games it won ("shots").
+    """
+    index, rows, cols, fleet, a, b, games, seed = task
+    key = (rows, cols, fleet)
+    game = _engines.get(key)
+    if game is None:
+        game = _engines[key] = HeadlessGame(rows, cols, fleet, ("random", "random"))
+    ais = []
+    for strategy, params in (a, b):
+        ai = _ais.get(key + (strategy, params))
+        if ai is None:
+            ai = _ais[key + (strategy, params)] = AI(strategy=strategy, ship_sizes=[size for _, size in fleet],
+                                                     rng=game.rng, **dict(params))
+        ais.append(ai)
+    if ais[0] is ais[1]:  # Two entrants with the same settings
+        ais[1] = ais[0].fork()
+    wins, draws, shots = play_pairing(game, ais, games, seed)
+    return {"pairing": index, "wins": wins, "draws": draws, "shots": shots}
+
+
+def _init_worker(results, counter, cpus):
+    """Process pool initializer: keeps the results queue and pins the worker to its own core."""
+    global _results
+    _results = results
+    if cpus:
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+
+def _play_task(task):
+    """Process pool entry point: plays a pairing and sends its result through the queue."""
+    _results.put(_play(task))
+
+
+def run_tournament(tournament, workers=None, checkpoint=None, pin=True, checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Plays the remaining rounds of a tournament, sharding the pairings across a process pool.
+
+    Each worker keeps its engine and its AIs from one pairing to the next and sends every
+    result through a queue as soon as it is played, so the ratings are updated while the
+    round goes on. The checkpoint is written at most every `checkpoint_interval` seconds and
+    at the end of each round: after a crash, `Tournament.load` followed by `run_tournament`
+    only plays the pairings missing from it.
+
+    Args:
+        tournament (Tournament): The tournament, new or loaded from a checkpoint.
+        workers (int, optional): Number of worker processes. Defaults to the number of usable CPUs.
+            With 1 worker, the pairings are played in the current process.
+        checkpoint (str, optional): Path of the JSON checkpoint. Defaults to None, for none.
+        pin (bool, optional): Pin each worker to its own CPU where the platform allows it. Defaults to True.
+        checkpoint_interval (float, optional): Minimum time between two checkpoints of a round, in seconds.
+
+    Returns:
+        Tournament: The tournament, finished.
+    """
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    workers = workers or (len(cpus) if cpus else os.cpu_count()) or 1
+    saved = time.monotonic()
+    executor = results = None
+    if workers != 1:
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                       initargs=(results, context.Value("i", 0), cpus if pin else None))
+    try:
+        while True:
+            pending = tournament.pending() or tournament.schedule_round()
+            if not pending:
+                break
+            if executor is None:
+                played = (_play(tournament.task(i)) for i in pending)
+            else:
+                played = _collect(executor, results, [tournament.task(i) for i in pending])
+            for result in played:
+                tournament.record(result)
+                if checkpoint and time.monotonic() - saved >= checkpoint_interval:
+                    tournament.save(checkpoint)
+                    saved = time.monotonic()
+            if checkpoint:
+                tournament.save(checkpoint)
+                saved = time.monotonic()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return tournament
+
+
+def _collect(executor, results, tasks):
+    """Submits the pairings to the pool and yields their results from the queue, as they are played."""
+    futures = [executor.submit(_play_task, task) for task in tasks]
+    for _ in tasks:
+        while True:
+            try:
+                yield results.get(timeout=0.5)
+                break
+            except queue.Empty:
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+
+
+def format_leaderboard(tournament):
+    """
+    Formats the leaderboard of a tournament as a table.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        str: One line per entrant, best first.
+    """
+    lines = [f"{'#':>3} {'entrant':20} {'rating':>7} {'points':>6} {'W-L-D':>12} {'shots/win':>9}"]
+    for rank, row in enumerate(tournament.leaderboard(), 1):
+        record = f"{row['wins']}-{row['losses']}-{row['draws']}"
+        shots = f"{row['mean_shots']:.2f}" if row["mean_shots"] is not None else "-"
+        lines.append(f"{rank:>3} {row['name']:20} {row['rating']:7.1f} {row['points']:6.1f} {record:>12} {shots:>9}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays a tournament between AI strategies and parameter variants.")
+    parser.add_argument("--entrants", nargs="+", default=["random", "targeted", "smart"],
+                        help='Entrants, as "strategy" or "name=strategy:parameter=value,..."')
+    parser.add_argument("--format", choices=FORMATS, default="round-robin")
+    parser.add_argument("--games", type=int, default=100, help="Games per pairing")
+    parser.add_argument("--rounds", type=int, default=None, help="Rounds of a Swiss tournament")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None, help="JSON file saving the progress of the tournament")
+    parser.add_argument("--resume", action="store_true", help="Resume the tournament saved in --checkpoint")
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin the workers to CPUs")
+    args = parser.parse_args()
+
+    if args.resume:
+        tournament = Tournament.load(args.checkpoint)
+    else:
+        tournament = Tournament(dict(parse_entrant(text) for text in args.entrants), args.format, args.games,
+                                args.rounds, seed=args.seed)
+    run_tournament(tournament, args.workers, args.checkpoint, pin=not args.no_pin)
+    print(format_leaderboard(tournament))
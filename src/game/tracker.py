@@ -0,0 +1,223 @@
+from functools import lru_cache
+
+from game.density import HIT_WEIGHT
+from game.placement import iter_bits, placement_index
+
+DEAD = 255  # Hit count of a placement made impossible by a miss or a sunk ship
+_POWERS = tuple(HIT_WEIGHT ** covered for covered in range(DEAD))
+
+
+@lru_cache(maxsize=None)
+def _layout(rows, cols, size):
+    """
+    Returns the cells of every placement of a ship of `size`, and the placements through every
+    cell, as indices into `placement_index(rows, cols, size).masks`.
+    """
+    masks = placement_index(rows, cols, size).masks
+    cells = tuple(tuple(iter_bits(mask)) for mask in masks)
+    through = [[] for _ in range(rows * cols)]
+    for p, placement in enumerate(cells):
+        for cell in placement:
+            through[cell].append(p)
+    return cells, tuple(tuple(placements) for placements in through)
+
+
+@lru_cache(maxsize=None)
+def _empty(rows, cols, sizes):
+    """Returns the density of an empty board for a fleet, as a tuple, and the multiplicity of each size."""
+    multiplicity = {}
+    for size in sizes:
+        multiplicity[size] = multiplicity.get(size, 0) + 1
+    density = [0] * (rows * cols)
+    for size, count in multiplicity.items():
+        for placement in _layout(rows, cols, size)[0]:
+            for cell in placement:
+                density[cell] += count
+    return tuple(density), tuple(multiplicity.items())
+
+
+class DensityTracker:
+    """
+    Probability density of the remaining ships, updated shot by shot.
+
+    The tracker holds the same values as `game.density.probability_density`: for each cell,
+    the number of legal placements of each ship afloat covering it, weighted by `HIT_WEIGHT`
+    per unsunk hit they cover. Instead of recounting the board on every move, it keeps the
+    hit count of every placement and the density of every cell, and only revisits the
+    placements through the cell shot: a miss removes them, a hit raises their weight. A sunk
+    ship removes the placements through its cells and one ship of its size, the only update
+    touching every placement of a size.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        density (list): Flat list of `rows * cols` weighted placement counts, hits included.
+        multiplicity (dict): Number of ships afloat of each size.
+        hit_counts (dict): For each size afloat, the unsunk hits covered by each placement, or `DEAD`.
+        hits (int): Bitboard of the unsunk hits.
+        blocked (int): Bitboard of the misses and of the cells of sunk ships.
+    """
+
+    __slots__ = ("rows", "cols", "density", "multiplicity", "hit_counts", "hits", "blocked")
+
+    def __init__(self, rows, cols, ship_sizes):
+        """
+        Initializes the tracker for an empty board.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            ship_sizes (iterable): Sizes of the ships afloat.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.density = []
+        self.multiplicity = {}
+        self.hit_counts = {}
+        self.reset(ship_sizes)
+
+    def reset(self, ship_sizes):
+        """
+        Goes back to an empty board, in place.
+
+        Args:
+            ship_sizes (iterable): Sizes of the ships afloat.
+        """
+        density, multiplicity = _empty(self.rows, self.cols, tuple(sorted(ship_sizes)))
+        self.density[:] = density
+        self.multiplicity.clear()
+        self.multiplicity.update(multiplicity)
+        self.hit_counts.clear()
+        for size, _ in multiplicity:
+            self.hit_counts[size] = bytearray(len(_layout(self.rows, self.cols, size)[0]))
+        self.hits = 0
+        self.blocked = 0
+
+    @classmethod
+    def from_board(cls, rows, cols, misses, hits, sunk, ship_sizes):
+        """
+        Builds a tracker for a board already played.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            misses (int): Bitboard of the missed shots.
+            hits (int): Bitboard of the hits on ships that are not sunk yet.
+            sunk (int): Bitboard of the cells of sunk ships.
+            ship_sizes (iterable): Sizes of the ships still afloat.
+
+        Returns:
+            DensityTracker: The tracker.
+        """
+        tracker = cls(rows, cols, ship_sizes)
+        for cell in iter_bits(misses | sunk):
+            tracker._block(cell)
+        for cell in iter_bits(hits):
+            tracker.hit(divmod(cell, cols))
+        return tracker
+
+    def copy(self):
+        """Returns an independent copy of the tracker."""
+        clone = DensityTracker.__new__(DensityTracker)
+        clone.rows = self.rows
+        clone.cols = self.cols
+        clone.density = list(self.density)
+        clone.multiplicity = dict(self.multiplicity)
+        clone.hit_counts = {size: bytearray(counts) for size, counts in self.hit_counts.items()}
+        clone.hits = self.hits
+        clone.blocked = self.blocked
+        return clone
+
+    def miss(self, cell):
+        """
+        Removes the placements through a missed cell.
+
+        Args:
+            cell (tuple): The (row, col) cell missed.
+        """
+        self._block(cell[0] * self.cols + cell[1])
+
+    def hit(self, cell):
+        """
+        Raises the weight of the placements through a hit cell.
+
+        Args:
+            cell (tuple): The (row, col) cell hit.
+        """
+        bit_index = cell[0] * self.cols + cell[1]
+        bit = 1 << bit_index
+        if (self.hits | self.blocked) & bit:
+            return
+        self.hits |= bit
+        density = self.density
+        for size, count in self.multiplicity.items():
+            cells, through = _layout(self.rows, self.cols, size)
+            counts = self.hit_counts[size]
+            for p in through[bit_index]:
+                covered = counts[p]
+                if covered == DEAD:
+                    continue
+                counts[p] = covered + 1
+                delta = count * (_POWERS[covered + 1] - _POWERS[covered])
+                for c in cells[p]:
+                    density[c] += delta
+
+    def sink(self, cells):
+        """
+        Removes a sunk ship: one ship of its size, and every placement through its cells.
+
+        Args:
+            cells (list): The (row, col) cells of the ship.
+        """
+        size = len(cells)
+        count = self.multiplicity.get(size)
+        if count:
+            density = self.density
+            placements = _layout(self.rows, self.cols, size)[0]
+            counts = self.hit_counts[size]
+            for p, covered in enumerate(counts):
+                if covered != DEAD:
+                    weight = _POWERS[covered]
+                    for c in placements[p]:
+                        density[c] -= weight
+            if count == 1:
+                del self.multiplicity[size]
+                del self.hit_counts[size]
+            else:
+                self.multiplicity[size] = count - 1
+        for row, col in cells:
+            self._block(row * self.cols + col)
+            self.hits &= ~(1 << (row * self.cols + col))
+
+    def _block(self, bit_index):
+        """Removes the placements through a cell no ship can occupy any more."""
+        bit = 1 << bit_index
+        if self.blocked & bit:
+            return
+        self.blocked |= bit
+        density = self.density
+        for size, count in self.multiplicity.items():
+            cells, through = _layout(self.rows, self.cols, size)
+            counts = self.hit_counts[size]
+            for p in through[bit_index]:
+                covered = counts[p]
+                if covered == DEAD:
+                    continue
+                counts[p] = DEAD
+                weight = count * _POWERS[covered]
+                for c in cells[p]:
+                    density[c] -= weight
+
+    def grid(self):
+        """
+        Returns the density as a new 2D grid, the cells of unsunk hits set to 0.
+
+        Returns:
+            list: `rows` lists of `cols` densities, as `AI.calculate_probability`.
+        """
+        cols = self.cols
+        density = self.density
+        grid = [density[row * cols:(row + 1) * cols] for row in range(self.rows)]
+        for cell in iter_bits(self.hits):
+            grid[cell // cols][cell % cols] = 0
+        return grid
@@ -1,6 +1,13 @@
 import pygame
 from utils import Board, Menu
 from game.player import Player
+from game.scheduler import FrameScheduler
+from game.log import INFO, enable_logging
+
+FPS = 60  # Frame rate cap
+SCHEDULER_MODE = "idle"  # "idle" to sleep until the next event, "capped" to poll at FPS
+LOG_LEVEL = INFO  # Game events written to the console; DEBUG adds every placement and move
+
 
 def main():
     """
@@ -14,13 +21,19 @@ def main():
     - Sets up the player and enemy objects.
     - Manages the game state, switching between "menu" and "game" screens.
     - Handles user input events for both the menu and game screens.
-    - Updates the display and ensures a smooth game loop.
+    - Updates the display and ensures a smooth game loop: on the game screen, only the regions
+      redrawn by `Board.draw` are sent to the display, and nothing at all when the frame is unchanged.
+    - Paces the loop with a `FrameScheduler`: at most `FPS` frames per second, and in the "idle"
+      mode the loop sleeps until the next event since nothing on screen is animated.
+    - Writes the game events to the console through `game.log`; headless code using the
+      same classes stays silent unless it enables logging itself.
     The game loop continues running until the user closes the game window.
     Note:
     - The function assumes the existence of `Player`, `Menu`, and `Board` classes with
       appropriate methods (`handle_event` and `draw`) to manage their respective functionalities.
     """
     pygame.init()
+    event_log = enable_logging(LOG_LEVEL, asynchronous=True)  # The console never blocks a frame
     screen_width, screen_height = 1200, 800
     screen = pygame.display.set_mode((screen_width, screen_height), pygame.RESIZABLE)
     pygame.display.set_caption("Battle Ship")
@@ -33,18 +46,22 @@ def main():
     menu = Menu(screen_width, screen_height)
     board = Board(rows=10, cols=10, cell_size=50, player=player, enemy=enemy)
     current_screen = "menu"  # Current screen: "menu" or "game"
+    scheduler = FrameScheduler(fps=FPS, mode=SCHEDULER_MODE)
 
     running = True
     while running:
-        for event in pygame.event.get():
+        for event in scheduler.events():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                board.invalidate()  # The window content must be drawn again
 
             # Handle events based on the current screen
             if current_screen == "menu":
                 action = menu.handle_event(event)
                 if action == "solo":
                     current_screen = "game"
+                    board.invalidate()  # The menu covered the whole screen
                     menu.play_music(menu.ingame_music)  # Switch to in-game music
             elif current_screen == "game":
                 action = board.handle_event(event)
@@ -53,14 +70,17 @@ def main():
                     menu.play_music(menu.menu_music)  # Switch back to menu music
 
         # Render based on the current screen
-        screen.fill((0, 0, 0))  # Black background
         if current_screen == "menu":
             menu.draw(screen)
+            pygame.display.flip()  # Update the screen
         elif current_screen == "game":
-            board.draw(screen)
+            dirty = board.draw(screen)
+            if dirty:
+                pygame.display.update(dirty)  # Update only the regions that changed
 
-        pygame.display.flip()  # Update the screen
+        scheduler.end_frame(animating=False)  # Nothing on screen moves without an event
 
+    event_log.close()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -1,7 +1,17 @@
 # Importing main classes
-from game.board import Board
-from game.menu import Menu
-from game.rules import Rules
+# Board, Menu and Rules are resolved lazily so that headless modules can import
+# `utils.boat_type` without pulling in pygame.
+_LAZY_IMPORTS = {
+    "Board": "game.board",
+    "Menu": "game.menu",
+    "Rules": "game.rules",
+    # Importing utility functions
+    "draw_back_button": "game.button",
+}
 
-# Importing utility functions
-from game.button import draw_back_button
\ No newline at end of file
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -26,4 +26,8 @@ class BoatType(Enum):
 
     @property
     def name(self):
-        return self.value[0]
\ No newline at end of file
+        return self.value[0]
+
+
+# Default fleet as (name, size) tuples, the format used by boards and game engines. Immutable: each of them copies it
+DEFAULT_FLEET = tuple(boat.value for boat in BoatType)
@@ -2,6 +2,7 @@ import pytest
 
 from src.game.action import Action
 from src.game.player import Player
+from src.game.ships import ShipIndex
 
 def test_shoot_hit():
     class MockPlayer:
@@ -59,4 +60,23 @@ def test_shoot_out_of_bounds():
     result = Action.shoot(player, enemy, 11, 11)
 
     assert result is False
-    assert len(player.moves) == 0
\ No newline at end of file
+    assert len(player.moves) == 0
+
+
+def test_fire_reports_sunk_ship():
+    player = Player("Player 1")
+    enemy = Player("Player 2")
+    enemy.boats = {"Torpedo": [(0, 0), (0, 1)]}
+    ships = ShipIndex()
+    ships.add("Torpedo", list(enemy.boats["Torpedo"]))
+
+    assert Action.fire(player, enemy, 0, 0, ships).outcome == "hit"
+    result = Action.fire(player, enemy, 0, 1, ships)
+    assert result.sunk and result.ship == "Torpedo" and result.cells == ((0, 0), (0, 1))
+    assert enemy.boats["Torpedo"] == []
+
+def test_fire_without_index_detects_sunk_ship():
+    player = Player("Player 1")
+    enemy = Player("Player 2")
+    enemy.boats = {"Torpedo": [(0, 0)]}
+    assert Action.fire(player, enemy, 0, 0).sunk
@@ -0,0 +1,48 @@
+import os
+
+import pygame
+import pytest
+
+from src.game.assets import AssetManager, default_cache_dir, sound_path
+
+HIT = sound_path("hit.mp3")
+
+
+def test_sound_is_loaded_once(tmp_path):
+    assets = AssetManager(cache_dir=str(tmp_path))
+    sound = assets.sound(HIT, volume=0.25)
+    assert assets.sound(HIT) is sound
+    assert sound.get_volume() == pytest.approx(0.25, abs=0.01)
+    assert assets.load_sources[HIT] == "decode"
+    assert assets.report()[0][0] == HIT
+
+def test_decoded_pcm_is_reused(tmp_path):
+    first = AssetManager(cache_dir=str(tmp_path)).sound(HIT)
+    assert len(os.listdir(tmp_path)) == 1
+
+    assets = AssetManager(cache_dir=str(tmp_path))
+    second = assets.sound(HIT)
+    assert assets.load_sources[HIT] == "cache"
+    assert second.get_raw() == first.get_raw()
+
+def test_preload_in_background(tmp_path):
+    assets = AssetManager(cache_dir=None)
+    thread = assets.preload([HIT, sound_path("miss1.mp3")])
+    assert assets.preload([HIT]) is None  # Already claimed
+    thread.join()
+    assert set(assets.load_times) == {HIT, sound_path("miss1.mp3")}
+    assert assets.sound(HIT) is assets.sound(HIT)
+
+def test_missing_file_raises():
+    assets = AssetManager(cache_dir=None)
+    with pytest.raises((pygame.error, OSError)):
+        assets.sound(sound_path("missing.mp3"))
+
+def test_cache_dir_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == str(tmp_path)
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", "")
+    assert default_cache_dir() is None
+    monkeypatch.delenv("BATTLESHIP_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == os.path.join(str(tmp_path), "battleship", "sounds")
@@ -0,0 +1,50 @@
+from src.game.benchmark import (BENCHMARKS, append_history, benchmark, compare, game_state, load_history,
+                                measure, select)
+
+
+def test_registry_covers_hot_paths():
+    names = select()
+    for strategy in ("random", "targeted", "smart", "montecarlo"):
+        assert f"choose_move.{strategy}.late" in names
+    for name in ("calculate_probability.mid", "density.update.mid", "action.shoot", "board.place_enemy_boats",
+                 "board.reset_grid", "headless_game.smart"):
+        assert name in names
+    assert select(["choose_move.smart.*"]) == ["choose_move.smart.early", "choose_move.smart.mid", "choose_move.smart.late"]
+
+def test_measure_scales_the_number_of_operations():
+    calls = []
+
+    @benchmark("test.noop", max_number=64)
+    def setup():
+        def run(number):
+            calls.append(number)
+            return number * 1e-4
+        return run
+
+    try:
+        result = measure(setup, min_time=0.001, repeat=3)
+    finally:
+        del BENCHMARKS["test.noop"]
+    assert result["number"] == 16 and calls == [1, 2, 4, 8, 16, 16, 16, 16]
+    assert result["best"] == result["median"] == 1e-4
+
+def test_game_states_follow_the_phases():
+    shots = [len(game_state("targeted", phase)[0].shots) for phase in ("early", "mid", "late")]
+    assert shots[0] == 0 < shots[1] < shots[2]
+
+def test_choose_move_benchmark_runs():
+    run = BENCHMARKS["choose_move.targeted.mid"]()
+    assert run(4) > 0
+    assert measure(BENCHMARKS["choose_move.targeted.mid"], min_time=0, repeat=1)["best"] > 0
+
+def test_history_and_regressions(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    assert load_history(path) == []
+    for best in (1.0, 1.1, 0.9):
+        append_history(path, {"a": {"number": 1, "best": best, "median": best}})
+    history = load_history(path)
+    assert len(history) == 3 and history[-1]["results"]["a"]["best"] == 0.9
+
+    assert compare({"a": {"best": 1.2}}, history, threshold=0.25) == []
+    regressions = compare({"a": {"best": 1.5}, "new": {"best": 9.0}}, history, threshold=0.25)
+    assert regressions == [("a", 1.0, 1.5, 1.5)]
@@ -1,6 +1,7 @@
+import pygame
 import pytest
 
-from src.game.board import Board
+from src.game.board import Board, column_label
 from src.game.player import Player
 from utils.boat_type import BoatType
 
@@ -53,4 +54,53 @@ def test_check_victory():
     assert board.check_victory() is None
 
     player.boats = {"boat1": [(0, 0)], "boat2": []}
-    assert board.check_victory() == "ia"
\ No newline at end of file
+    assert board.check_victory() == "ia"
+
+
+def test_column_labels_past_z():
+    assert [column_label(col) for col in (0, 25, 26, 27, 51, 52, 701, 702)] == ["A", "Z", "AA", "AB", "AZ", "BA", "ZZ", "AAA"]
+
+def test_custom_fleet_sets_win_total():
+    fleet = [("Big", 6), ("Small", 2)]
+    player = Player("P")
+    board = Board(rows=30, cols=30, cell_size=10, fleet=fleet, player=player, enemy=type("Enemy", (object,), {"boats": {}})())
+    assert board.fleet_total == 8
+    assert board.enemy_grid.ship_count() == 8
+    assert sorted(board.enemy.boats) == sorted(fleet)
+    assert (player.rows, player.cols) == (board.enemy.rows, board.enemy.cols) == (30, 30)
+
+    # Click the "Big" ship into column 29, rows 0 to 5: the left grid starts at (150, 300)
+    pygame.display.set_mode((1200, 800))
+    for row in range(6):
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(150 + 29 * 10 + 5, 300 + row * 10 + 5))
+        board.place_boat(event, player)
+    assert player.boats["Big"] == [(row, 29) for row in range(6)]
+
+def test_draw_returns_dirty_rects():
+    pygame.display.init()
+    screen = pygame.Surface((1200, 800))
+    board = Board(rows=10, cols=10, cell_size=50, player=Player("P"), enemy=Player("IA"))
+    assert board.draw(screen) == [screen.get_rect()]
+    assert board.draw(screen) == []
+
+    board.enemy_grid.shoot(4, 4)
+    dirty = board.draw(screen)
+    assert dirty == [pygame.Rect(650 + 4 * 50, 200 + 4 * 50, 50, 50)]  # Cell (4, 4) of the right grid
+
+    board.invalidate()
+    assert board.draw(screen) == [screen.get_rect()]
+
+def test_reset_grid_clears_in_place():
+    board = Board(player=Player("P"), enemy=Player("IA"))
+    player_boats, enemy_boats = board.player.boats, board.enemy.boats
+    board.ai.update_last_hit(0, 0, hit=False)
+    board.reset_grid()
+    assert board.player.boats is player_boats and board.enemy.boats is enemy_boats
+    assert board.enemy_grid.ship_count() == board.fleet_total
+    assert not board.ai.shots
+
+def test_seeded_boards_place_the_same_fleet():
+    boards = [Board(enemy=Player("IA"), seed=5) for _ in range(2)]
+    assert boards[0].enemy.boats == boards[1].enemy.boats
+    assert boards[0].replay.seed == boards[1].replay.seed
+    assert len(boards[0].replay.fleets[1]) == len(boards[0].fleet)
@@ -0,0 +1,59 @@
+import random
+
+from src.game.density import HIT_WEIGHT, placement_starts, probability_density, to_bitboard
+
+
+def brute_force_density(rows, cols, misses, hits, sunk, ship_sizes):
+    density = [0] * (rows * cols)
+    for length in ship_sizes:
+        for horizontal in (True, False):
+            for row in range(rows):
+                for col in range(cols):
+                    cells = [(row, col + k) if horizontal else (row + k, col) for k in range(length)]
+                    if any(r >= rows or c >= cols for r, c in cells):
+                        continue
+                    indexes = [r * cols + c for r, c in cells]
+                    if any((misses | sunk) >> i & 1 for i in indexes):
+                        continue
+                    weight = HIT_WEIGHT ** sum(hits >> i & 1 for i in indexes)
+                    for i in indexes:
+                        if not hits >> i & 1:
+                            density[i] += weight
+    return density
+
+def test_empty_board_density():
+    density = probability_density(10, 10, 0, 0)
+    assert density == brute_force_density(10, 10, 0, 0, 0, (5, 4, 3, 3, 2))
+    # The centre of the board is denser than the corners
+    assert density[4 * 10 + 4] > density[0]
+
+def test_density_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(30):
+        rows, cols = rng.randint(3, 10), rng.randint(3, 10)
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        shots = rng.sample(cells, rng.randint(0, len(cells) // 2))
+        misses = to_bitboard(shots[::3], cols)
+        hits = to_bitboard(shots[1::3], cols)
+        sunk = to_bitboard(shots[2::3], cols)
+        sizes = (5, 3, 3, 2)
+        expected = brute_force_density(rows, cols, misses, hits, sunk, sizes)
+        assert probability_density(rows, cols, misses, hits, sunk, sizes) == expected
+
+def test_hit_raises_neighbours():
+    hits = to_bitboard([(5, 5)], 10)
+    density = probability_density(10, 10, 0, hits)
+    assert density[5 * 10 + 5] == 0
+    assert max(range(100), key=density.__getitem__) in (45, 54, 56, 65)
+
+def test_placement_starts():
+    free = to_bitboard([(0, 0), (0, 1), (0, 2), (1, 0)], 3)
+    assert placement_starts(free, 2, 3, 3, True) == 1
+    assert placement_starts(free, 2, 3, 2, False) == 1
+
+def test_density_on_a_large_board():
+    misses = to_bitboard([(150, 150)], 300)
+    density = probability_density(300, 300, misses, 0)
+    assert len(density) == 300 * 300
+    assert density[150 * 300 + 150] == 0
+    assert density[0] == brute_force_density(5, 5, 0, 0, 0, (5, 4, 3, 3, 2))[0]
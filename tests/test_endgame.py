@@ -0,0 +1,56 @@
+import itertools
+import random
+
+from src.game.endgame import count_layouts, endgame_move
+from src.game.ia import AI
+from src.game.placement import placement_index
+
+
+def brute_force_layouts(rows, cols, sizes, blocked, hits):
+    layouts = set()
+    for combo in itertools.product(*(placement_index(rows, cols, size).masks for size in sizes)):
+        occupied = 0
+        for mask in combo:
+            if mask & (occupied | blocked):
+                break
+            occupied |= mask
+        else:
+            if not hits & ~occupied:
+                layouts.add(frozenset(combo))
+    counts = [sum(1 for layout in layouts if any(mask >> cell & 1 for mask in layout)) for cell in range(rows * cols)]
+    return len(layouts), counts
+
+def test_count_layouts_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(100):
+        rows, cols = rng.randint(3, 5), rng.randint(3, 5)
+        sizes = rng.choice([[2], [3, 2], [2, 2], [3, 3, 2], [3, 2, 2]])
+        blocked = hits = 0
+        for cell in range(rows * cols):
+            draw = rng.random()
+            if draw < 0.2:
+                blocked |= 1 << cell
+            elif draw < 0.27:
+                hits |= 1 << cell
+        expected = brute_force_layouts(rows, cols, sizes, blocked, hits)
+        assert count_layouts(rows, cols, sizes, blocked, hits, limit=10 ** 9, budget=10 ** 9) == expected
+
+def test_count_layouts_gives_up_beyond_its_limits():
+    total, _ = count_layouts(10, 10, [5, 4], 0, 0, limit=10 ** 9, budget=10 ** 9)
+    assert total == 14400
+    assert count_layouts(10, 10, [5, 4], 0, 0, limit=1000) is None
+    assert count_layouts(10, 10, [5, 4, 3], 0, 0, limit=10 ** 9, budget=100) is None
+
+def test_endgame_move_follows_the_hit():
+    # A ship of 3 through (0, 1), with (0, 0) and (1, 1) missed: only (0, 1)-(0, 3) fits
+    blocked = 1 << 0 | 1 << 6
+    move = endgame_move(5, 5, [3], blocked, 1 << 1, blocked | 1 << 1)
+    assert move[0] in [(0, 2), (0, 3)]
+    assert move[1:] == (1, 1)
+
+def test_smart_strategy_solves_the_endgame():
+    ai = AI(strategy="smart", ship_sizes=[2])
+    grid = [[{"ai_hit": False, "ship": False} for _ in range(10)] for _ in range(10)]
+    ai.update_last_hit(0, 0, hit=True)
+    ai.update_last_hit(0, 1, hit=False)
+    assert ai.choose_move(grid, {}) == (1, 0)
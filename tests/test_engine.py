@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import time
+
+from src.game.engine import HeadlessGame, run_batch, summarize
+
+
+def test_headless_game_has_a_winner():
+    game = HeadlessGame(rows=10, cols=10)
+    result = game.play(seed=1)
+    assert result["winner"] in (0, 1)
+    assert game.hits(result["winner"]) == game.fleet_total == 17
+    assert result["shots"] >= 17
+
+def test_headless_game_is_reproducible():
+    game = HeadlessGame()
+    assert game.play(seed=42) == game.play(seed=42)
+
+def test_place_fleet_no_overlap():
+    game = HeadlessGame()
+    game.place_fleet(0)
+    cells = [cell for positions in game.boats[0].values() for cell in positions]
+    assert len(cells) == len(set(cells)) == 17
+    assert game.grids[0].ship_count() == 17
+
+def test_engine_does_not_import_pygame():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    code = "import sys, game.engine; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=src).returncode == 0
+
+def test_run_batch_single_worker():
+    stats = run_batch(20, seed=0, workers=1)
+    assert stats["games"] == 20
+    assert sum(stats["wins"]) == 20
+    assert sum(stats["distribution"].values()) == 20
+    assert stats["min_shots"] <= stats["mean_shots"] <= stats["max_shots"]
+
+def test_run_batch_is_independent_of_workers():
+    assert run_batch(8, seed=3, workers=1, chunk_size=3) == run_batch(8, seed=3, workers=2, chunk_size=3)
+
+def test_summarize_empty():
+    stats = summarize({}, [0, 0])
+    assert stats["games"] == 0
+    assert stats["mean_shots"] is None
+
+def test_large_sparse_board():
+    fleet = [(f"Boat {i}", size) for i, size in enumerate([5, 4, 3, 3, 2] * 4)]
+    game = HeadlessGame(rows=1000, cols=1000, fleet=fleet, strategies=("random", "random"), sparse=True)
+    game.place_fleet(0)
+    assert game.grids[0].ship_count() == game.fleet_total == 68
+    row, col = game.boats[0]["Boat 0"][0]
+    assert game.shoot(1, row, col) is True
+    assert game.hits(1) == 1
+
+def test_smart_game_on_large_board_is_fast():
+    # 300x300 is above POOL_LIMIT: the density is only computed around the unsunk hits
+    game = HeadlessGame(rows=300, cols=300, sparse=True)
+    start = time.perf_counter()
+    result = game.play(seed=2)
+    assert result["winner"] in (0, 1)
+    assert game.hits(result["winner"]) == game.fleet_total
+    assert time.perf_counter() - start < 10
+
+def test_reused_engine_plays_like_a_new_one():
+    game = HeadlessGame(strategies=("targeted", "smart"))
+    game.play(seed=3)
+    grids, ais = list(game.grids), list(game.ais)
+    assert game.play(seed=7) == HeadlessGame(strategies=("targeted", "smart")).play(seed=7)
+    assert game.grids == grids and game.ais == ais  # Cleared in place, not reallocated
+
+def test_fire_reports_sunk_ships():
+    game = HeadlessGame()
+    game.place_fleet(0)
+    positions = game.boats[0]["Torpedo"]
+    results = [game.fire(1, row, col) for row, col in positions]
+    assert [result.outcome for result in results] == ["hit", "sunk"]
+    assert results[-1].ship == "Torpedo" and sorted(results[-1].cells) == sorted(positions)
+
+def test_default_fleet_is_not_shared():
+    game = HeadlessGame()
+    game.fleet.append(("Extra", 2))
+    assert len(HeadlessGame().fleet) == 5
@@ -0,0 +1,55 @@
+import pytest
+
+from game import ia
+from src.game.evaluation import (build_corpus, describe, evaluate, layout_positions, paired_tests, percentile,
+                                 sign_test)
+
+
+def test_corpus_is_reproducible():
+    sizes = [5, 4, 3, 3, 2]
+    corpus = build_corpus(20, sizes=sizes, seed=1)
+    assert len(corpus) == 20 * len(sizes)
+    assert corpus == build_corpus(20, sizes=sizes, seed=1)
+    positions = layout_positions(corpus, 3, sizes, 10)
+    assert [len(cells) for cells in positions] == sizes
+    cells = [cell for ship in positions for cell in ship]
+    assert len(set(cells)) == 17 and all(0 <= r < 10 and 0 <= c < 10 for r, c in cells)
+
+def test_evaluate_pairs_layouts():
+    results = evaluate(("random", "targeted"), n_layouts=12, workers=1, chunk_size=5)
+    assert set(results) == {"random", "targeted"}
+    assert all(17 <= shots <= 100 for shots in results["random"])
+    assert results == evaluate(("random", "targeted"), n_layouts=12, workers=1, chunk_size=4)
+
+def test_evaluate_defaults_to_every_registered_strategy():
+    ia.register_strategy("first_cell", lambda ai, grid: ai._record_shot(min(ai.remaining_cells)))
+    try:
+        results = evaluate(n_layouts=2, workers=1)
+    finally:
+        del ia.STRATEGIES["first_cell"]
+    assert set(results) == set(ia.STRATEGIES) | {"first_cell"}
+    assert {"random", "targeted", "smart", "montecarlo"} <= set(results)
+
+def test_describe():
+    summary = describe(list(range(1, 101)))
+    assert summary["mean"] == 50.5
+    assert summary["p50"] == 50 and summary["p90"] == 90
+    low, high = summary["p50_ci"]
+    assert low < 50 < high
+    assert summary["mean_ci"][0] < 50.5 < summary["mean_ci"][1]
+    assert percentile([1, 2, 3], 100) == 3
+
+def test_paired_tests():
+    a = [40, 42, 38, 41, 39, 40, 43, 37]
+    b = [x + 5 for x in a]
+    test = paired_tests(a, b)
+    assert test["mean_difference"] == -5
+    assert test["wins"] == 8 and test["losses"] == test["ties"] == 0
+    assert test["t_p_value"] == 0.0
+    assert test["sign_p_value"] == pytest.approx(2 / 2 ** 8)
+    assert paired_tests(a, a)["t_p_value"] == paired_tests(a, a)["sign_p_value"] == 1.0
+
+def test_sign_test_approximation():
+    assert sign_test(600, 600) == 1.0
+    assert sign_test(700, 500) < 1e-6
+    assert sign_test(0, 0) == 1.0
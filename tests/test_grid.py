@@ -0,0 +1,63 @@
+import pytest
+
+from src.game.grid import Grid, SparseGrid, make_grid
+
+
+def test_grid_starts_empty():
+    grid = Grid(10, 10)
+    assert len(grid) == 10
+    assert all(len(row) == 10 for row in grid)
+    assert grid.ships == 0 and grid.shots == 0
+    assert grid.hit_count() == 0
+
+def test_cell_queries():
+    grid = Grid(10, 10)
+    grid.set_ship(2, 3)
+    assert grid.has_ship(2, 3)
+    assert not grid.has_ship(3, 2)
+    assert grid.shoot(2, 3) is True
+    assert grid.shoot(0, 0) is False
+    assert grid.is_shot(2, 3) and grid.is_shot(0, 0)
+    assert grid.hit_count() == 1
+    assert grid.ship_count() == 1
+
+def test_compatibility_view():
+    grid = Grid(10, 10, hit_key="ai_hit")
+    grid[4][5]["ship"] = True
+    grid[4][5]["ai_hit"] = True
+    assert grid.has_ship(4, 5) and grid.is_shot(4, 5)
+    assert grid[4][5] == {"ai_hit": True, "ship": True}
+    assert grid[0][0].get("player_hit", False) is False
+    with pytest.raises(KeyError):
+        grid[0][0]["player_hit"]
+    with pytest.raises(IndexError):
+        grid[10]
+
+def test_clear_in_place():
+    grid = Grid(10, 10)
+    grid.set_ship(9, 9)
+    grid.shoot(9, 9)
+    grid.clear()
+    assert all(cell["ship"] is False for row in grid for cell in row)
+    assert grid.hit_count() == 0
+
+def test_sparse_grid_matches_grid():
+    dense = Grid(10, 10)
+    sparse = SparseGrid(10, 10)
+    for grid in (dense, sparse):
+        grid.place_ship([(1, 1), (1, 2)])
+        grid.shoot(1, 1)
+        grid.shoot(5, 5)
+    assert sparse.ships == dense.ships
+    assert sparse.shots == dense.shots
+    assert sparse.hit_count() == dense.hit_count() == 1
+    assert sparse[1][2] == dense[1][2]
+
+def test_sparse_grid_memory_scales_with_occupancy():
+    grid = make_grid(1000, 1000, sparse=True)
+    grid.place_ship([(999, 995 + k) for k in range(5)])
+    assert grid.shoot(999, 999) is True
+    assert grid.shoot(0, 0) is False
+    assert len(grid.ship_cells) == 5 and len(grid.shot_cells) == 2
+    grid.clear()
+    assert grid.ship_count() == 0 and grid.hit_count() == 0
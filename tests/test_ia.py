@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from src.game.ia import AI, STRATEGIES, AIState, register_strategy
+
+
+def empty_grid(rows=10, cols=10):
+    return [[{"ai_hit": False, "ship": False} for _ in range(cols)] for _ in range(rows)]
+
+def test_unknown_strategy():
+    ai = AI(strategy="unknown")
+    with pytest.raises(ValueError):
+        ai.choose_move(empty_grid(), {})
+
+def test_smart_strategy_targets_next_to_hit():
+    ai = AI(strategy="smart")
+    ai.update_last_hit(5, 5, hit=True)
+    assert ai.choose_move(empty_grid(), {}) in [(4, 5), (6, 5), (5, 4), (5, 6)]
+
+def test_smart_strategy_refreshes_probabilities():
+    ai = AI(strategy="smart", book_dir=None)  # Computes every move, even the opening
+    grid = empty_grid()
+    first = ai.choose_move(grid, {})
+    ai.update_last_hit(*first, hit=False)
+    assert ai.probability_grid[first[0]][first[1]] > 0
+    ai.choose_move(grid, {})
+    assert ai.probability_grid[first[0]][first[1]] == 0
+
+def test_sunk_ship_leaves_remaining_fleet():
+    ai = AI(strategy="smart")
+    for col in range(2):
+        ai.update_last_hit(0, col, hit=True, sunk=[(0, 0), (0, 1)] if col == 1 else None)
+    assert ai.hits == []
+    assert ai.remaining_ships == [5, 4, 3, 3]
+    assert ai.sunk == [(0, 0), (0, 1)]
+
+def test_smart_strategy_never_repeats_a_shot():
+    ai = AI(strategy="smart")
+    grid = empty_grid()
+    moves = [ai.choose_move(grid, {}) for _ in range(100)]
+    assert len(set(moves)) == 100
+
+def test_random_strategy_draws_from_remaining_cells():
+    ai = AI(strategy="random")
+    grid = empty_grid(3, 3)
+    moves = {ai.choose_move(grid, {}) for _ in range(9)}
+    assert len(moves) == 9
+    assert ai.remaining_cells == []
+    with pytest.raises(ValueError):
+        ai.choose_move(grid, {})
+
+def test_targeted_strategy_explores_neighbours_once():
+    ai = AI(strategy="targeted")
+    grid = empty_grid()
+    ai.update_last_hit(0, 0, hit=True)
+    first = ai.choose_move(grid, {})
+    assert first in [(1, 0), (0, 1)]
+    ai.update_last_hit(*first, hit=False)
+    second = ai.choose_move(grid, {})
+    assert second in [(1, 0), (0, 1)] and second != first
+
+def test_reset_forgets_the_game_in_place():
+    ai = AI(strategy="targeted")
+    grid = empty_grid()
+    ai.choose_move(grid, {})
+    ai.update_last_hit(5, 5, hit=True, sunk=[(5, 5)])
+    ai.update_last_hit(2, 2, hit=True)
+    remaining = ai.remaining_cells
+    ai.reset()
+    assert not ai.shots and not ai.hits and not ai.sunk_ships and not ai.possible_targets
+    assert ai.remaining_ships == [5, 4, 3, 3, 2]
+    assert ai.remaining_cells is remaining and len(remaining) == 100
+    assert all(remaining[i] == cell for cell, i in ai.remaining_index.items())
+
+def test_registered_strategy():
+    @register_strategy("first_cell")
+    def first_cell(ai, grid):
+        return ai._record_shot(min(ai.remaining_cells))
+
+    try:
+        ai = AI(strategy="first_cell")
+        assert [ai.choose_move(empty_grid(), {}) for _ in range(2)] == [(0, 0), (0, 1)]
+    finally:
+        del STRATEGIES["first_cell"]
+    assert set(STRATEGIES) >= {"random", "targeted", "smart", "montecarlo"}
+
+def test_state_is_compact():
+    state = AIState((5, 4))
+    assert not hasattr(state, "__dict__")
+    assert AI().state.remaining_ships == [5, 4, 3, 3, 2]
+
+def test_snapshot_and_restore():
+    ai = AI(strategy="targeted")
+    grid = empty_grid()
+    ai.update_last_hit(4, 4, hit=True)
+    saved = ai.snapshot()
+    moves = [ai.choose_move(grid, {}) for _ in range(3)]
+    ai.restore(saved)
+    assert ai.shots == {(4, 4)} and len(ai.remaining_cells) == 99
+    assert [ai.choose_move(grid, {}) for _ in range(3)] == moves
+    ai.restore(saved)  # A snapshot can be restored again
+    assert len(ai.possible_targets) == 4
+
+def test_fork_is_independent():
+    ai = AI(strategy="montecarlo", rng=random.Random(1))
+    grid = empty_grid()
+    ai.update_last_hit(*ai.choose_move(grid, {}), hit=False)
+    fork = ai.fork(rng=random.Random(2))
+    fork.update_last_hit(*fork.choose_move(grid, {}), hit=True)
+    assert len(fork.shots) == 2 and len(ai.shots) == 1
+    assert not ai.hits and fork.state.sampler is not ai.state.sampler
+    assert fork.state.sampler.rng is fork.rng
+
+def test_targeted_strategy_extends_the_line_of_hits():
+    ai = AI(strategy="targeted")
+    grid = empty_grid()
+    ai.update_last_hit(4, 4, hit=True)
+    ai.update_last_hit(4, 5, hit=True)
+    assert ai.current_orientation == "horizontal"
+    assert {ai.choose_move(grid, {}), ai.choose_move(grid, {})} == {(4, 3), (4, 6)}
+
+def test_targeted_strategy_drops_axes_too_short_for_the_fleet():
+    ai = AI(strategy="targeted", ship_sizes=[3])
+    ai.choose_move(empty_grid(), {})
+    ai.reset()
+    ai.update_last_hit(1, 0, hit=False)
+    ai.update_last_hit(0, 0, hit=True)
+    assert ai.possible_targets == {(0, 1): 1}  # No ship of 3 fits vertically above the miss
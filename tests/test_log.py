@@ -0,0 +1,45 @@
+import io
+import json
+import logging
+
+from src.game.action import Action
+from src.game.log import enable_logging, logger
+from src.game.player import Player
+
+
+def test_silent_by_default(capsys):
+    player, enemy = Player("Player"), Player("IA")
+    enemy.boats = {"Boat": [(0, 0)]}
+    Action.shoot(player, enemy, 0, 0)
+    assert capsys.readouterr().out == ""
+
+def test_plain_messages():
+    stream = io.StringIO()
+    player, enemy = Player("Player"), Player("IA")
+    enemy.boats = {"Boat": [(0, 0), (0, 1)]}
+    with enable_logging(stream=stream):
+        Action.shoot(player, enemy, 0, 0)
+        Action.shoot(player, enemy, 5, 5)
+    assert stream.getvalue().splitlines() == [
+        "Hit! The shot at (0, 0) hit a boat from IA.",
+        "Miss! The shot at (5, 5) missed.",
+    ]
+    assert logger.level == logging.NOTSET  # Silent again once closed
+
+def test_json_lines_asynchronous():
+    stream = io.StringIO()
+    player, enemy = Player("Player"), Player("IA")
+    enemy.boats = {"Torpedo": [(2, 3)]}
+    with enable_logging(stream=stream, json_lines=True, asynchronous=True):
+        Action.shoot(player, enemy, 2, 3)
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [event["event"] for event in events] == ["shot", "sunk"]
+    assert events[0]["row"] == 2 and events[0]["col"] == 3 and events[0]["outcome"] == "sunk"
+    assert events[1]["ship"] == "Torpedo" and events[1]["level"] == "INFO"
+
+def test_debug_level_includes_moves():
+    stream = io.StringIO()
+    player = Player("Player")
+    with enable_logging(logging.DEBUG, stream=stream):
+        player.record_move(1, 2, False)
+    assert stream.getvalue() == "Move at (1, 2) recorded. Hit: False\n"
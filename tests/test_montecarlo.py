@@ -0,0 +1,41 @@
+import random
+
+from src.game.density import to_bitboard
+from src.game.ia import AI
+from src.game.montecarlo import FleetSampler
+
+
+def test_samples_are_consistent():
+    sampler = FleetSampler(10, 10, samples=50, time_budget=1.0, rng=random.Random(0))
+    misses = to_bitboard([(0, 0), (5, 5), (9, 9)], 10)
+    hits = to_bitboard([(3, 3)], 10)
+    sampler.refill(misses, hits, [5, 4, 3, 3, 2])
+    assert len(sampler.layouts) == 50
+    for occupancy, ships in sampler.layouts:
+        assert not occupancy & misses
+        assert occupancy & hits == hits
+        assert sorted(size for size, _ in ships) == [2, 3, 3, 4, 5]
+        assert sum(mask.bit_count() for _, mask in ships) == occupancy.bit_count() == 17
+
+def test_update_drops_contradicted_layouts():
+    sampler = FleetSampler(10, 10, samples=100, time_budget=1.0, rng=random.Random(1))
+    sampler.refill(0, 0, [5, 4, 3, 3, 2])
+    miss = to_bitboard([(4, 4)], 10)
+    sampler.update(miss, 0, [])
+    assert sampler.layouts
+    assert all(not occupancy & miss for occupancy, _ in sampler.layouts)
+
+def test_update_applies_sunk_ships():
+    sampler = FleetSampler(10, 10, samples=20, time_budget=1.0, rng=random.Random(2))
+    sunk = to_bitboard([(0, 0), (0, 1)], 10)
+    sampler.refill(0, sunk, [5, 2])
+    sampler.update(0, 0, [(2, sunk)])
+    for occupancy, ships in sampler.layouts:
+        assert [size for size, _ in ships] == [5]
+        assert not occupancy & sunk
+
+def test_montecarlo_strategy_targets_next_to_hit():
+    ai = AI(strategy="montecarlo", samples=100, time_budget=1.0)
+    ai.update_last_hit(5, 5, hit=True)
+    grid = [[{"ai_hit": False, "ship": False} for _ in range(10)] for _ in range(10)]
+    assert ai.choose_move(grid, {}) in [(4, 5), (6, 5), (5, 4), (5, 6)]
@@ -0,0 +1,47 @@
+import pytest
+
+from src.game.ia import AI
+from src.game.opening import OpeningBook, book_path, build_book, history_key, load_book, write_book
+
+
+def empty_grid(rows=10, cols=10):
+    return [[{"ai_hit": False, "ship": False} for _ in range(cols)] for _ in range(rows)]
+
+def test_book_round_trip(tmp_path):
+    entries = build_book(6, 6, [3, 2], depth=10)
+    path = book_path(6, 6, [3, 2], tmp_path)
+    write_book(path, 6, 6, [3, 2], entries)
+    with OpeningBook(path) as book:
+        assert (book.rows, book.cols, book.sizes, len(book)) == (6, 6, (3, 2), 10)
+        ai = AI(strategy="smart", ship_sizes=[3, 2], book_dir=None)
+        for _ in range(10):
+            misses = ai.state.shot_mask
+            move = ai.choose_move(empty_grid(6, 6), {})
+            assert book.lookup(misses) == move
+            ai.update_last_hit(*move, hit=False)
+        assert book.lookup(1 << 35 | 1 << 34) is None
+
+def test_invalid_book_is_ignored(tmp_path):
+    path = book_path(10, 10, [5, 4], tmp_path)
+    with open(path, "wb") as f:
+        f.write(b"BSOB")
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+    assert load_book(10, 10, [5, 4], tmp_path) is None
+
+def test_shipped_book_matches_the_smart_strategy():
+    book = load_book(10, 10, [5, 4, 3, 3, 2])
+    assert book is not None
+    ai = AI(strategy="smart", book_dir=None)
+    for _ in range(len(book)):
+        misses = ai.state.shot_mask
+        move = ai.choose_move(empty_grid(), {})
+        assert book.lookup(misses) == move
+        ai.update_last_hit(*move, hit=False)
+
+def test_smart_strategy_reads_the_book(tmp_path):
+    write_book(book_path(10, 10, [5, 4, 3, 3, 2], tmp_path), 10, 10, [5, 4, 3, 3, 2], {history_key(0, 100): 99})
+    ai = AI(strategy="smart", book_dir=str(tmp_path))
+    assert ai.choose_move(empty_grid(), {}) == (9, 9)
+    ai.update_last_hit(9, 9, hit=False)
+    assert ai.choose_move(empty_grid(), {}) != (9, 9)  # Not in the book: computed live
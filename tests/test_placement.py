@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.game.placement import mask_to_positions, placement_index, random_fleet, random_fleet_positions
+
+
+def test_placement_index_counts():
+    index = placement_index(10, 10, 5)
+    assert len(index) == 2 * 6 * 10
+    assert all(mask.bit_count() == 5 for mask in index.masks)
+    # A corner is covered by one horizontal and one vertical placement
+    assert len(index.through[0]) == 2
+    assert placement_index(10, 10, 5) is index
+
+def test_mask_to_positions():
+    index = placement_index(10, 10, 3)
+    assert mask_to_positions(index.masks[0], 10) == [(0, 0), (0, 1), (0, 2)]
+
+def test_random_fleet_no_overlap():
+    rng = random.Random(3)
+    for _ in range(50):
+        masks = random_fleet(10, 10, [5, 4, 3, 3, 2], rng)
+        occupied = 0
+        for mask in masks:
+            assert not mask & occupied
+            occupied |= mask
+        assert occupied.bit_count() == 17
+
+def test_random_fleet_on_crowded_board():
+    # Five ships of 5 fill a 5x5 grid exactly: only full rows or full columns fit
+    masks = random_fleet(5, 5, [5] * 5, random.Random(0))
+    assert sum(masks) == (1 << 25) - 1
+
+def test_random_fleet_impossible():
+    with pytest.raises(ValueError):
+        random_fleet(3, 3, [4])
+
+def test_random_fleet_larger_than_grid():
+    # 105 cells cannot fit on 100: rejected up front instead of searched
+    with pytest.raises(ValueError, match="covers 105 cells"):
+        random_fleet(10, 10, [5] * 21, random.Random(0))
+
+@pytest.mark.parametrize("rows, cols, sizes", [(10, 10, [5] * 20), (8, 8, [4] * 16), (10, 10, [3] * 33)])
+def test_random_fleet_exact_tiling(rows, cols, sizes):
+    masks = random_fleet(rows, cols, sizes, random.Random(0))
+    occupied = 0
+    for mask, size in zip(masks, sizes):
+        assert mask.bit_count() == size
+        assert not mask & occupied
+        occupied |= mask
+    assert occupied.bit_count() == sum(sizes)
+
+def test_random_fleet_keeps_order_of_sizes():
+    masks = random_fleet(10, 10, [2, 5, 3, 4, 3], random.Random(1))
+    assert [mask.bit_count() for mask in masks] == [2, 5, 3, 4, 3]
+
+def test_random_fleet_search_budget():
+    # 1x4 ships cannot tile a 10x10 grid; a tiny budget gives up before proving it
+    with pytest.raises(ValueError, match="Gave up"):
+        random_fleet(10, 10, [4] * 25, random.Random(0), max_nodes=50)
+
+def test_random_fleet_positions_falls_back_to_a_scan():
+    # With one draw per ship, most ships of this dense fleet are placed by scanning the grid
+    for seed in range(20):
+        fleet = random_fleet_positions(5, 5, [5] * 5, random.Random(seed), max_attempts=1)
+        cells = [cell for positions in fleet for cell in positions]
+        assert len(set(cells)) == 25
+    assert fleet == random_fleet_positions(5, 5, [5] * 5, random.Random(19), max_attempts=1)
+
+def test_random_fleet_positions_impossible():
+    with pytest.raises(ValueError, match="free cells"):
+        random_fleet_positions(5, 5, [5] * 6, random.Random(0))
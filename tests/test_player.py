@@ -40,4 +40,27 @@ def test_record_move():
     player = Player("Alice")
     player.record_move(3, 4, True)
     player.record_move(2, 2, False)
-    assert player.move_historic == [((3, 4), True), ((2, 2), False)]
\ No newline at end of file
+    assert player.move_historic == [((3, 4), True), ((2, 2), False)]
+
+
+def test_set_boat_emplacement_uses_grid_size():
+    player = Player("Alice", rows=30, cols=30)
+    player.set_boat_emplacement("Battleship", 0, 29)
+    player.set_boat_emplacement("Cruiser", 30, 0)
+    assert player.boats == {"Battleship": [(0, 29)]}
+
+def test_reset_keeps_the_same_containers():
+    player = Player("Alice")
+    boats = player.boats
+    player.set_boat_emplacement("Battleship", 5, 5)
+    player.record_move(1, 1, True)
+    player.reset()
+    assert player.boats is boats and boats == {}
+    assert player.move_historic == []
+
+def test_boats_assigned_as_dict_are_indexed():
+    player = Player("Alice")
+    player.boats = {"Battleship": [(5, 5), (5, 6)]}
+    player.set_boat_emplacement("Cruiser", 5, 6)
+    assert "Cruiser" not in player.boats
+    assert player.boats.ship_at[(5, 5)] == "Battleship"
@@ -0,0 +1,33 @@
+from src.game.pool import ObjectPool, board_pool, player_pool
+
+
+def test_released_objects_are_reset_and_reused():
+    resets = []
+    pool = ObjectPool(list, reset=lambda obj: (obj.clear(), resets.append(obj)))
+    first = pool.acquire()
+    first.append(1)
+    pool.release(first)
+    assert pool.acquire() is first and first == []
+    assert (pool.created, pool.reused, len(resets)) == (1, 1, 1)
+
+def test_full_pool_drops_objects():
+    pool = ObjectPool(dict, maxsize=1)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    assert len(pool) == 1
+
+def test_borrowed_releases_on_exit():
+    pool = player_pool()
+    with pool.borrowed() as player:
+        player.set_boat_emplacement("Torpedo", 0, 0)
+    assert len(pool) == 1
+    assert pool.acquire().boats == {}
+
+def test_board_pool():
+    pool = board_pool()
+    board = pool.acquire()
+    board.enemy_grid.shoot(0, 0)
+    pool.release(board)
+    board = pool.acquire()
+    assert board.enemy_grid.shots == 0 and board.enemy_grid.ship_count() == board.fleet_total
@@ -0,0 +1,50 @@
+import pygame
+
+from src.game.grid import Grid
+from src.game.renderer import GridRenderer, column_label
+
+pygame.font.init()
+
+
+def make_renderer(show_ships=True, hit_key="ai_hit"):
+    grid = Grid(10, 10, hit_key=hit_key)
+    return grid, GridRenderer(grid, 40, pygame.font.SysFont(None, 24), show_ships=show_ships, title="Votre plateau")
+
+def test_first_render_draws_everything():
+    grid, renderer = make_renderer()
+    dirty = renderer.render()
+    left, top = renderer.offset
+    assert dirty == [renderer.surface.get_rect()]
+    assert renderer.surface.get_size() == (left + 10 * 40, top + 10 * 40)
+
+def test_only_changed_cells_are_redrawn():
+    grid, renderer = make_renderer()
+    renderer.render()
+    assert renderer.render() == []
+
+    grid.set_ship(2, 3)
+    grid.shoot(7, 1)
+    left, top = renderer.offset
+    dirty = renderer.render()
+    assert sorted((rect.x, rect.y) for rect in dirty) == [(left + 1 * 40, top + 7 * 40), (left + 3 * 40, top + 2 * 40)]
+    assert renderer.surface.get_at((left + 3 * 40 + 5, top + 2 * 40 + 5))[:3] == (0, 128, 255)
+    assert renderer.render() == []
+
+def test_hidden_ships_are_not_drawn():
+    grid, renderer = make_renderer(show_ships=False, hit_key="player_hit")
+    grid.set_ship(0, 0)
+    renderer.render()
+    left, top = renderer.offset
+    assert renderer.surface.get_at((left + 5, top + 5))[:3] == (173, 216, 230)
+
+def test_clear_and_invalidate():
+    grid, renderer = make_renderer()
+    grid.place_ship([(0, 0), (0, 1)])
+    renderer.render()
+    grid.clear()
+    assert len(renderer.render()) == 2
+    renderer.invalidate()
+    assert renderer.render() == [renderer.surface.get_rect()]
+
+def test_column_label():
+    assert [column_label(col) for col in (0, 25, 26, 702)] == ["A", "Z", "AA", "AAA"]
@@ -0,0 +1,51 @@
+import pytest
+
+from src.game.engine import HeadlessGame
+from src.game.replay import Replay, decode_ship, encode_ship, replay_game, rerun
+
+
+def test_ship_encoding_round_trip():
+    for positions in ([(2, 3), (2, 4), (2, 5)], [(4, 7), (5, 7)]):
+        assert decode_ship(*encode_ship(positions, 10), 10) == positions
+
+def test_bytes_round_trip():
+    replay = Replay(10, 10, seed=2**64 - 1, first=1)
+    replay.set_fleet(0, [[(0, 0), (0, 1)]])
+    replay.set_fleet(1, [[(5, 5), (6, 5), (7, 5)]])
+    replay.shots.extend([0, 99, 55])
+    data = replay.to_bytes()
+    copy = Replay.from_bytes(data)
+    assert (copy.rows, copy.cols, copy.seed, copy.first) == (10, 10, 2**64 - 1, 1)
+    assert copy.fleets == replay.fleets and list(copy.shots) == [0, 99, 55]
+    assert list(copy.moves()) == [(1, 0, 0), (0, 9, 9), (1, 5, 5)]
+    assert len(data) == len(Replay(10, 10).to_bytes()) + 2 * 6 + 3 * 2  # 6 bytes per ship, 2 per shot
+
+def test_wide_cells_on_large_boards():
+    replay = Replay(1000, 1000)
+    replay.shots.append(999_999)
+    assert list(Replay.from_bytes(replay.to_bytes()).shots) == [999_999]
+
+def test_invalid_data_raises():
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"nope")
+    with pytest.raises(ValueError):
+        Replay.from_bytes(Replay(10, 10).to_bytes()[:-2])
+
+def test_recorded_game_replays_identically(tmp_path):
+    game = HeadlessGame(strategies=("smart", "targeted"), record=True)
+    result = game.play(seed=11)
+    path = tmp_path / "game.bsrp"
+    game.replay.write(path)
+
+    replay = Replay.read(path)
+    assert len(replay.shots) == game.shots[0] + game.shots[1]
+    replayed = replay_game(replay, game.fleet)
+    assert (replayed["winner"], replayed["shots"]) == (result["winner"], result["shots"])
+    assert replayed["sunk"][result["winner"]] == len(game.fleet)
+    assert rerun(replay, ("smart", "targeted"), game.fleet) is None
+    assert rerun(replay, ("random", "random"), game.fleet) is not None
+
+def test_game_without_seed_records_one():
+    game = HeadlessGame(strategies=("random", "random"), record=True)
+    game.play()
+    assert rerun(game.replay, ("random", "random"), game.fleet) is None
@@ -0,0 +1,42 @@
+import pygame
+import pytest
+
+from src.game.scheduler import FrameScheduler
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        FrameScheduler(mode="turbo")
+
+def test_idle_mode_waits_for_an_event_when_nothing_animates(mocker):
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"button": 1, "pos": (0, 0)})
+    wait = mocker.patch("pygame.event.wait", return_value=event)
+    mocker.patch("pygame.event.get", return_value=[])
+    scheduler = FrameScheduler(fps=0, mode="idle")
+
+    assert scheduler.events() == []  # The first frame is drawn without waiting
+    scheduler.end_frame(animating=False)
+    assert scheduler.events() == [event]
+    wait.assert_called_once_with(250)
+
+    scheduler.end_frame(animating=True)
+    scheduler.events()
+    assert wait.call_count == 1
+
+def test_idle_timeout_returns_no_event(mocker):
+    mocker.patch("pygame.event.wait", return_value=pygame.event.Event(pygame.NOEVENT))
+    mocker.patch("pygame.event.get", return_value=[])
+    scheduler = FrameScheduler(fps=0, mode="idle", idle_timeout=0.01)
+    scheduler.end_frame()
+    assert scheduler.events() == []
+
+def test_capped_mode_never_waits(mocker):
+    wait = mocker.patch("pygame.event.wait")
+    mocker.patch("pygame.event.get", return_value=[])
+    scheduler = FrameScheduler(fps=200, mode="capped")
+    for _ in range(3):
+        scheduler.events()
+        scheduler.end_frame()
+    wait.assert_not_called()
+    assert scheduler.frame_time >= scheduler.busy_time >= 0
+    assert 0 < scheduler.idle_fraction <= 1
@@ -0,0 +1,74 @@
+import asyncio
+
+from src.game.loadgen import run_load
+from src.game.protocol import (BAD_PLACEMENT, BAD_SHOT, ERROR, FIRE, JOIN, JOINED, MODE_AI, MODE_HUMAN, NOT_YOUR_TURN,
+                               OVER, PLACE, RESULT, START, WRONG_STATE, FrameReader, decode, encode)
+from src.game.server import GameServer
+
+
+def test_frames_survive_any_split():
+    data = encode(PLACE, 1, 1, 42) + encode(FIRE, 99) + encode(JOINED, 7, 1, 10, 10, tail=bytes([5, 4, 3, 3, 2]))
+    frames = FrameReader()
+    received = []
+    for i in range(len(data)):
+        received += frames.feed(data[i:i + 1])
+    assert [decode(kind, body) for kind, body in received] == [(1, 1, 42, b""), (99, b""), (7, 1, 10, 10, bytes([5, 4, 3, 3, 2]))]
+
+async def _exchange(server, reader, writer, *frames):
+    writer.write(b"".join(frames))
+    await asyncio.sleep(0)
+    messages = []
+    reading = FrameReader()
+    while True:
+        try:
+            data = await asyncio.wait_for(reader.read(1 << 16), 0.05)
+        except asyncio.TimeoutError:
+            return messages
+        messages += [(kind, decode(kind, body)[:-1]) for kind, body in reading.feed(data)]
+
+def test_match_rejects_invalid_moves():
+    async def scenario():
+        server = GameServer(rows=5, cols=5, fleet=[("A", 3), ("B", 2)], ai_strategy="random", seed=0)
+        reader, writer = await server.connect()
+        assert await _exchange(server, reader, writer, encode(FIRE, 0)) == [(ERROR, (WRONG_STATE,))]
+        joined = await _exchange(server, reader, writer, encode(JOIN, MODE_AI))
+        assert joined == [(JOINED, (1, 0, 5, 5))]
+        errors = await _exchange(server, reader, writer,
+                                 encode(PLACE, 0, 1, 3),  # Past the right edge
+                                 encode(PLACE, 0, 0, 20),  # Past the bottom edge
+                                 encode(PLACE, 2, 1, 0),  # No such ship
+                                 encode(PLACE, 0, 1, 0),
+                                 encode(PLACE, 0, 1, 10),  # Already placed
+                                 encode(PLACE, 1, 0, 1))  # Overlaps ship 0
+        assert errors == [(ERROR, (BAD_PLACEMENT,))] * 5
+        started = await _exchange(server, reader, writer, encode(PLACE, 1, 1, 10))
+        assert started == [(START, (0,))]
+        first = await _exchange(server, reader, writer, encode(FIRE, 24))
+        assert [kind for kind, _ in first] == [RESULT, RESULT]
+        assert first[0][1][:2] == (0, 24) and first[1][1][0] == 1
+        assert await _exchange(server, reader, writer, encode(FIRE, 24)) == [(ERROR, (BAD_SHOT,))]
+        writer.close()
+    asyncio.run(scenario())
+
+def test_human_match_and_forfeit():
+    async def scenario():
+        server = GameServer(rows=5, cols=5, fleet=[("A", 2)])
+        first = await server.connect()
+        second = await server.connect()
+        assert await _exchange(server, *first, encode(JOIN, MODE_HUMAN)) == []
+        assert await _exchange(server, *second, encode(JOIN, MODE_HUMAN)) == [(JOINED, (1, 1, 5, 5))]
+        await _exchange(server, *first, encode(PLACE, 0, 1, 0))
+        assert await _exchange(server, *second, encode(PLACE, 0, 1, 0)) == [(START, (0,))]
+        assert await _exchange(server, *second, encode(FIRE, 0)) == [(ERROR, (NOT_YOUR_TURN,))]
+        first[1].close()
+        assert await _exchange(server, *second) == [(OVER, (1, 1))]
+        assert server.matches == {} and server.finished == 1
+    asyncio.run(scenario())
+
+def test_load_generator_plays_concurrent_matches():
+    for mode in (MODE_AI, MODE_HUMAN):
+        server = GameServer(ai_strategy="random", seed=0)
+        stats = asyncio.run(run_load(50, mode, strategy="random", server=server))
+        assert stats["errors"] == 0
+        assert server.finished == 50 and server.matches == {}
+        assert stats["shots"] >= 50 * 17
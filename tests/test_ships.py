@@ -0,0 +1,62 @@
+from src.game.ships import HIT, MISS, SUNK, Fleet, ShipIndex, ship_name
+
+
+def test_resolve_miss_hit_sunk():
+    ships = ShipIndex()
+    ships.add("Torpedo", [(0, 0), (0, 1)])
+    ships.add("Destroyer", [(2, 0), (3, 0), (4, 0)])
+    assert ships.afloat == 2
+
+    miss = ships.resolve(5, 5)
+    assert miss.outcome == MISS and not miss and miss.ship is None
+
+    hit = ships.resolve(0, 0)
+    assert hit.outcome == HIT and hit and not hit.sunk and hit.ship == "Torpedo"
+    assert ships.resolve(0, 0).outcome == HIT  # Already hit: not counted twice
+    assert ships.remaining["Torpedo"] == 1
+
+    sunk = ships.resolve(0, 1)
+    assert sunk.outcome == SUNK and sunk.cells == ((0, 0), (0, 1))
+    assert ships.afloat == 1 and not ships.all_sunk()
+
+    for cell in [(2, 0), (3, 0), (4, 0)]:
+        result = ships.resolve(*cell)
+    assert result.sunk and ships.all_sunk()
+
+def test_add_cell_by_cell_and_clear():
+    ships = ShipIndex()
+    ships.add_cell("Torpedo", (1, 1))
+    ships.add_cell("Torpedo", (1, 2))
+    ships.add_cell("Cruiser", (1, 2))  # Already taken
+    assert ships.positions == {"Torpedo": [(1, 1), (1, 2)]}
+    ships.clear()
+    assert len(ships) == 0 and ships.afloat == 0 and not ships.all_sunk()
+
+def test_ship_name():
+    assert ship_name(("Cruiser", 4)) == "Cruiser"
+    assert ship_name("Cruiser") == "Cruiser"
+
+def test_fleet_indexes_cells():
+    fleet = Fleet({"Torpedo": [(0, 0), (0, 1)]})
+    assert fleet == {"Torpedo": [(0, 0), (0, 1)]}
+    assert fleet.ship_at == {(0, 0): "Torpedo", (0, 1): "Torpedo"}
+    assert fleet.add_cell("Cruiser", (2, 2)) and not fleet.add_cell("Cruiser", (0, 1))
+    assert fleet.ship_at[(2, 2)] == "Cruiser"
+
+    assert fleet.hit((0, 0)) == "Torpedo" and fleet["Torpedo"] == [(0, 1)]
+    assert fleet.hit((0, 0)) is None and fleet.hit((5, 5)) is None
+
+    fleet["Torpedo"] = [(3, 3)]  # Moved: its former cells are free again
+    assert (0, 1) not in fleet.ship_at and fleet.ship_at[(3, 3)] == "Torpedo"
+    del fleet["Cruiser"]
+    assert fleet.ship_at == {(3, 3): "Torpedo"}
+    fleet.clear()
+    assert fleet == {} and fleet.ship_at == {}
+
+def test_fleet_copies():
+    import copy
+    import pickle
+
+    fleet = Fleet({"Torpedo": [(0, 0), (0, 1)]})
+    for clone in (pickle.loads(pickle.dumps(fleet)), copy.deepcopy(fleet)):
+        assert clone == fleet and clone.ship_at == fleet.ship_at
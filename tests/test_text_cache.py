@@ -0,0 +1,37 @@
+import pygame
+
+from src.game.text_cache import TextCache
+
+pygame.font.init()
+
+
+def test_same_text_is_rendered_once():
+    font = pygame.font.Font(None, 24)
+    cache = TextCache()
+    first = cache.render(font, "A", True, (255, 255, 255))
+    second = cache.render(font, "A", True, [255, 255, 255])
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_key_includes_color_and_antialias():
+    font = pygame.font.Font(None, 24)
+    cache = TextCache()
+    cache.render(font, "A", True, (255, 255, 255))
+    cache.render(font, "A", False, (255, 255, 255))
+    cache.render(font, "A", True, (200, 200, 200))
+    assert cache.misses == 3 and len(cache) == 3
+
+def test_least_recently_used_is_evicted():
+    font = pygame.font.Font(None, 24)
+    cache = TextCache(maxsize=2)
+    a = cache.render(font, "A", True, (255, 255, 255))
+    cache.render(font, "B", True, (255, 255, 255))
+    cache.render(font, "A", True, (255, 255, 255))  # "B" is now the least recently used
+    cache.render(font, "C", True, (255, 255, 255))
+    assert len(cache) == 2
+    assert cache.render(font, "A", True, (255, 255, 255)) is a
+    cache.render(font, "B", True, (255, 255, 255))
+    assert cache.misses == 4
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
@@ -0,0 +1,50 @@
+import pytest
+
+from src.game.tournament import Tournament, format_leaderboard, parse_entrant, run_tournament
+
+ENTRANTS = {"random": "random", "targeted": "targeted", "smart": "smart",
+            "quick": {"strategy": "smart", "params": {"endgame_limit": 0, "book_dir": None}}}
+
+
+def test_parse_entrant():
+    assert parse_entrant("smart") == ("smart", {"strategy": "smart", "params": {}})
+    assert parse_entrant("quick=smart:endgame_limit=0,book_dir=None") == (
+        "quick", {"strategy": "smart", "params": {"endgame_limit": 0, "book_dir": None}})
+    with pytest.raises(ValueError):
+        Tournament({"smart": "smart"})
+
+def test_round_robin_is_reproducible():
+    tournament = run_tournament(Tournament(ENTRANTS, games=4, seed=3), workers=1)
+    assert tournament.finished and len(tournament.pairings) == 6
+    board = tournament.leaderboard()
+    assert board[-1]["name"] == "random" and board[-1]["wins"] == 0
+    assert all(row["games"] == 12 for row in board)
+    assert sum(row["points"] for row in board) == 6
+    assert sum(tournament.ratings.values()) == pytest.approx(1500 * 4)
+    assert "quick" in format_leaderboard(tournament)
+    assert run_tournament(Tournament(ENTRANTS, games=4, seed=3), workers=2).ratings == tournament.ratings
+
+def test_swiss_pairs_without_rematches():
+    entrants = dict(ENTRANTS, hunter="targeted")
+    tournament = run_tournament(Tournament(entrants, "swiss", games=2, rounds=3), workers=1)
+    assert tournament.round == 3
+    played = [frozenset((a, b)) for _, a, b in tournament.pairings if b is not None]
+    assert len(played) == len(set(played)) == 6
+    byes = [a for _, a, b in tournament.pairings if b is None]
+    assert len(byes) == len(set(byes)) == 3
+
+def test_resume_from_checkpoint(tmp_path):
+    path = str(tmp_path / "tournament.json")
+    complete = run_tournament(Tournament(ENTRANTS, games=2), workers=1)
+
+    interrupted = Tournament(ENTRANTS, games=2)
+    interrupted.schedule_round()
+    for index in (4, 0, 1):  # Played out of order before the crash
+        interrupted.record(complete.results[index])
+    interrupted.save(path)
+
+    resumed = Tournament.load(path)
+    assert resumed.pending() == [2, 3, 5] and resumed.applied == 2
+    run_tournament(resumed, workers=1, checkpoint=path)
+    assert resumed.ratings == complete.ratings
+    assert Tournament.load(path).leaderboard() == complete.leaderboard()
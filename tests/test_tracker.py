@@ -0,0 +1,66 @@
+import random
+
+from src.game.density import probability_density, to_bitboard
+from src.game.engine import HeadlessGame
+from src.game.ia import AI
+from src.game.tracker import DensityTracker
+
+
+def expected_grid(rows, cols, misses, hits, sunk, sizes):
+    density = probability_density(rows, cols, misses, hits, sunk, sizes)
+    return [density[row * cols:(row + 1) * cols] for row in range(rows)]
+
+def test_tracker_follows_shots():
+    rng = random.Random(3)
+    for _ in range(20):
+        rows, cols = rng.randint(4, 10), rng.randint(4, 10)
+        sizes = [4, 3, 3, 2]
+        tracker = DensityTracker(rows, cols, sizes)
+        misses = hits = sunk = 0
+        for cell in rng.sample([(r, c) for r in range(rows) for c in range(cols)], rows * cols // 2):
+            if rng.random() < 0.3:
+                tracker.hit(cell)
+                hits |= to_bitboard([cell], cols)
+            else:
+                tracker.miss(cell)
+                misses |= to_bitboard([cell], cols)
+            if hits and rng.random() < 0.1:
+                ship = [divmod(hits.bit_length() - 1, cols)]  # Any cells will do for the density
+                size = rng.choice(sizes + [5])
+                if size in sizes:
+                    sizes.remove(size)
+                tracker.sink(ship * size)
+                hits &= ~to_bitboard(ship, cols)
+                sunk |= to_bitboard(ship, cols)
+            assert tracker.grid() == expected_grid(rows, cols, misses, hits, sunk, sizes)
+        rebuilt = DensityTracker.from_board(rows, cols, misses, hits, sunk, sizes)
+        assert rebuilt.grid() == tracker.grid()
+
+def test_copy_and_reset():
+    tracker = DensityTracker(10, 10, [5, 4, 3, 3, 2])
+    empty = tracker.grid()
+    tracker.hit((4, 4))
+    clone = tracker.copy()
+    clone.miss((4, 5))
+    clone.sink([(4, 4), (5, 4)])
+    assert tracker.grid() == expected_grid(10, 10, 0, 1 << 44, 0, [5, 4, 3, 3, 2])
+    assert clone.grid() != tracker.grid()
+    tracker.reset([5, 4, 3, 3, 2])
+    assert tracker.grid() == empty
+
+def test_smart_ai_keeps_density_up_to_date():
+    game = HeadlessGame(strategies=("smart", "smart"))
+    ai = AI(strategy="smart", rng=game.rng, book_dir=None)
+    game.ais[0] = ai
+    for seed in range(3):
+        game.rng.seed(seed)
+        game.reset()
+        game.place_fleet(1)
+        while game.winner is None:
+            row, col = ai.choose_move(game.grids[1], game.boats[1])
+            result = game.fire(0, row, col)
+            ai.update_last_hit(row, col, result.hit, result.cells)
+            hits = to_bitboard(ai.hits, 10)
+            sunk = to_bitboard(ai.sunk, 10)
+            assert ai.state.density.grid() == expected_grid(10, 10, ai.shot_mask & ~(hits | sunk), hits, sunk,
+                                                            ai.remaining_ships)